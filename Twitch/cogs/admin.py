@@ -21,7 +21,7 @@ class Admin(commands.Cog):
     async def cog_check(self, ctx: commands.Context) -> bool:
         assert isinstance(ctx.author, twitchio.Chatter)
         assert ctx.author.id is not None
-        config = await users.user_config(self.bot.con_pool, ctx.author.id)
+        config = await users.user_config(self.bot.con_pool, int(ctx.author.id))
         return config.is_admin()
 
     @commands.command(no_global_checks=True)
@@ -58,7 +58,7 @@ class Admin(commands.Cog):
             await self.bot.msg_q.send(ctx, "Please provide valid users")
             return
         for target in targets:
-            await channels.join_channel(self.bot.con_pool, str(target.id), target.name)
+            await channels.join_channel(self.bot.con_pool, int(target.id), target.name)
             if target.name not in [channel.name for channel in self.bot.connected_channels]:
                 await self.bot.join_channels([target.name])
             self.bot.msg_q.add_channel(target.name)
@@ -74,7 +74,7 @@ class Admin(commands.Cog):
 
         streams = await self.bot.fetch_streams(user_logins=[user.name for user in targets])
         for stream in streams:
-            await channels.set_online(self.bot.con_pool, str(stream.user.id))
+            await channels.set_online(self.bot.con_pool, stream.user.id)
 
         joined = [target.name for target in targets]
         await self.bot.msg_q.send(ctx, f"Joined {', '.join(joined)}", joined)
@@ -90,7 +90,7 @@ class Admin(commands.Cog):
             if target.name in [channel.name for channel in self.bot.connected_channels]:
                 self.bot.msg_q.remove_channel(target.name)
                 await self.bot.part_channels([target.name])
-                await channels.part_channel(self.bot.con_pool, str(target.id))
+                await channels.part_channel(self.bot.con_pool, int(target.id))
                 left.append(target.name)
         if len(left) == 0:
             await self.bot.msg_q.reply(ctx, "The bot is currently not connected to any given chats")
@@ -114,12 +114,12 @@ class Admin(commands.Cog):
 
     @commands.command(aliases=("bonk",), no_global_checks=True)
     async def aban(self, ctx: commands.Context, target: twitchio.User):
-        user_config = await users.user_config(self.bot.con_pool, str(target.id))
+        user_config = await users.user_config(self.bot.con_pool, int(target.id))
         if user_config.is_admin():
             await self.bot.msg_q.send(ctx, "You cannot ban another admin user")
             return
 
-        success = await users.ban_globally(self.bot.con_pool, str(target.id), target.name)
+        success = await users.ban_globally(self.bot.con_pool, int(target.id), target.name)
         if success:
             await self.bot.msg_q.send(
                 ctx,
@@ -127,7 +127,7 @@ class Admin(commands.Cog):
                 [],
                 users.unban_globally,
                 self.bot.con_pool,
-                str(target.id),
+                int(target.id),
                 target.name,
             )
         else:
@@ -135,7 +135,7 @@ class Admin(commands.Cog):
 
     @commands.command(no_global_checks=True)
     async def aunban(self, ctx: commands.Context, target: twitchio.User):
-        success = await users.unban_globally(self.bot.con_pool, str(target.id), target.name)
+        success = await users.unban_globally(self.bot.con_pool, int(target.id), target.name)
         if success:
             await self.bot.msg_q.send(
                 ctx,
@@ -143,7 +143,7 @@ class Admin(commands.Cog):
                 [],
                 users.ban_globally,
                 self.bot.con_pool,
-                str(target.id),
+                int(target.id),
                 target.name,
             )
         else:
@@ -202,6 +202,7 @@ class Admin(commands.Cog):
 
     @commands.command(aliases=("kill", "sd"), no_global_checks=True)
     async def shutdown(self, ctx: commands.Context):
+        await self.bot.cogs["UserInfo"].save_watch_time()  # type: ignore
         for channel in self.bot.connected_channels:
             self.bot.msg_q.remove_channel(channel.name)
         await self.bot.close()
@@ -222,6 +223,7 @@ class Admin(commands.Cog):
     @commands.command(no_global_checks=True)
     async def cache(self, ctx: commands.Context):
         cache.clear()
+        self.bot.user_cache.clear()
         await self.bot.msg_q.send(ctx, "Cache cleared")
 
     @commands.command(aliases=("listchatters",), no_global_checks=True)
@@ -181,7 +181,7 @@ class Basic(commands.Cog):
         else:
             target_user = target
 
-        iq = await misc.last_iq(self.bot.con_pool, str(target_user.id))
+        iq = await misc.last_iq(self.bot.con_pool, int(target_user.id))
         if iq is None:
             await self.bot.msg_q.send(ctx, f"{target_user.name}'s IQ is currently unknown", [target_user.name])
             return
@@ -220,10 +220,10 @@ class Basic(commands.Cog):
         decrease_max = int(ctx.author.id) % 10 + 2
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
 
-        iq = await misc.last_iq(self.bot.con_pool, ctx.author.id)
+        iq = await misc.last_iq(self.bot.con_pool, int(ctx.author.id))
         if iq is None:
             new_iq = round(random.gauss(100, 15)) + random.randint(-decrease_max, increase_max)
-            await misc.update_last_iq(self.bot.con_pool, ctx.author.id, new_iq)
+            await misc.update_last_iq(self.bot.con_pool, int(ctx.author.id), new_iq)
             emote = await seventv.happy_emote(channel_id, default="FeelsOkayMan")
             await self.bot.msg_q.reply(ctx, f"Your starting IQ is {new_iq} {emote}")
             return
@@ -250,7 +250,7 @@ class Basic(commands.Cog):
                     new_iq = iq.last_iq - random.randint(1, decrease_max)
                 break
 
-        await misc.update_last_iq(self.bot.con_pool, ctx.author.id, new_iq)
+        await misc.update_last_iq(self.bot.con_pool, int(ctx.author.id), new_iq)
         difference = new_iq - iq.last_iq
         sign = "" if difference < 0 else "+"
 
@@ -286,15 +286,11 @@ class Basic(commands.Cog):
             return
 
         top_iqs = top_iqs[:10]
-        users = await self.bot.fetch_users(ids=[int(iq.user_id) for iq in top_iqs])
+        users = await self.bot.user_cache.usernames(iq.user_id for iq in top_iqs)
         user_info = []
-        usernames = [user.name for user in users]
+        usernames = list(users.values())
         for i, last_iq in enumerate(top_iqs, 1):
-            username = [user.name for user in users if str(user.id) == last_iq.user_id]
-            if len(username) == 1:
-                username = username[0]
-            else:
-                username = "<unknown user>"
+            username = users.get(last_iq.user_id, "<unknown user>")
             user_info.append(f"{i}. {username} - {last_iq.last_iq}")
         await self.bot.msg_q.send(ctx, " | ".join(user_info), usernames)
 
@@ -309,15 +305,11 @@ class Basic(commands.Cog):
 
         total_iqs = len(low_iqs)
         low_iqs = low_iqs[:10]
-        users = await self.bot.fetch_users(ids=[int(iq.user_id) for iq in low_iqs])
-        usernames = [user.name for user in users]
+        users = await self.bot.user_cache.usernames(iq.user_id for iq in low_iqs)
+        usernames = list(users.values())
         user_info = []
         for i, last_iq in enumerate(low_iqs):
-            username = [user.name for user in users if str(user.id) == last_iq.user_id]
-            if len(username) == 1:
-                username = username[0]
-            else:
-                username = "<unknown user>"
+            username = users.get(last_iq.user_id, "<unknown user>")
             user_info.append(f"{total_iqs-i}. {username} - {last_iq.last_iq}")
         await self.bot.msg_q.send(ctx, " | ".join(user_info), usernames)
 
@@ -364,8 +356,8 @@ class Basic(commands.Cog):
             return
 
         winner = random.choice([ctx.author, target])
-        results = await misc.fight(self.bot.con_pool, ctx.author.id, str(target.id), str(winner.id))
-        wins, losses = results.user_stats(ctx.author.id)
+        results = await misc.fight(self.bot.con_pool, int(ctx.author.id), int(target.id), int(winner.id))
+        wins, losses = results.user_stats(int(ctx.author.id))
 
         winning_messages = [
             f"You smashed {target.name} into the ground, leaving them in pieces",
@@ -497,7 +489,7 @@ class Basic(commands.Cog):
 
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
         if move == bot_move:
-            stats = await misc.rps(self.bot.con_pool, ctx.author.id, "draw")
+            stats = await misc.rps(self.bot.con_pool, int(ctx.author.id), "draw")
             outcome = "tie"
             emote = await seventv.best_fitting_emote(
                 channel_id,
@@ -510,11 +502,11 @@ class Basic(commands.Cog):
             or (move == "paper" and bot_move == "rock")
             or (move == "scissors" and bot_move == "paper")
         ):
-            stats = await misc.rps(self.bot.con_pool, ctx.author.id, "win")
+            stats = await misc.rps(self.bot.con_pool, int(ctx.author.id), "win")
             outcome = "you won"
             emote = await seventv.sad_emote(channel_id)
         else:
-            stats = await misc.rps(self.bot.con_pool, ctx.author.id, "loss")
+            stats = await misc.rps(self.bot.con_pool, int(ctx.author.id), "loss")
             outcome = "I won"
             emote = await seventv.happy_emote(channel_id)
 
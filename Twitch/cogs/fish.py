@@ -40,7 +40,7 @@ class Fish(commands.Cog):
         assert ctx.author.id is not None
 
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
-        fisher = await fishing.fisher(self.bot.con_pool, ctx.author.id)
+        fisher = await fishing.fisher(self.bot.con_pool, int(ctx.author.id))
         owned_equipment = self.equipment_catalogue.equipment_owned(fisher.equipment)
 
         fish_flat: int = sum(
@@ -83,8 +83,8 @@ class Fish(commands.Cog):
                 rem_id = await reminders.set_reminder(
                     self.bot.con_pool,
                     channel_id,
-                    ctx.author.id,
-                    ctx.author.id,
+                    int(ctx.author.id),
+                    int(ctx.author.id),
                     f"{prefixes[0]}fish",
                     current_time + cooldown_left,
                     True,
@@ -186,7 +186,7 @@ class Fish(commands.Cog):
 
         await fishing.fish(
             self.bot.con_pool,
-            ctx.author.id,
+            int(ctx.author.id),
             total_fish_count,
             total_exp_amount,
         )
@@ -197,8 +197,8 @@ class Fish(commands.Cog):
             rem_id = await reminders.set_reminder(
                 self.bot.con_pool,
                 channel_id,
-                ctx.author.id,
-                ctx.author.id,
+                int(ctx.author.id),
+                int(ctx.author.id),
                 f"{prefixes[0]}fish",
                 current_time + cooldown,
                 True,
@@ -235,7 +235,7 @@ class Fish(commands.Cog):
         assert ctx.author.id is not None
 
         target_user = target if target is not None else ctx.author
-        fisher = await fishing.fisher(self.bot.con_pool, str(target_user.id))
+        fisher = await fishing.fisher(self.bot.con_pool, int(target_user.id))
         level = self.level_from_exp(fisher.exp)
         exp_to_next_level = max(self.level_to_exp(level + 1) - fisher.exp, 0)
         await self.bot.msg_q.send(
@@ -254,15 +254,11 @@ class Fish(commands.Cog):
             return
 
         top_fishers = top_fishers[:5]
-        users = await self.bot.fetch_users(ids=[int(fisher.user_id) for fisher in top_fishers])
-        usernames = [user.name for user in users]
+        users = await self.bot.user_cache.usernames(fisher.user_id for fisher in top_fishers)
+        usernames = list(users.values())
         user_info = []
         for i, fisher in enumerate(top_fishers, 1):
-            username = [user.name for user in users if str(user.id) == fisher.user_id]
-            if len(username) == 1:
-                username = username[0]
-            else:
-                username = "<unknown user>"
+            username = users.get(fisher.user_id, "<unknown user>")
             level = self.level_from_exp(fisher.exp)
             user_info.append(f"{i}. {username} - level {level}, {fisher.exp} exp, {fisher.fish_count} caught")
         await self.bot.msg_q.send(ctx, " | ".join(user_info), usernames)
@@ -278,7 +274,7 @@ class Fish(commands.Cog):
         assert isinstance(ctx.author, twitchio.Chatter)
         assert ctx.author.id is not None
 
-        fisher = await fishing.fisher(self.bot.con_pool, ctx.author.id)
+        fisher = await fishing.fisher(self.bot.con_pool, int(ctx.author.id))
         not_owned = self.equipment_catalogue.equipment_not_owned(fisher.equipment)
         if len(not_owned) == 0:
             await self.bot.msg_q.send(ctx, "The store is empty")
@@ -318,7 +314,7 @@ class Fish(commands.Cog):
         assert isinstance(ctx.author, twitchio.Chatter)
         assert ctx.author.id is not None
 
-        fisher = await fishing.fisher(self.bot.con_pool, ctx.author.id)
+        fisher = await fishing.fisher(self.bot.con_pool, int(ctx.author.id))
         not_owned = self.equipment_catalogue.equipment_not_owned(fisher.equipment)
 
         target_item = [item for item in not_owned if item.id == item_id]
@@ -344,7 +340,7 @@ class Fish(commands.Cog):
         elif target_item.cost > fisher.exp:
             await self.bot.msg_q.reply(ctx, "You don't have enough exp")
         else:
-            await fishing.buy_fishing_equipment(self.bot.con_pool, ctx.author.id, target_item.id, target_item.cost)
+            await fishing.buy_fishing_equipment(self.bot.con_pool, int(ctx.author.id), target_item.id, target_item.cost)
             exp_after = fisher.exp - target_item.cost
             level_after = self.level_from_exp(exp_after)
             await self.bot.msg_q.reply(
@@ -359,7 +355,7 @@ class Fish(commands.Cog):
         assert isinstance(ctx.author, twitchio.Chatter)
         assert ctx.author.id is not None
 
-        fisher = await fishing.fisher(self.bot.con_pool, ctx.author.id)
+        fisher = await fishing.fisher(self.bot.con_pool, int(ctx.author.id))
         owned = self.equipment_catalogue.equipment_owned(fisher.equipment)
         if len(owned) == 0:
             await self.bot.msg_q.reply(ctx, "You don't own any equipment")
@@ -29,7 +29,7 @@ class Join(commands.Cog):
             await self.bot.msg_q.reply(ctx, "The bot is currently connected to your chat")
             return
 
-        await channels.join_channel(self.bot.con_pool, str(ctx.author.id), ctx.author.name)
+        await channels.join_channel(self.bot.con_pool, int(ctx.author.id), ctx.author.name)
         await self.bot.join_channels([ctx.author.name])
         self.bot.msg_q.add_channel(ctx.author.name)
 
@@ -38,17 +38,17 @@ class Join(commands.Cog):
 
         streams = await self.bot.fetch_streams(user_logins=[ctx.author.name])
         for stream in streams:
-            await channels.set_online(self.bot.con_pool, str(stream.user.id))
+            await channels.set_online(self.bot.con_pool, stream.user.id)
 
         if "stream.online" not in sub_types:
-            await eventsub.subscribe_stream_start(ctx.author.id)
+            await eventsub.subscribe_stream_start(int(ctx.author.id))
 
         if "stream.offline" not in sub_types:
-            await eventsub.subscribe_stream_end(ctx.author.id)
+            await eventsub.subscribe_stream_end(int(ctx.author.id))
 
         await self.bot.msg_q.send(ctx, f"Joined {ctx.author.name}", [ctx.author.name])
         emote = await seventv.best_fitting_emote(
-            str(ctx.author.id),
+            int(ctx.author.id),
             lambda emote: (emote.lower().endswith("uh") and len(emote) == 3)
             or emote in ("plink", "plonk", "plenk", "pleep"),
             default="Stare",
@@ -68,7 +68,7 @@ class Join(commands.Cog):
 
         self.bot.msg_q.remove_channel(ctx.author.name)
         await self.bot.part_channels([ctx.author.name])
-        await channels.part_channel(self.bot.con_pool, ctx.author.id)
+        await channels.part_channel(self.bot.con_pool, int(ctx.author.id))
         await self.bot.msg_q.send(ctx, f"Left {ctx.author.name}", [ctx.author.name])
 
 
@@ -40,7 +40,7 @@ class Location(commands.Cog):
                     return
                 await locations.set_location(
                     self.bot.con_pool,
-                    ctx.author.id,
+                    int(ctx.author.id),
                     location.geometry.location.latitude,
                     location.geometry.location.longitude,
                     location.formatted_address,
@@ -51,33 +51,33 @@ class Location(commands.Cog):
                     [],
                     locations.delete,
                     self.bot.con_pool,
-                    ctx.author.id,
+                    int(ctx.author.id),
                 )
 
             case "delete":
-                location = await locations.user_location(self.bot.con_pool, ctx.author.id)
+                location = await locations.user_location(self.bot.con_pool, int(ctx.author.id))
                 if location is None:
                     await self.bot.msg_q.reply(ctx, "You have not set your location yet")
                     return
-                await locations.delete(self.bot.con_pool, ctx.author.id)
+                await locations.delete(self.bot.con_pool, int(ctx.author.id))
                 await self.bot.msg_q.reply(
                     ctx,
                     "Location deleted",
                     [],
                     locations.set_location,
                     self.bot.con_pool,
-                    ctx.author.id,
+                    int(ctx.author.id),
                     location.latitude,
                     location.longitude,
                     location.address,
                 )
 
             case "private":
-                location = await locations.user_location(self.bot.con_pool, ctx.author.id)
+                location = await locations.user_location(self.bot.con_pool, int(ctx.author.id))
                 if location is None:
                     await self.bot.msg_q.reply(ctx, "You have not set your location yet")
                     return
-                success = await locations.set_location_private(self.bot.con_pool, ctx.author.id)
+                success = await locations.set_location_private(self.bot.con_pool, int(ctx.author.id))
                 if success:
                     await self.bot.msg_q.reply(
                         ctx,
@@ -85,17 +85,17 @@ class Location(commands.Cog):
                         [],
                         locations.set_location_public,
                         self.bot.con_pool,
-                        ctx.author.id,
+                        int(ctx.author.id),
                     )
                 else:
                     await self.bot.msg_q.reply(ctx, "Your location is already set to private")
 
             case "public":
-                location = await locations.user_location(self.bot.con_pool, ctx.author.id)
+                location = await locations.user_location(self.bot.con_pool, int(ctx.author.id))
                 if location is None:
                     await self.bot.msg_q.reply(ctx, "You have not set your location yet")
                     return
-                success = await locations.set_location_public(self.bot.con_pool, ctx.author.id)
+                success = await locations.set_location_public(self.bot.con_pool, int(ctx.author.id))
                 if success:
                     await self.bot.msg_q.reply(
                         ctx,
@@ -103,7 +103,7 @@ class Location(commands.Cog):
                         [],
                         locations.set_location_private,
                         self.bot.con_pool,
-                        ctx.author.id,
+                        int(ctx.author.id),
                     )
                 else:
                     await self.bot.msg_q.reply(ctx, "Your location is already set to public")
@@ -122,7 +122,7 @@ class Location(commands.Cog):
         assert ctx.author.id is not None
 
         if len(args) == 0:
-            location = await locations.user_location(self.bot.con_pool, ctx.author.id)
+            location = await locations.user_location(self.bot.con_pool, int(ctx.author.id))
             if location is None:
                 await self.bot.msg_q.reply(ctx, "You have not set your location")
                 return
@@ -173,7 +173,7 @@ class Location(commands.Cog):
         assert ctx.author.id is not None
 
         if len(args) == 0:
-            location = await locations.user_location(self.bot.con_pool, ctx.author.id)
+            location = await locations.user_location(self.bot.con_pool, int(ctx.author.id))
             if location is None:
                 await self.bot.msg_q.reply(ctx, "You have not set your location")
                 return
@@ -243,7 +243,7 @@ class Location(commands.Cog):
             lat2 = loc2.geometry.location.latitude
             lon2 = loc2.geometry.location.longitude
         else:
-            loc1 = await locations.user_location(self.bot.con_pool, ctx.author.id)
+            loc1 = await locations.user_location(self.bot.con_pool, int(ctx.author.id))
             if loc1 is None:
                 await self.bot.msg_q.reply(
                     ctx, "You have not set your location. Set your location or provide two locations"
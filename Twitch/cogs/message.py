@@ -1,20 +1,168 @@
-from datetime import datetime, UTC
-from typing import TYPE_CHECKING
+from datetime import datetime, timedelta, UTC
+import os
+import re
+from typing import Any, TYPE_CHECKING
 
+from asyncpg.exceptions import InvalidRegularExpressionError
 import twitchio
-from twitchio.ext import commands
+from twitchio.ext import commands, routines
 
-from shared.database.twitch import channels, messages
+from shared.apis import twitch
+from shared.database.exceptions import DatabaseError
+from shared.database.twitch import channels, messages, tokens
 from shared.util.formatting import format_timedelta
 from Twitch.exceptions import ValidationError
+from Twitch.handlers import log_export
+from Twitch.logger import logger
 
 if TYPE_CHECKING:
     from Twitch.twitchbot import Bot
 
 
+TOKEN_BACKFILL_BATCH_SIZE = 20_000
+MAX_TOKENS_PER_CHANNEL = 100_000
+
+
+def required_literal_length(pattern: str) -> int:
+    """
+    Returns the length of the longest run of plain characters that every match of the pattern has to contain;
+    it is a conservative estimate, so only runs outside of groups and character classes are counted
+    """
+    alternatives = []
+    longest = 0
+    run = 0
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            # Escapes are either classes like \d or single characters, neither of which the run is counted through
+            longest = max(longest, run)
+            run = 0
+            i += 1
+        elif char == "[":
+            longest = max(longest, run)
+            run = 0
+            closing = pattern.find("]", i + 2)
+            i = len(pattern) if closing == -1 else closing
+        elif char == "(":
+            longest = max(longest, run)
+            run = 0
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        elif depth > 0:
+            pass
+        elif char == "|":
+            alternatives.append(max(longest, run))
+            longest = 0
+            run = 0
+        elif char in "?*{":
+            # The character before an optional quantifier doesn't have to be in the match
+            longest = max(longest, run - 1)
+            run = 0
+            if char == "{":
+                closing = pattern.find("}", i)
+                i = len(pattern) if closing == -1 else closing
+        elif char in ".^$+":
+            longest = max(longest, run)
+            run = 0
+        else:
+            run += 1
+        i += 1
+    alternatives.append(max(longest, run))
+    return min(alternatives)
+
+
+def validate_search(substrings: list[str], pattern: str | None) -> None:
+    # The trigram index can't be used to find anything shorter than a trigram
+    if any(len(substring) < 3 for substring in substrings):
+        raise ValidationError("The searched text has to be at least 3 characters long")
+    if pattern is not None:
+        try:
+            re.compile(pattern)
+        except re.error:
+            raise ValidationError("The search pattern is not a valid regular expression")
+        if required_literal_length(pattern) < 3:
+            raise ValidationError("The search pattern has to contain at least 3 plain characters in a row")
+
+
+def raise_for_invalid_pattern(error: DatabaseError) -> None:
+    # Postgres doesn't support every regular expression that Python does
+    if isinstance(error.source, InvalidRegularExpressionError):
+        raise ValidationError("The search pattern is not a valid regular expression")
+
+
+def parse_time(value: str) -> datetime:
+    """Parses either a date as yyyy-mm-dd or a time ago, e.g. 30m, 12h, 7d or 2w"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=UTC)
+    except ValueError:
+        pass
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)(m|h|d|w)", value.lower())
+    if match is None:
+        raise ValidationError(f"An invalid time was given: {value}; use yyyy-mm-dd or a time ago like 12h or 7d")
+    amount = float(match.group(1))
+    units = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+    try:
+        return datetime.now(UTC) - timedelta(**{units[match.group(2)]: amount})
+    except OverflowError:
+        raise ValidationError(f"The time is too far back: {value}")
+
+
 class Message(commands.Cog):
     def __init__(self, bot: "Bot") -> None:
         self.bot = bot
+        self.create_partitions.start(stop_on_error=False)
+        self.flush_token_counts.start(stop_on_error=False)
+        self.backfill_token_counts.start(stop_on_error=False)
+        self.prune_token_counts.start(stop_on_error=False)
+        self.save_last_seen.start(stop_on_error=False)
+        if self.bot.message_archive is not None:
+            self.archive_messages.start(stop_on_error=False)
+
+    @routines.routine(hours=24)
+    async def create_partitions(self):
+        await messages.create_partitions(self.bot.con_pool, 3)
+
+    @routines.routine(hours=24, wait_first=True)
+    async def archive_messages(self):
+        assert self.bot.message_archive is not None
+        archived = await self.bot.message_archive.archive_old_messages()
+        logger.info("Moved %d old messages to the archive", archived)
+
+    @routines.routine(minutes=1, wait_first=True)
+    async def flush_token_counts(self):
+        await self.bot.token_counts.flush()
+
+    @routines.routine(seconds=10)
+    async def backfill_token_counts(self):
+        # One batch at a time, so the backfill doesn't hold up logging the new messages
+        if not await tokens.backfill_token_counts(self.bot.con_pool, TOKEN_BACKFILL_BATCH_SIZE):
+            logger.info("Finished counting the tokens of the old messages")
+            self.backfill_token_counts.stop()
+
+    @routines.routine(hours=24, wait_first=True)
+    async def prune_token_counts(self):
+        pruned = await tokens.prune_token_counts(self.bot.con_pool, MAX_TOKENS_PER_CHANNEL)
+        logger.info("Pruned %d uncommon tokens from the token counts", pruned)
+
+    @routines.routine(minutes=1, wait_first=True)
+    async def save_last_seen(self):
+        await self.bot.last_seen.save()
+
+    def validate_archive(self, search_archive: bool) -> None:
+        if search_archive and self.bot.message_archive is None:
+            raise ValidationError("The message archive isn't enabled")
+
+    async def stream_start(self, channel: str) -> datetime:
+        """Returns the start time of the current stream, or of the last one if the channel is offline"""
+        user_info = await twitch.user_info(channel)
+        if user_info is not None and user_info.stream is not None:
+            return user_info.stream.started_at
+        if user_info is not None and user_info.last_broadcast.started_at is not None:
+            return user_info.last_broadcast.started_at
+        raise ValidationError("This channel hasn't streamed yet")
 
     async def cog_check(self, ctx: commands.Context) -> bool:
         channel_config = await channels.channel_config(self.bot.con_pool, ctx.channel.name)
@@ -28,8 +176,11 @@ class Message(commands.Cog):
         """
         Sends a random message from the chat logs of the current channel; {prefix}rm <target> <arg1> <arg2>...;
         leave target empty for self, or use "all" for any target; possible arguments: +{prefix} to include commands (commands are excluded by default),
-        +<arg> to include the word in the search and -<arg> to exclude, ><count> to search messages that have more words than
-        the count and <<count> to have less words
+        +<arg> to include the word in the search and -<arg> to exclude, ~<text> to search messages containing the text anywhere,
+        re:<pattern> to search messages matching the regular expression, ><count> to search messages that have more words than
+        the count and <<count> to have less words, since:<time> and until:<time> to search messages in a time range
+        (yyyy-mm-dd or a time ago like 12h or 7d), stream to search messages from the current or the last stream
+        and archive to search the archived old messages if nothing else is found
         """
         if target is not None:
             sender = target.name
@@ -44,8 +195,14 @@ class Message(commands.Cog):
 
         included_words = []
         excluded_words = []
+        substrings = []
+        pattern = None
         min_word_count = None
         max_word_count = None
+        since = None
+        until = None
+        stream = False
+        search_archive = False
         exclude_commands = True
         prefixes = await self.bot.prefixes(ctx.channel.name)
 
@@ -62,6 +219,26 @@ class Message(commands.Cog):
                 if len(arg[1:]) > 0:
                     excluded_words.append(arg[1:])
                 mode = "-"
+            elif arg.startswith("~"):
+                if len(arg[1:]) > 0:
+                    substrings.append(arg[1:])
+                mode = None
+            elif arg.startswith("re:"):
+                if len(arg[3:]) > 0:
+                    pattern = arg[3:]
+                mode = None
+            elif arg.startswith("since:"):
+                since = parse_time(arg[6:])
+                mode = None
+            elif arg.startswith("until:"):
+                until = parse_time(arg[6:])
+                mode = None
+            elif arg == "stream":
+                stream = True
+                mode = None
+            elif arg == "archive":
+                search_archive = True
+                mode = None
             elif arg.startswith(">"):
                 try:
                     if len(arg[1:]) > 0:
@@ -82,18 +259,32 @@ class Message(commands.Cog):
                 if len(arg) > 0:
                     excluded_words.append(arg)
 
+        validate_search(substrings, pattern)
+        self.validate_archive(search_archive)
+        if stream:
+            stream_start = await self.stream_start(ctx.channel.name)
+            since = stream_start if since is None else max(since, stream_start)
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
-        message = await messages.random_message(
-            self.bot.con_pool,
-            channel_id,
-            sender,
-            included_words=included_words,
-            excluded_words=excluded_words,
-            min_word_count=min_word_count,
-            max_word_count=max_word_count,
-            exclude_commands=exclude_commands,
-            prefixes=prefixes if exclude_commands else None,
-        )
+        filters: dict[str, Any] = {
+            "included_words": included_words,
+            "excluded_words": excluded_words,
+            "substrings": substrings,
+            "pattern": pattern,
+            "min_word_count": min_word_count,
+            "max_word_count": max_word_count,
+            "exclude_commands": exclude_commands,
+            "since": since,
+            "until": until,
+            "online_only": stream,
+        }
+        try:
+            message = await messages.random_message(self.bot.con_pool, channel_id, sender, **filters)
+        except DatabaseError as e:
+            raise_for_invalid_pattern(e)
+            raise
+        if message is None and search_archive:
+            assert self.bot.message_archive is not None
+            message = await self.bot.message_archive.random_message(channel_id, sender, **filters)
         if message is None:
             await self.bot.msg_q.send(ctx, "No message found")
             return
@@ -110,7 +301,10 @@ class Message(commands.Cog):
         Sends the number of messages sent to the current channel; {prefix}nofm <target> <arg1> <arg2>...;
         leave target empty for self, or use "all" for any target; possible arguments: -{prefix} to include commands
         (commands are included by default), +<arg> to include the word in the search and -<arg> to exclude,
-        ><count> to search messages that have more words than the count and <<count> to have less words
+        ~<text> to search messages containing the text anywhere, re:<pattern> to search messages matching the regular expression,
+        ><count> to search messages that have more words than the count and <<count> to have less words,
+        since:<time> and until:<time> to count messages in a time range (yyyy-mm-dd or a time ago like 12h or 7d)
+        and stream to count messages from the current or the last stream and archive to also count the archived old messages
         """
         if target is not None:
             sender = target.name
@@ -125,8 +319,14 @@ class Message(commands.Cog):
 
         included_words = []
         excluded_words = []
+        substrings = []
+        pattern = None
         min_word_count = None
         max_word_count = None
+        since = None
+        until = None
+        stream = False
+        search_archive = False
         exclude_commands = False
         prefixes = await self.bot.prefixes(ctx.channel.name)
 
@@ -143,6 +343,26 @@ class Message(commands.Cog):
                 if len(arg[1:]) > 0:
                     excluded_words.append(arg[1:])
                 mode = "-"
+            elif arg.startswith("~"):
+                if len(arg[1:]) > 0:
+                    substrings.append(arg[1:])
+                mode = None
+            elif arg.startswith("re:"):
+                if len(arg[3:]) > 0:
+                    pattern = arg[3:]
+                mode = None
+            elif arg.startswith("since:"):
+                since = parse_time(arg[6:])
+                mode = None
+            elif arg.startswith("until:"):
+                until = parse_time(arg[6:])
+                mode = None
+            elif arg == "stream":
+                stream = True
+                mode = None
+            elif arg == "archive":
+                search_archive = True
+                mode = None
             elif arg.startswith(">"):
                 try:
                     if len(arg[1:]) > 0:
@@ -164,18 +384,32 @@ class Message(commands.Cog):
                 if len(arg) > 0:
                     excluded_words.append(arg)
 
+        validate_search(substrings, pattern)
+        self.validate_archive(search_archive)
+        if stream:
+            stream_start = await self.stream_start(ctx.channel.name)
+            since = stream_start if since is None else max(since, stream_start)
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
-        count = await messages.number_of_messages(
-            self.bot.con_pool,
-            channel_id,
-            sender,
-            included_words=included_words,
-            excluded_words=excluded_words,
-            min_word_count=min_word_count,
-            max_word_count=max_word_count,
-            exclude_commands=exclude_commands,
-            prefixes=prefixes if exclude_commands else None,
-        )
+        filters: dict[str, Any] = {
+            "included_words": included_words,
+            "excluded_words": excluded_words,
+            "substrings": substrings,
+            "pattern": pattern,
+            "min_word_count": min_word_count,
+            "max_word_count": max_word_count,
+            "exclude_commands": exclude_commands,
+            "since": since,
+            "until": until,
+            "online_only": stream,
+        }
+        try:
+            count = await messages.number_of_messages(self.bot.con_pool, channel_id, sender, **filters)
+        except DatabaseError as e:
+            raise_for_invalid_pattern(e)
+            raise
+        if search_archive:
+            assert self.bot.message_archive is not None
+            count += await self.bot.message_archive.number_of_messages(channel_id, sender, **filters)
         if count == 0:
             await self.bot.msg_q.send(ctx, "No message found")
             return
@@ -185,15 +419,78 @@ class Message(commands.Cog):
 
     @commands.cooldown(rate=2, per=10, bucket=commands.Bucket.member)
     @commands.command()
-    async def topchatters(self, ctx: commands.Context):
-        """Sorts and shows the top 10 of the chatters of the current channel by the number of messages they have sent"""
+    async def topchatters(self, ctx: commands.Context, *args: str):
+        """
+        Sorts and shows the top 10 of the chatters of the current channel by the number of messages they have sent;
+        {prefix}topchatters <arg1> <arg2>...; possible arguments: since:<time> and until:<time> to count messages in a time range
+        (yyyy-mm-dd or a time ago like 12h or 7d) and stream to count messages from the current or the last stream
+        """
+        since = None
+        until = None
+        stream = False
+        for arg in args:
+            if arg.startswith("since:"):
+                since = parse_time(arg[6:])
+            elif arg.startswith("until:"):
+                until = parse_time(arg[6:])
+            elif arg == "stream":
+                stream = True
+
+        if stream:
+            stream_start = await self.stream_start(ctx.channel.name)
+            since = stream_start if since is None else max(since, stream_start)
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
-        chatters = await messages.top_chatters(self.bot.con_pool, channel_id)
+        chatters = await messages.top_chatters(
+            self.bot.con_pool, channel_id, since=since, until=until, online_only=stream
+        )
         top_10 = chatters.most_common(10)
         users = [user[0] for user in top_10]
         message = " | ".join([f"{i}. {chatter[0]} - {chatter[1]}" for i, chatter in enumerate(top_10, 1)])
         await self.bot.msg_q.send(ctx, message, users)
 
+    @commands.cooldown(rate=3, per=10, bucket=commands.Bucket.member)
+    @commands.command(aliases=("wordcount", "wc"))
+    async def said(self, ctx: commands.Context, word: str):
+        """Shows how many times the word or emote has been said in the channel; {prefix}said <word>"""
+        channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
+        counted = await tokens.token_count(self.bot.con_pool, channel_id, word)
+        if counted is None:
+            max_pruned = await tokens.max_pruned_count(self.bot.con_pool, channel_id)
+            if max_pruned > 0:
+                message = f"{word} has been said at most {max_pruned} times (uncommon words aren't counted)"
+            else:
+                message = f"{word} hasn't been said in this chat"
+        else:
+            first_seen = format_timedelta(counted.first_seen, datetime.now(UTC))
+            last_seen = format_timedelta(counted.last_seen, datetime.now(UTC))
+            message = f"{word} has been said {counted.count} times, first {first_seen} ago and last {last_seen} ago"
+            if counted.max_uncounted > 0:
+                message += f" (up to {counted.max_uncounted} older uses were pruned)"
+        if await tokens.token_backfill_pending(self.bot.con_pool):
+            message += " (older messages are still being counted)"
+        await self.bot.msg_q.send(ctx, message)
+
+    @commands.cooldown(rate=1, per=60, bucket=commands.Bucket.member)
+    @commands.command()
+    async def logs(self, ctx: commands.Context):
+        """Whispers a link to download your messages in the current channel; the link works for an hour; {prefix}logs"""
+        if not log_export.enabled():
+            raise ValidationError("Log exports aren't enabled")
+        assert isinstance(ctx.author, twitchio.Chatter)
+        assert ctx.author.id is not None
+        channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
+        # Anyone with the link can download the messages, so it can't be posted in the chat
+        bot_user = self.bot.create_user(int(self.bot.user_id), self.bot.nick)
+        try:
+            await bot_user.whisper(
+                token=os.environ["TMI_TOKEN"].removeprefix("oauth:"),
+                to_user_id=int(ctx.author.id),
+                message=log_export.export_url(channel_id, int(ctx.author.id)),
+            )
+        except twitchio.HTTPException:
+            raise ValidationError("Couldn't whisper you the link; check that your whispers are open")
+        await self.bot.msg_q.reply(ctx, "Whispered you the link to your logs")
+
     @commands.cooldown(rate=5, per=10, bucket=commands.Bucket.member)
     @commands.command(aliases=("lastseen", "whereis"))
     async def ls(self, ctx: commands.Context, target: twitchio.User):
@@ -205,6 +502,9 @@ class Message(commands.Cog):
             return
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
         last_message = await messages.last_seen(self.bot.con_pool, channel_id, target.name)
+        # The archive indexes point to the one month that has to be read, so it is cheap enough to always check
+        if last_message is None and self.bot.message_archive is not None:
+            last_message = await self.bot.message_archive.last_seen(channel_id, target.name)
         if last_message is None:
             message = f"{target.name} hasn't been seen in this chat"
         else:
@@ -212,6 +512,24 @@ class Message(commands.Cog):
             message = f"{target.name} was last seen {time_since} ago: {last_message.message}"
         await self.bot.msg_q.send(ctx, message, [target.name])
 
+    @commands.cooldown(rate=5, per=10, bucket=commands.Bucket.member)
+    @commands.command(aliases=("globallastseen", "gwhereis"))
+    async def gls(self, ctx: commands.Context, target: twitchio.User):
+        """Shows the last message and time when the target was last seen in any of the logged channels {prefix}gls <target>"""
+        assert isinstance(ctx.author.name, str)
+
+        if ctx.author.name == target.name:
+            await self.bot.msg_q.reply(ctx, "You were here just now Stare")
+            return
+        last_seen = await self.bot.last_seen.last_seen(int(target.id))
+        if last_seen is None:
+            message = f"{target.name} hasn't been seen in any chat"
+        else:
+            time_since = format_timedelta(last_seen.seen_at, datetime.now(UTC))
+            channel = f"#{last_seen.channel}" if last_seen.channel is not None else "a channel the bot has left"
+            message = f"{target.name} was last seen in {channel} {time_since} ago: {last_seen.message}"
+        await self.bot.msg_q.send(ctx, message, [target.name])
+
 
 def prepare(bot: "Bot"):
     bot.add_cog(Message(bot))
@@ -1,30 +1,106 @@
-from datetime import datetime, UTC
+import asyncio
+from datetime import datetime, timedelta, UTC
 import os
 import re
+import time
 from typing import TYPE_CHECKING
 
 import twitchio
-from twitchio.ext import commands
+from twitchio.ext import commands, routines
 
 from shared.apis import twitch  # TODO: use twitch
-from shared.database.twitch import channels, counters, custom_commands, custom_patterns, timers, users
+from shared.database.exceptions import DatabaseError
+from shared.database.twitch import channels, counters, custom_commands, custom_patterns, retention, timers, users
 from shared.util.formatting import format_timedelta
 from Twitch.exceptions import ValidationError
+from Twitch.logger import logger
 
 if TYPE_CHECKING:
     from Twitch.twitchbot import Bot
 
 
+RETENTION_BATCH_SIZE = 1_000
+RETENTION_BATCH_PAUSE_SECONDS = 0.5
+RETENTION_RUNS_KEPT = timedelta(days=90)
+# The row limit is stored in an integer column
+MAX_RETENTION_ROWS = 2_147_483_647
+
+RETENTION_TARGETS = {
+    "messages": "MESSAGES",
+    "commands": "COMMAND_USAGE",
+    "afks": "AFKS",
+    "reminders": "REMINDERS",
+}
+
+
+def parse_retention_age(value: str) -> timedelta | None:
+    match = re.fullmatch(r"(\d+)(d|w|y)", value.lower())
+    if match is None:
+        return None
+    days = {"d": 1, "w": 7, "y": 365}
+    try:
+        return timedelta(days=int(match.group(1)) * days[match.group(2)])
+    except OverflowError:
+        raise ValidationError(f"The age is too long: {value}")
+
+
 class Moderator(commands.Cog):
     def __init__(self, bot: "Bot") -> None:
         self.bot = bot
+        self.enforce_retention.start(stop_on_error=False)
+
+    @routines.routine(hours=1, wait_first=True)
+    async def enforce_retention(self):
+        for policy in await retention.retention_policies(self.bot.con_pool):
+            # A failing policy shouldn't keep the policies of the other channels from being enforced
+            try:
+                start = time.perf_counter()
+                cutoff = await retention.retention_cutoff(self.bot.con_pool, policy)
+                if cutoff is None:
+                    continue
+
+                purged = 0
+                batches = 0
+                while True:
+                    deleted = await retention.purge_batch(
+                        self.bot.con_pool, policy.target, policy.channel_id, cutoff, RETENTION_BATCH_SIZE
+                    )
+                    purged += deleted
+                    batches += 1
+                    if deleted < RETENTION_BATCH_SIZE:
+                        break
+                    # Small batches with a pause in between keep the locks short so logging messages isn't held up
+                    await asyncio.sleep(RETENTION_BATCH_PAUSE_SECONDS)
+
+                # The last seen messages are copies of the logged ones, so they can't outlive them
+                if policy.target == "MESSAGES":
+                    await retention.delete_last_seen(self.bot.con_pool, policy.channel_id, cutoff)
+
+                if purged > 0:
+                    duration_ms = (time.perf_counter() - start) * 1000
+                    await retention.log_retention_run(
+                        self.bot.con_pool, policy.channel_id, policy.target, purged, batches, duration_ms
+                    )
+                    logger.info(
+                        "Purged %d rows of %s from channel %d in %d batches (%.0f ms)",
+                        purged,
+                        policy.target,
+                        policy.channel_id,
+                        batches,
+                        duration_ms,
+                    )
+            except DatabaseError as e:
+                logger.error(
+                    "Failed to enforce the %s retention policy of channel %d: %s", policy.target, policy.channel_id, e
+                )
+        await retention.delete_retention_runs(self.bot.con_pool, RETENTION_RUNS_KEPT)
 
     async def cog_check(self, ctx: commands.Context) -> bool:
         assert isinstance(ctx.author, twitchio.Chatter)
         assert ctx.author.id is not None
 
         if not ctx.author.is_mod:
-            user_config = await users.user_config(self.bot.con_pool, ctx.author.id)
+            user_config = await users.user_config(self.bot.con_pool, int(ctx.author.id))
             if not user_config.is_admin():
                 raise ValidationError("You must be a moderator to use this command")
         return True
@@ -55,13 +131,13 @@ class Moderator(commands.Cog):
         assert isinstance(ctx.author, twitchio.Chatter)
         assert ctx.author.id is not None
 
-        if ctx.author.id == str(target.id):
+        if int(ctx.author.id) == int(target.id):
             await self.bot.msg_q.reply(ctx, "You cannot ban yourself")
             return
 
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
 
-        if str(target.id) == channel_id:
+        if int(target.id) == channel_id:
             await self.bot.msg_q.reply(ctx, "You cannot ban the channel owner")
             return
 
@@ -70,7 +146,7 @@ class Moderator(commands.Cog):
         #     await self.bot.msg_q.reply(ctx, "You cannot ban another moderator")
         #     return
 
-        success = await channels.ban_in_channel(self.bot.con_pool, channel_id, str(target.id))
+        success = await channels.ban_in_channel(self.bot.con_pool, channel_id, int(target.id))
         if success:
             await self.bot.msg_q.reply(
                 ctx,
@@ -79,7 +155,7 @@ class Moderator(commands.Cog):
                 channels.unban_in_channel,
                 self.bot.con_pool,
                 channel_id,
-                str(target.id),
+                int(target.id),
             )
         else:
             await self.bot.msg_q.reply(ctx, "User is already banned")
@@ -88,7 +164,7 @@ class Moderator(commands.Cog):
     async def unban(self, ctx: commands.Context, target: twitchio.PartialUser):
         """Unbans the target in the current channel; {prefix}unban <target>"""
         channel_config = await channels.channel_config(self.bot.con_pool, ctx.channel.name)
-        success = await channels.unban_in_channel(self.bot.con_pool, channel_config.channel_id, str(target.id))
+        success = await channels.unban_in_channel(self.bot.con_pool, channel_config.channel_id, int(target.id))
         if success:
             await self.bot.msg_q.reply(
                 ctx,
@@ -97,7 +173,7 @@ class Moderator(commands.Cog):
                 channels.ban_in_channel,
                 self.bot.con_pool,
                 channel_config.channel_id,
-                str(target.id),
+                int(target.id),
             )
         else:
             await self.bot.msg_q.reply(ctx, "User is not currently banned")
@@ -224,6 +300,92 @@ class Moderator(commands.Cog):
             case _:
                 raise commands.MissingRequiredArgument
 
+    # The language is per channel, so every moderator shares the cooldown
+    @commands.cooldown(rate=2, per=60, bucket=commands.Bucket.channel)
+    @commands.command(aliases=("searchlang",))
+    async def searchlanguage(self, ctx: commands.Context, search_config: str | None):
+        """
+        Sets the language used when searching the chat logs of the channel with words, e.g. in {prefix}rm and {prefix}nofm;
+        {prefix}searchlanguage <language>; leave empty to show the current one; only affects messages sent after the change
+        """
+        channel_config = await channels.channel_config(self.bot.con_pool, ctx.channel.name)
+        if search_config is None:
+            await self.bot.msg_q.reply(ctx, f"The search language in this channel is {channel_config.search_config}")
+            return
+
+        success = await channels.set_search_config(self.bot.con_pool, channel_config.channel_id, search_config.lower())
+        if not success:
+            search_configs = await channels.text_search_configs(self.bot.con_pool)
+            await self.bot.msg_q.reply(ctx, f"Please provide a valid language: {', '.join(search_configs)}")
+            return
+        await self.bot.msg_q.reply(
+            ctx,
+            f"The search language in this channel is now {search_config.lower()}",
+            [],
+            channels.set_search_config,
+            self.bot.con_pool,
+            channel_config.channel_id,
+            channel_config.search_config,
+        )
+
+    @commands.cooldown(rate=3, per=30, bucket=commands.Bucket.channel)
+    @commands.command()
+    async def retention(self, ctx: commands.Context, target: str | None, *args: str):
+        """
+        Limits how much of the logged data of the channel is kept; {prefix}retention <messages/commands/afks/reminders> <max age> <max rows>;
+        the age is given in days, weeks or years, e.g. 90d, 12w or 1y, and either limit can be left out; use off to keep everything;
+        leave empty to show the current limits and the number of rows removed in the last week
+        """
+        channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
+        if target is None:
+            policies = await retention.retention_policies(self.bot.con_pool, channel_id)
+            if len(policies) == 0:
+                await self.bot.msg_q.reply(ctx, "Everything is kept in this channel")
+                return
+            purged = await retention.purged_rows(self.bot.con_pool, channel_id, datetime.now(UTC) - timedelta(days=7))
+            names = {value: key for key, value in RETENTION_TARGETS.items()}
+            limits = []
+            for policy in policies:
+                limit = [f"{policy.max_age.days}d"] if policy.max_age is not None else []
+                limit += [f"{policy.max_rows} rows"] if policy.max_rows is not None else []
+                limits.append(f"{names[policy.target]}: {', '.join(limit)} ({purged.get(policy.target, 0)} removed this week)")
+            await self.bot.msg_q.reply(ctx, " | ".join(limits))
+            return
+
+        if target.lower() not in RETENTION_TARGETS:
+            raise ValidationError(f"Please provide a valid target: {', '.join(RETENTION_TARGETS)}")
+        retention_target = RETENTION_TARGETS[target.lower()]
+
+        if len(args) == 1 and args[0].lower() == "off":
+            success = await retention.remove_retention_policy(self.bot.con_pool, channel_id, retention_target)
+            if not success:
+                await self.bot.msg_q.reply(ctx, f"Every row of {target.lower()} is already kept")
+                return
+            await self.bot.msg_q.reply(ctx, f"Every row of {target.lower()} is now kept")
+            return
+
+        max_age = None
+        max_rows = None
+        for arg in args:
+            age = parse_retention_age(arg)
+            if age is not None and age > timedelta(0):
+                max_age = age
+            elif arg.isdecimal() and int(arg) > 0:
+                if int(arg) > MAX_RETENTION_ROWS:
+                    raise ValidationError(f"The number of rows can be at most {MAX_RETENTION_ROWS}")
+                max_rows = int(arg)
+            else:
+                raise ValidationError(f"An invalid limit was given: {arg}; use an age like 90d, 12w or 1y or a number of rows")
+        if max_age is None and max_rows is None:
+            raise commands.MissingRequiredArgument
+
+        await retention.set_retention_policy(self.bot.con_pool, channel_id, retention_target, max_age, max_rows)
+        limit = [f"{max_age.days} days"] if max_age is not None else []
+        limit += [f"{max_rows} rows"] if max_rows is not None else []
+        await self.bot.msg_q.reply(
+            ctx, f"At most {' and '.join(limit)} of {target.lower()} are now kept; older ones are removed within an hour"
+        )
+
     @commands.command(aliases=("option", "setting", "settings"))
     async def options(self, ctx: commands.Context, setting: str | None, on_or_off: str | None):
         """
@@ -25,24 +25,37 @@ class Remind(commands.Cog):
     @routines.routine(seconds=1, wait_first=True)
     async def check_reminders(self):
         rems = await reminders.sendable_timed_reminders(self.bot.con_pool)
+        if len(rems) == 0:
+            return
+
+        channel_configs = {}
+        sendable_rems = []
         for rem in rems:
-            channel_config = await channels.channel_config_from_id(self.bot.con_pool, rem.channel_id)
+            if rem.channel_id not in channel_configs:
+                channel_configs[rem.channel_id] = await channels.channel_config_from_id(self.bot.con_pool, rem.channel_id)
+            channel_config = channel_configs[rem.channel_id]
             if not channel_config.reminds_online and channel_config.currently_online:
                 continue
-            users = await self.bot.fetch_users(ids=[int(rem.sender_id), int(rem.target_id)])
-            sender = [user for user in users if user.id == int(rem.sender_id)]
-            if len(sender) == 1:
-                sender_name = sender[0].name
-            else:
-                sender_name = "<unknown user>"
-            target = [user for user in users if user.id == int(rem.target_id)]
-            if len(target) == 1:
-                target_name = target[0].name
-            else:
-                continue
-            message, targets = await rem.formatted_message(sender_name, target_name)
-            await self.bot.msg_q.send_message(channel_config.username, message, targets)
-            await reminders.set_reminder_as_sent(self.bot.con_pool, rem.id)
+            sendable_rems.append(rem)
+
+        # Resolve the names of every sender and target at once instead of one request per reminder
+        usernames = await self.bot.user_cache.usernames(
+            [rem.sender_id for rem in sendable_rems] + [rem.target_id for rem in sendable_rems]
+        )
+        sent_ids = []
+        try:
+            for rem in sendable_rems:
+                target_name = usernames.get(rem.target_id)
+                if target_name is None:
+                    continue
+                sender_name = usernames.get(rem.sender_id, "<unknown user>")
+                message, targets = await rem.formatted_message(sender_name, target_name)
+                await self.bot.msg_q.send_message(channel_configs[rem.channel_id].username, message, targets)
+                sent_ids.append(rem.id)
+        finally:
+            # The reminders sent before a failure are marked as well, so they aren't sent again on the next run
+            if len(sent_ids) > 0:
+                await reminders.set_reminders_as_sent(self.bot.con_pool, sent_ids)
 
     @routines.routine(seconds=1, wait_first=True)
     async def check_timers(self):
@@ -70,10 +83,10 @@ class Remind(commands.Cog):
 
         if target is not None:
             target_name = target.name
-            target_id = str(target.id)
+            target_id = int(target.id)
         elif len(args) > 0 and args[-1] == "me":
             target_name = ctx.author.name
-            target_id = ctx.author.id
+            target_id = int(ctx.author.id)
             args = args[:-1]
         else:
             raise ValidationError("Please provide a valid target")
@@ -164,7 +177,7 @@ class Remind(commands.Cog):
         id = await reminders.set_reminder(
             self.bot.con_pool,
             channel_id,
-            ctx.author.id,
+            int(ctx.author.id),
             target_id,
             message,
             scheduled_at,
@@ -210,7 +223,7 @@ class Remind(commands.Cog):
             and not emote.endswith("0")
             and "untuck" not in emote.lower(),
         )
-        await reminders.set_afk(self.bot.con_pool, channel_id, ctx.author.id, "GN")
+        await reminders.set_afk(self.bot.con_pool, channel_id, int(ctx.author.id), "GN")
         await self.bot.msg_q.send(
             ctx,
             f"{goodnight_emote} {ctx.author.name} sleep well {bed_emote}",
@@ -225,7 +238,7 @@ class Remind(commands.Cog):
         assert ctx.author.id is not None
 
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
-        await reminders.set_afk(self.bot.con_pool, channel_id, ctx.author.id, "AFK")
+        await reminders.set_afk(self.bot.con_pool, channel_id, int(ctx.author.id), "AFK")
         await self.bot.msg_q.send(ctx, f"{ctx.author.name} is now afk", [ctx.author.name])
 
     @commands.cooldown(rate=2, per=10, bucket=commands.Bucket.member)
@@ -240,7 +253,7 @@ class Remind(commands.Cog):
             channel_id,
             lambda emote: emote.lower() in ("money", "corpa"),
         )
-        await reminders.set_afk(self.bot.con_pool, channel_id, ctx.author.id, "WORK")
+        await reminders.set_afk(self.bot.con_pool, channel_id, int(ctx.author.id), "WORK")
         await self.bot.msg_q.send(ctx, f"{ctx.author.name} is now working {emote}", [ctx.author.name])
 
     @commands.cooldown(rate=2, per=10, bucket=commands.Bucket.member)
@@ -251,11 +264,11 @@ class Remind(commands.Cog):
         assert isinstance(ctx.author, twitchio.Chatter)
         assert ctx.author.id is not None
 
-        user_config = await users.user_config(self.bot.con_pool, ctx.author.id)
+        user_config = await users.user_config(self.bot.con_pool, int(ctx.author.id))
         if user_config.is_admin():
             success = await reminders.cancel_reminder(self.bot.con_pool, reminder_id)
         else:
-            success = await reminders.cancel_reminder_check_sender(self.bot.con_pool, reminder_id, ctx.author.id)
+            success = await reminders.cancel_reminder_check_sender(self.bot.con_pool, reminder_id, int(ctx.author.id))
         if success:
             emote = await seventv.best_fitting_emote(
                 await channels.channel_id(self.bot.con_pool, ctx.channel.name),
@@ -282,7 +295,7 @@ class Remind(commands.Cog):
 
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
         # TODO: make this get the last type of afk
-        success = await reminders.continue_afk(self.bot.con_pool, channel_id, ctx.author.id)
+        success = await reminders.continue_afk(self.bot.con_pool, channel_id, int(ctx.author.id))
         if success:
             emote = await seventv.best_fitting_emote(
                 await channels.channel_id(self.bot.con_pool, ctx.channel.name),
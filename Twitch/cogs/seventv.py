@@ -1,12 +1,13 @@
-from datetime import datetime, UTC
+from datetime import datetime, timedelta, UTC
 import random
+import re
 from typing import TYPE_CHECKING
 
 import twitchio
-from twitchio.ext import commands
+from twitchio.ext import commands, routines
 
 from shared.apis import seventv
-from shared.database.twitch import channels, messages
+from shared.database.twitch import channels, emotes, tokens
 from shared.util.formatting import format_timedelta
 from Twitch.exceptions import ValidationError
 
@@ -17,6 +18,11 @@ if TYPE_CHECKING:
 class SevenTV(commands.Cog):
     def __init__(self, bot: "Bot") -> None:
         self.bot = bot
+        self.flush_emote_usage.start(stop_on_error=False)
+
+    @routines.routine(minutes=1, wait_first=True)
+    async def flush_emote_usage(self):
+        await self.bot.emote_usage.flush()
 
     @commands.cooldown(rate=2, per=15, bucket=commands.Bucket.member)
     @commands.command(name="7tvuser", aliases=("7tvu",))
@@ -28,9 +34,9 @@ class SevenTV(commands.Cog):
         if target is None:
             assert isinstance(ctx.author, twitchio.Chatter)
             assert ctx.author.id is not None
-            target_id = ctx.author.id
+            target_id = int(ctx.author.id)
         else:
-            target_id = str(target.id)
+            target_id = int(target.id)
 
         user_info = await seventv.account_info(target_id, force_cache=True)
         if user_info is None:
@@ -83,10 +89,10 @@ class SevenTV(commands.Cog):
 
         if target is None:
             target_name = ctx.author.name
-            target_id = ctx.author.id
+            target_id = int(ctx.author.id)
         else:
             target_name = target.name
-            target_id = str(target.id)
+            target_id = int(target.id)
 
         user_info = await seventv.account_info(target_id)
         if user_info is None:
@@ -141,8 +147,64 @@ class SevenTV(commands.Cog):
         if emote not in emote_names:
             await self.bot.msg_q.send(ctx, "Emote not found in the current set")
             return
-        count = await messages.emote_count(self.bot.con_pool, channel_config.channel_id, emote)
-        await self.bot.msg_q.send(ctx, f"{emote} has been used {count} times")
+        counted = await tokens.token_count(self.bot.con_pool, channel_config.channel_id, emote)
+        if counted is None:
+            max_pruned = await tokens.max_pruned_count(self.bot.con_pool, channel_config.channel_id)
+            if max_pruned > 0:
+                message = f"{emote} has been used at most {max_pruned} times (uncommon words aren't counted)"
+            else:
+                message = f"{emote} hasn't been used"
+        else:
+            message = f"{emote} has been used {counted.count} times"
+            if counted.max_uncounted > 0:
+                message += f" (up to {counted.max_uncounted} older uses were pruned)"
+        await self.bot.msg_q.send(ctx, message)
+
+    @commands.cooldown(rate=2, per=10, bucket=commands.Bucket.member)
+    @commands.command(aliases=("eusage", "etop"))
+    async def emoteusage(self, ctx: commands.Context, *args: str):
+        """
+        Shows the most used 7tv emotes of the channel, or the least used with -b; a time period like 30d or 4w
+        can be given to only count the recent uses; {prefix}emoteusage <-b> <period>
+        """
+        channel_config = await channels.channel_config(self.bot.con_pool, ctx.channel.name)
+        if not channel_config.logging:
+            raise ValidationError("This channel isn't being logged")
+
+        since = None
+        for arg in args:
+            if arg == "-b":
+                continue
+            match = re.fullmatch(r"(\d+)(d|w)", arg.lower())
+            if match is None:
+                raise ValidationError(f"An invalid time period was given: {arg}; use days or weeks like 30d or 4w")
+            days = int(match.group(1)) * (7 if match.group(2) == "w" else 1)
+            try:
+                since = (datetime.now(UTC) - timedelta(days=days)).date()
+            except OverflowError:
+                raise ValidationError(f"The time period is too long: {arg}; leave it out to count every use")
+
+        emote_names = await self.bot.emote_usage.emote_names(channel_config.channel_id)
+        if len(emote_names) == 0:
+            await self.bot.msg_q.send(ctx, "Current channel doesn't have any 7tv emotes")
+            return
+        tracked_since = await emotes.emote_usage_tracked_since(self.bot.con_pool, channel_config.channel_id)
+        if tracked_since is None:
+            await self.bot.msg_q.send(ctx, "Emote usage hasn't been counted in this channel yet")
+            return
+
+        usage = await emotes.emote_usage(self.bot.con_pool, channel_config.channel_id, list(emote_names), since)
+        # Ties are broken by name so the same emotes are shown every time
+        ranked = sorted(usage.items(), key=lambda emote: (-emote[1], emote[0]))
+        if "-b" in args:
+            shown = ranked[-10:][::-1]
+            title = "Least used emotes"
+        else:
+            shown = ranked[:10]
+            title = "Most used emotes"
+        counted_from = max(since, tracked_since) if since is not None else tracked_since
+        emote_list = ", ".join(f"{emote} ({count})" for emote, count in shown)
+        await self.bot.msg_q.send(ctx, f"{title} since {counted_from.strftime('%Y-%m-%d')}: {emote_list}")
 
     @commands.cooldown(rate=4, per=10, bucket=commands.Bucket.member)
     @commands.command(aliases=("randomemote", "randemote"))
@@ -119,7 +119,7 @@ class SevenTVEditor(commands.Cog):
             await self.bot.msg_q.send(ctx, "Current channel doesn't have a 7tv account")
             return
 
-        user_info = await seventv.account_info(str(target.id))
+        user_info = await seventv.account_info(int(target.id))
         if user_info is None:
             await self.bot.msg_q.send(ctx, "Target user doesn't have a 7tv account")
             return
@@ -144,7 +144,7 @@ class SevenTVEditor(commands.Cog):
             await self.bot.msg_q.send(ctx, "Current channel doesn't have a 7tv account")
             return
 
-        user_info = await seventv.account_info(str(target.id))
+        user_info = await seventv.account_info(int(target.id))
         if user_info is None:
             await self.bot.msg_q.send(ctx, "Target user doesn't have a 7tv account")
             return
@@ -169,8 +169,8 @@ class SevenTVEditor(commands.Cog):
         """
         if seventv.is_valid_id(target_set):
             from_emote_set = await seventv.emote_set_from_id(target_set, force_cache=True)
-        elif target_user := await self.bot.fetch_users(names=[target_set]):
-            user_account = await seventv.account_info(str(target_user[0].id), force_cache=True)
+        elif target_user_id := (await self.bot.user_cache.user_ids([target_set])).get(target_set.lower()):
+            user_account = await seventv.account_info(target_user_id, force_cache=True)
             if user_account is None:
                 await self.bot.msg_q.send(ctx, "Target user doesn't have a 7tv account")
                 return
@@ -426,7 +426,7 @@ class SevenTVEditor(commands.Cog):
             await self.bot.msg_q.send(ctx, "Current channel doesn't have a 7tv account")
             return
 
-        target_user_info = await seventv.account_info(str(target_channel.id), force_cache=True)
+        target_user_info = await seventv.account_info(int(target_channel.id), force_cache=True)
         if target_user_info is None:
             await self.bot.msg_q.send(ctx, "Target channel doesn't have a 7tv account")
             return
@@ -6,7 +6,7 @@ from twitchio.ext import commands
 
 from shared.database.twitch import channels, notifications
 from Twitch.exceptions import ValidationError
-from Twitch.handlers import eventsub
+from Twitch.handlers import eventsub, log_export
 from Twitch.logger import logger
 
 if TYPE_CHECKING:
@@ -20,8 +20,8 @@ class TwitchNotifications(commands.Cog):
 
     async def __ainit__(self):
         initial_channel_ids = await channels.initial_channel_ids(self.bot.con_pool)
-        streams = await self.bot.fetch_streams(user_ids=[int(id) for id in initial_channel_ids])
-        online_channel_ids = [str(stream.user.id) for stream in streams]
+        streams = await self.bot.fetch_streams(user_ids=list(initial_channel_ids))
+        online_channel_ids = [stream.user.id for stream in streams]
         offline_channel_ids = initial_channel_ids.difference(online_channel_ids)
 
         for online_channel_id in online_channel_ids:
@@ -30,6 +30,9 @@ class TwitchNotifications(commands.Cog):
         for offline_channel_id in offline_channel_ids:
             await channels.set_offline(self.bot.con_pool, offline_channel_id)
 
+        # Routes can't be added once the server has started
+        if log_export.enabled():
+            log_export.register_log_export(eventsub.esclient, self.bot)
         self.bot.loop.create_task(eventsub.esclient.listen(port=4000))
         eventsub.register_eventsub_handlers(self.bot)
 
@@ -38,17 +41,17 @@ class TwitchNotifications(commands.Cog):
 
         subs = await eventsub.esclient.get_subscriptions("enabled")
 
-        online_subs = [sub.condition["broadcaster_user_id"] for sub in subs if sub.type == "stream.online"]
+        online_subs = [int(sub.condition["broadcaster_user_id"]) for sub in subs if sub.type == "stream.online"]
         for target_id in online_notification_ids:
             if target_id not in online_subs:
                 await eventsub.subscribe_stream_start(target_id)
 
-        offline_subs = [sub.condition["broadcaster_user_id"] for sub in subs if sub.type == "stream.offline"]
+        offline_subs = [int(sub.condition["broadcaster_user_id"]) for sub in subs if sub.type == "stream.offline"]
         for target_id in initial_channel_ids:
             if target_id not in offline_subs:
                 await eventsub.subscribe_stream_end(target_id)
 
-        user_update_subs = [sub.condition["user_id"] for sub in subs if sub.type == "user.update"]
+        user_update_subs = [int(sub.condition["user_id"]) for sub in subs if sub.type == "user.update"]
         for target_id in initial_channel_ids:
             if target_id not in user_update_subs:
                 await eventsub.subscribe_user_updated(target_id)
@@ -65,7 +68,7 @@ class TwitchNotifications(commands.Cog):
 
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
         success = await notifications.sub_to_twitch_notifications(
-            self.bot.con_pool, channel_id, str(target_channel.id)
+            self.bot.con_pool, channel_id, int(target_channel.id)
         )
 
         if not success:
@@ -81,7 +84,7 @@ class TwitchNotifications(commands.Cog):
             success = await eventsub.subscribe_stream_start(target_channel.id)
             if not success:
                 await notifications.unsub_to_twitch_notifications(
-                    self.bot.con_pool, channel_id, str(target_channel.id)
+                    self.bot.con_pool, channel_id, int(target_channel.id)
                 )
                 await self.bot.msg_q.reply(ctx, "Failed to subscribe to live notifications")
                 return
@@ -99,7 +102,7 @@ class TwitchNotifications(commands.Cog):
         # TODO: unnotify all
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
         success = await notifications.unsub_to_twitch_notifications(
-            self.bot.con_pool, channel_id, str(target_channel.id)
+            self.bot.con_pool, channel_id, int(target_channel.id)
         )
 
         if not success:
@@ -112,7 +115,7 @@ class TwitchNotifications(commands.Cog):
 
         if target_channel.name not in [con.name for con in self.bot.connected_channels]:
             notifs_to_target = await notifications.twitch_notifications_to_target(
-                self.bot.con_pool, str(target_channel.id)
+                self.bot.con_pool, int(target_channel.id)
             )
             if len(notifs_to_target) == 0:
                 subs_to_target = await eventsub.esclient.get_subscriptions(user_id=target_channel.id)
@@ -132,7 +135,7 @@ class TwitchNotifications(commands.Cog):
         assert ctx.author.id is not None
 
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
-        notifs = await notifications.twitch_notifications_to_target(self.bot.con_pool, str(target_channel.id))
+        notifs = await notifications.twitch_notifications_to_target(self.bot.con_pool, int(target_channel.id))
         if channel_id not in [notif.channel_id for notif in notifs]:
             await self.bot.msg_q.send(
                 ctx,
@@ -141,7 +144,7 @@ class TwitchNotifications(commands.Cog):
             )
             return
 
-        success = await notifications.ping(self.bot.con_pool, ctx.author.id, channel_id, str(target_channel.id))
+        success = await notifications.ping(self.bot.con_pool, int(ctx.author.id), channel_id, int(target_channel.id))
         if success:
             await self.bot.msg_q.send(
                 ctx,
@@ -149,9 +152,9 @@ class TwitchNotifications(commands.Cog):
                 [target_channel.name],
                 notifications.unping,
                 self.bot.con_pool,
-                ctx.author.id,
+                int(ctx.author.id),
                 channel_id,
-                str(target_channel.id),
+                int(target_channel.id),
             )
         else:
             await self.bot.msg_q.send(
@@ -168,7 +171,7 @@ class TwitchNotifications(commands.Cog):
         assert ctx.author.id is not None
 
         channel_id = await channels.channel_id(self.bot.con_pool, ctx.channel.name)
-        notifs = await notifications.twitch_notifications_to_target(self.bot.con_pool, str(target_channel.id))
+        notifs = await notifications.twitch_notifications_to_target(self.bot.con_pool, int(target_channel.id))
         if channel_id not in [notif.channel_id for notif in notifs]:
             await self.bot.msg_q.send(
                 ctx,
@@ -177,7 +180,7 @@ class TwitchNotifications(commands.Cog):
             )
             return
 
-        success = await notifications.unping(self.bot.con_pool, ctx.author.id, channel_id, str(target_channel.id))
+        success = await notifications.unping(self.bot.con_pool, int(ctx.author.id), channel_id, int(target_channel.id))
         if success:
             await self.bot.msg_q.send(
                 ctx,
@@ -185,9 +188,9 @@ class TwitchNotifications(commands.Cog):
                 [target_channel.name],
                 notifications.unping,
                 self.bot.con_pool,
-                ctx.author.id,
+                int(ctx.author.id),
                 channel_id,
-                str(target_channel.id),
+                int(target_channel.id),
             )
         else:
             await self.bot.msg_q.send(ctx, "You haven't made me ping you before")
@@ -5,6 +5,7 @@ import twitchio
 from twitchio.ext import commands, routines
 
 from shared.apis import twitch
+from shared.database.exceptions import DatabaseError
 from shared.database.twitch import channels, users
 from shared.util.formatting import format_timedelta
 from Twitch.logger import logger
@@ -16,24 +17,53 @@ if TYPE_CHECKING:
 class UserInfo(commands.Cog):
     def __init__(self, bot: "Bot") -> None:
         self.bot = bot
+        # Watch time is collected here and saved in bulk, so at most one flush interval of it is lost on a crash
+        self._unsaved_watch_time: dict[tuple[int, str], tuple[int, int]] = {}
         self.add_watch_time.start(stop_on_error=False)
+        self.flush_watch_time.start(stop_on_error=False)
 
     @routines.routine(seconds=10, wait_first=True)
     async def add_watch_time(self):
+        configs = {config.username: config for config in await channels.channel_configs(self.bot.con_pool)}
         for channel in self.bot.connected_channels:
             if channel.chatters is None:
                 logger.warning("Unable to get channel chatters for #%s", channel.name)
                 continue
 
-            channel_config = await channels.channel_config(self.bot.con_pool, channel.name)
-            if self.watchtime.name in channel_config.disabled_commands:
+            channel_config = configs.get(channel.name)
+            if channel_config is None or self.watchtime.name in channel_config.disabled_commands:
                 continue
 
-            chatters = [user.name for user in channel.chatters if type(user.name) == str]
-            if channel_config.currently_online:
-                await users.add_online_time(self.bot.con_pool, channel_config.channel_id, chatters, 10)
-            else:
-                await users.add_offline_time(self.bot.con_pool, channel_config.channel_id, chatters, 10)
+            online_time = 10 if channel_config.currently_online else 0
+            for user in channel.chatters:
+                if type(user.name) != str:
+                    continue
+                key = (channel_config.channel_id, user.name)
+                unsaved_online_time, unsaved_total_time = self._unsaved_watch_time.get(key, (0, 0))
+                self._unsaved_watch_time[key] = (unsaved_online_time + online_time, unsaved_total_time + 10)
+
+    @routines.routine(minutes=1, wait_first=True)
+    async def flush_watch_time(self):
+        await self.save_watch_time()
+
+    async def save_watch_time(self) -> None:
+        """Saves all of the collected watch time to the database"""
+        if len(self._unsaved_watch_time) == 0:
+            return
+
+        unsaved = self._unsaved_watch_time
+        self._unsaved_watch_time = {}
+        try:
+            await users.add_watch_times(
+                self.bot.con_pool,
+                [(channel_id, user, online, total) for (channel_id, user), (online, total) in unsaved.items()],
+            )
+        except DatabaseError:
+            # Keep the time around so that it is saved on the next flush instead
+            for key, (online, total) in unsaved.items():
+                unsaved_online_time, unsaved_total_time = self._unsaved_watch_time.get(key, (0, 0))
+                self._unsaved_watch_time[key] = (unsaved_online_time + online, unsaved_total_time + total)
+            raise
 
     @commands.cooldown(rate=3, per=10, bucket=commands.Bucket.member)
     @commands.command(aliases=("u",))
@@ -164,7 +194,7 @@ class UserInfo(commands.Cog):
             user = ctx.author.name
             user_id = ctx.author.id
             channel = ctx.channel.name
-            channel_id = await channels.channel_id(self.bot.con_pool, channel)
+            channel_id = str(await channels.channel_id(self.bot.con_pool, channel))
         elif user_2 is None:
             user = ctx.author.name
             user_id = ctx.author.id
@@ -297,7 +327,7 @@ class UserInfo(commands.Cog):
         """Shows the socials set on twitch for the current channel; a target channel can be specified: {prefix}socials <target>"""
         if target_channel is None:
             channel = ctx.channel.name
-            channel_id = await channels.channel_id(self.bot.con_pool, channel)
+            channel_id = str(await channels.channel_id(self.bot.con_pool, channel))
         else:
             channel = target_channel.name
             channel_id = str(target_channel.id)
@@ -316,7 +346,7 @@ class UserInfo(commands.Cog):
         """Shows the twitch schedule for the next 7 days for the current channel; a target channel can be specified: {prefix}schedule <target>"""
         if target_channel is None:
             channel = ctx.channel.name
-            channel_id = await channels.channel_id(self.bot.con_pool, channel)
+            channel_id = str(await channels.channel_id(self.bot.con_pool, channel))
         else:
             channel = target_channel.name
             channel_id = str(target_channel.id)
@@ -352,7 +382,7 @@ class UserInfo(commands.Cog):
         """Shows the info of the next scheduled stream of the current channel; a target channel can be specified: {prefix}next <target>"""
         if target_channel is None:
             channel = ctx.channel.name
-            channel_id = await channels.channel_id(self.bot.con_pool, channel)
+            channel_id = str(await channels.channel_id(self.bot.con_pool, channel))
         else:
             channel = target_channel.name
             channel_id = str(target_channel.id)
@@ -387,7 +417,7 @@ class UserInfo(commands.Cog):
         """Shows the founders of the target channel; {prefix}mods <target>; leave empty for the current channel"""
         if target_channel is None:
             channel = ctx.channel.name
-            channel_id = await channels.channel_id(self.bot.con_pool, channel)
+            channel_id = str(await channels.channel_id(self.bot.con_pool, channel))
         else:
             channel = target_channel.name
             channel_id = str(target_channel.id)
@@ -31,7 +31,7 @@ class Util(commands.Cog):
 
         match action:
             case "on":
-                success = await users.replies_on(self.bot.con_pool, ctx.author.id)
+                success = await users.replies_on(self.bot.con_pool, int(ctx.author.id))
                 if success:
                     await self.bot.msg_q.reply(
                         ctx,
@@ -39,13 +39,13 @@ class Util(commands.Cog):
                         [],
                         users.replies_off,
                         self.bot.con_pool,
-                        ctx.author.id,
+                        int(ctx.author.id),
                     )
                 else:
                     await self.bot.msg_q.reply(ctx, "Replies are already on")
 
             case "off":
-                success = await users.replies_off(self.bot.con_pool, ctx.author.id)
+                success = await users.replies_off(self.bot.con_pool, int(ctx.author.id))
                 if success:
                     await self.bot.msg_q.reply(
                         ctx,
@@ -53,7 +53,7 @@ class Util(commands.Cog):
                         [],
                         users.replies_on,
                         self.bot.con_pool,
-                        ctx.author.id,
+                        int(ctx.author.id),
                     )
                 else:
                     await self.bot.msg_q.reply(ctx, "Replies are already off")
@@ -89,14 +89,14 @@ class Util(commands.Cog):
             await self.bot.msg_q.reply(ctx, "None of the given commands are optoutable")
             return
 
-        await users.optin(self.bot.con_pool, ctx.author.id, optoutable)
+        await users.optin(self.bot.con_pool, int(ctx.author.id), optoutable)
         await self.bot.msg_q.reply(
             ctx,
             f"Opted in to {', '.join(optoutable)}",
             [],
             users.optout,
             self.bot.con_pool,
-            ctx.author.id,
+            int(ctx.author.id),
             optoutable,
         )
 
@@ -128,14 +128,14 @@ class Util(commands.Cog):
             await self.bot.msg_q.reply(ctx, "None of the given commands are optoutable")
             return
 
-        await users.optout(self.bot.con_pool, ctx.author.id, optoutable)
+        await users.optout(self.bot.con_pool, int(ctx.author.id), optoutable)
         await self.bot.msg_q.reply(
             ctx,
             f"Opted out of {', '.join(optoutable)}",
             [],
             users.optin,
             self.bot.con_pool,
-            ctx.author.id,
+            int(ctx.author.id),
             optoutable,
         )
 
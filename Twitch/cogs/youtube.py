@@ -44,8 +44,8 @@ class Youtube(commands.Cog):
                     emote = await seventv.happy_emote(sub.channel_id)
                     pings = []
                     if len(sub.pings) > 0:
-                        users = await self.bot.fetch_users(ids=[int(user) for user in sub.pings])
-                        pings = [f"@{ping.name}" for ping in users]
+                        usernames = await self.bot.user_cache.usernames(sub.pings)
+                        pings = [f"@{ping}" for ping in usernames.values()]
 
                     await self.bot.msg_q.send_message(
                         channel_config.username,
@@ -150,7 +150,7 @@ class Youtube(commands.Cog):
             )
             return
 
-        success = await notifications.ytping(self.bot.con_pool, ctx.author.id, channel_id, playlist_id)
+        success = await notifications.ytping(self.bot.con_pool, int(ctx.author.id), channel_id, playlist_id)
         if success:
             await self.bot.msg_q.send(
                 ctx,
@@ -158,7 +158,7 @@ class Youtube(commands.Cog):
                 [],
                 notifications.ytunping,
                 self.bot.con_pool,
-                ctx.author.id,
+                int(ctx.author.id),
                 channel_id,
                 playlist_id,
             )
@@ -192,7 +192,7 @@ class Youtube(commands.Cog):
             )
             return
 
-        success = await notifications.ytunping(self.bot.con_pool, ctx.author.id, channel_id, playlist_id)
+        success = await notifications.ytunping(self.bot.con_pool, int(ctx.author.id), channel_id, playlist_id)
         if success:
             await self.bot.msg_q.send(
                 ctx,
@@ -200,7 +200,7 @@ class Youtube(commands.Cog):
                 [],
                 notifications.ytping,
                 self.bot.con_pool,
-                ctx.author.id,
+                int(ctx.author.id),
                 channel_id,
                 playlist_id,
             )
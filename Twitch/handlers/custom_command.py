@@ -12,7 +12,7 @@ from shared.database.twitch import channels, counters, custom_commands, custom_p
 # TODO: add $(args) to access arguments as a list
 # TODO: make it possible to search for matching 7tv emotes
 async def parse_message_content(
-    message: twitchio.Message, con_pool: Pool, channel_id: str, cmd_message: str, args: list[str]
+    message: twitchio.Message, con_pool: Pool, channel_id: int, cmd_message: str, args: list[str]
 ) -> str | None:
     assert isinstance(message.author.name, str)
 
@@ -0,0 +1,79 @@
+import asyncio
+from collections import Counter
+from datetime import date, datetime, timedelta, UTC
+
+from asyncpg import Pool
+
+from shared.apis import seventv
+from shared.apis.exceptions import APIRequestError
+from shared.database.twitch import emotes
+from Twitch.logger import logger
+
+
+class EmoteUsage:
+    """
+    Counts the uses of each channel's 7tv emotes from the incoming messages and adds the counts to the database in batches,
+    so the usage of every emote can be read without scanning the logged messages.
+    """
+
+    def __init__(
+        self,
+        con_pool: Pool,
+        flush_size: int = 2_000,
+        emote_ttl: timedelta = timedelta(minutes=10),
+        retry_delay: timedelta = timedelta(minutes=1),
+    ) -> None:
+        self.con_pool = con_pool
+        self._flush_size = flush_size
+        self._emote_ttl = emote_ttl
+        self._retry_delay = retry_delay
+        self._pending: Counter[tuple[int, str, date]] = Counter()
+        self._emote_names: dict[int, tuple[datetime, frozenset[str]]] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    async def emote_names(self, channel_id: int) -> frozenset[str]:
+        """Returns the names of the channel's 7tv emotes, refreshed when they are older than the ttl"""
+        cached = self._emote_names.get(channel_id)
+        if cached is not None and cached[0] > datetime.now(UTC):
+            return cached[1]
+        try:
+            names = frozenset(await seventv.emote_names(channel_id))
+        except APIRequestError as e:
+            # Counting shouldn't stop every message from being handled while 7tv is down
+            logger.debug("Failed to refresh the 7tv emotes of channel %d: %s", channel_id, e.message)
+            # The fallback is cached as well, so 7tv isn't asked again on every message until it's back up
+            names = cached[1] if cached is not None else frozenset()
+            self._emote_names[channel_id] = (datetime.now(UTC) + self._retry_delay, names)
+            return names
+        self._emote_names[channel_id] = (datetime.now(UTC) + self._emote_ttl, names)
+        return names
+
+    async def add(self, channel_id: int, message: str) -> None:
+        emote_names = await self.emote_names(channel_id)
+        if len(emote_names) == 0:
+            return
+        today = datetime.now(UTC).date()
+        for word in message.split():
+            if word in emote_names:
+                self._pending[(channel_id, word, today)] += 1
+        # The flush runs in the background so handling the message doesn't wait on the database
+        if len(self._pending) >= self._flush_size and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_in_background())
+
+    async def flush(self) -> None:
+        if len(self._pending) == 0:
+            return
+        pending = self._pending
+        self._pending = Counter()
+        try:
+            await emotes.add_emote_usage(self.con_pool, dict(pending))
+        except Exception:
+            # The counts are kept for the next flush instead of being lost
+            self._pending.update(pending)
+            raise
+
+    async def _flush_in_background(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Failed to add the emote usage to the database: %s", e)
@@ -56,7 +56,7 @@ def register_eventsub_handlers(bot: "Bot") -> None:
         data: eventsub.StreamOnlineData = payload.data  # type: ignore
         logger.debug("Received a stream start event for %s", data.broadcaster.name)
         # This does nothing if the bot isn't currently in the channel
-        await channels.set_online(bot.con_pool, str(data.broadcaster.id))
+        await channels.set_online(bot.con_pool, data.broadcaster.id)
 
         channel = await twitch.user_info(user_id=str(data.broadcaster.id))
         if channel is None:
@@ -69,7 +69,7 @@ def register_eventsub_handlers(bot: "Bot") -> None:
         title = channel.broadcast_settings.title if channel.broadcast_settings.title is not None else "<no title>"
         category = channel.broadcast_settings.game.display_name if channel.broadcast_settings.game is not None else "<no category>"
 
-        subs = await notifications.twitch_notifications_to_target(bot.con_pool, str(data.broadcaster.id))
+        subs = await notifications.twitch_notifications_to_target(bot.con_pool, data.broadcaster.id)
         for sub in subs:
             channel_config = await channels.channel_config_from_id(bot.con_pool, sub.channel_id)
             if not channel_config.notifications_online and channel_config.currently_online:
@@ -79,8 +79,8 @@ def register_eventsub_handlers(bot: "Bot") -> None:
 
             pings = []
             if len(sub.pings) > 0:
-                users = await bot.fetch_users(ids=[int(user) for user in sub.pings])
-                pings = [f"@{ping.name}" for ping in users]
+                usernames = await bot.user_cache.usernames(sub.pings)
+                pings = [f"@{ping}" for ping in usernames.values()]
 
             await bot.msg_q.send_message(
                 channel_config.username,
@@ -96,11 +96,11 @@ def register_eventsub_handlers(bot: "Bot") -> None:
 
         target_channel = data.broadcaster.name
         if target_channel is None:
-            user = await bot.fetch_users(ids=[data.broadcaster.id])
-            target_channel = user[0].name
+            usernames = await bot.user_cache.usernames([data.broadcaster.id])
+            target_channel = usernames.get(data.broadcaster.id)
 
         # This does nothing if the bot isn't currently in the channel
-        await channels.set_offline(bot.con_pool, str(data.broadcaster.id))
+        await channels.set_offline(bot.con_pool, data.broadcaster.id)
 
     @esbot.event()
     async def event_eventsub_notification_user_update(payload: eventsub.NotificationEvent) -> None:
@@ -111,14 +111,17 @@ def register_eventsub_handlers(bot: "Bot") -> None:
         logger.debug("Received a user update event for %s (id: %d)", data.user.name, data.user.id)
 
         updated_name = data.user.name.lower()
-        channel_config = await channels.channel_config_from_id(bot.con_pool, str(data.user.id))
+        # Replaces the old name of the user in the cache
+        bot.user_cache.add(data.user.id, updated_name)
+
+        channel_config = await channels.channel_config_from_id(bot.con_pool, data.user.id)
         if data.user.name is not None and channel_config.username != updated_name:
             logger.debug("User %s changed their name to %s", channel_config.username, updated_name)
 
             await bot.part_channels([channel_config.username])
             bot.msg_q.remove_channel(channel_config.username)
 
-            await channels.join_channel(bot.con_pool, str(data.user.id), updated_name)
+            await channels.join_channel(bot.con_pool, data.user.id, updated_name)
 
             await asyncio.sleep(5)
             await bot.join_channels([updated_name])
@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from datetime import datetime, UTC
+
+from asyncpg import Pool
+
+from shared.database.twitch import messages
+from shared.database.twitch.models import LastSeen
+
+
+class LastSeenTable:
+    """
+    Keeps where and when every chatter was last seen in any of the logged channels.
+    The newest entries are kept in memory and written to the database periodically,
+    so a lookup only has to read one row from the database when the chatter hasn't been seen recently.
+    """
+
+    def __init__(self, con_pool: Pool, max_size: int = 100_000) -> None:
+        self.con_pool = con_pool
+        self._max_size = max_size
+        self._seen: OrderedDict[int, LastSeen] = OrderedDict()
+        self._unsaved: set[int] = set()
+
+    def add(self, user_id: int, channel_id: int, channel: str, message: str) -> None:
+        self._seen.pop(user_id, None)
+        self._seen[user_id] = LastSeen(
+            user_id=user_id, channel_id=channel_id, channel=channel, message=message, seen_at=datetime.now(UTC)
+        )
+        self._unsaved.add(user_id)
+
+    async def last_seen(self, user_id: int) -> LastSeen | None:
+        seen = self._seen.get(user_id)
+        if seen is not None:
+            return seen
+        return await messages.global_last_seen(self.con_pool, user_id)
+
+    async def save(self) -> None:
+        if len(self._unsaved) > 0:
+            unsaved = self._unsaved
+            self._unsaved = set()
+            try:
+                await messages.set_last_seen(self.con_pool, [self._seen[user_id] for user_id in unsaved])
+            except Exception:
+                self._unsaved.update(unsaved)
+                raise
+
+        # Only saved entries can be dropped, and the ones seen longest ago go first
+        for user_id in list(self._seen):
+            if len(self._seen) <= self._max_size:
+                break
+            if user_id not in self._unsaved:
+                del self._seen[user_id]
@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timedelta, UTC
+import hashlib
+import hmac
+import json
+import os
+from typing import Any, Mapping, TYPE_CHECKING
+
+from aiohttp import web
+
+from shared.database.exceptions import DatabaseError
+from shared.database.twitch import channels, messages, users
+from Twitch.logger import logger
+
+if TYPE_CHECKING:
+    from Twitch.twitchbot import Bot
+
+
+LINK_TTL = timedelta(hours=1)
+MAX_CONCURRENT_EXPORTS = 2
+# Lines are written to the response in batches to avoid a write for every message
+WRITE_BATCH_SIZE = 500
+
+
+def enabled() -> bool:
+    return "LOG_EXPORT_SECRET" in os.environ and os.environ["LOG_EXPORT_SECRET"] != ""
+
+
+def _signature(channel_id: int, user_id: int, expires: int) -> str:
+    payload = f"{channel_id}:{user_id}:{expires}".encode()
+    return hmac.new(os.environ["LOG_EXPORT_SECRET"].encode(), payload, hashlib.sha256).hexdigest()
+
+
+def export_url(channel_id: int, user_id: int) -> str:
+    """Returns a link to the messages of the user in the channel that stops working after the ttl"""
+    expires = int((datetime.now(UTC) + LINK_TTL).timestamp())
+    signature = _signature(channel_id, user_id, expires)
+    return f"https://{os.environ['DOMAIN_NAME']}/logs/{channel_id}/{user_id}?expires={expires}&signature={signature}"
+
+
+def _line(channel: str, message: Mapping[str, Any]) -> bytes:
+    sent_at = message["sent_at"] if isinstance(message["sent_at"], str) else message["sent_at"].isoformat()
+    entry = {"channel": channel, "sender": message["sender"], "message": message["message"], "sent_at": sent_at}
+    return (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def register_log_export(app: web.Application, bot: "Bot") -> None:
+    """Adds the route that serves the exported logs to the eventsub server; has to be called before it starts listening"""
+    exports = asyncio.Semaphore(MAX_CONCURRENT_EXPORTS)
+
+    async def export_logs(request: web.Request) -> web.StreamResponse:
+        try:
+            channel_id = int(request.match_info["channel_id"])
+            user_id = int(request.match_info["user_id"])
+            expires = int(request.query["expires"])
+            signature = request.query["signature"]
+        except (KeyError, ValueError):
+            raise web.HTTPBadRequest()
+        if not hmac.compare_digest(signature, _signature(channel_id, user_id, expires)):
+            raise web.HTTPForbidden()
+        if expires < datetime.now(UTC).timestamp():
+            raise web.HTTPGone(text="The link has expired, ask for a new one")
+        # Every export holds a database connection for as long as it streams
+        if exports.locked():
+            raise web.HTTPTooManyRequests(text="Too many logs are being downloaded right now, try again later")
+
+        async with exports:
+            try:
+                channel = (await channels.channel_config_from_id(bot.con_pool, channel_id)).username
+            except DatabaseError:
+                raise web.HTTPNotFound(text="The bot isn't in the channel anymore")
+            response = web.StreamResponse(
+                headers={
+                    "Content-Type": "application/x-ndjson; charset=utf-8",
+                    "Content-Disposition": f'attachment; filename="{channel}_{user_id}.ndjson"',
+                }
+            )
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+
+            exported = 0
+            try:
+                # The archived messages are older than any in the database, so they come first.
+                # The archive only has logins, and a previous login of the user may have been someone else's before,
+                # so only the current one is exported from it
+                login = await users.chatter_login(bot.con_pool, user_id) if bot.message_archive is not None else None
+                if bot.message_archive is not None and login is not None:
+                    async for archived in bot.message_archive.messages_by(channel_id, [login]):
+                        for start in range(0, len(archived), WRITE_BATCH_SIZE):
+                            part = archived[start : start + WRITE_BATCH_SIZE]
+                            await response.write(b"".join(_line(channel, message) for message in part))
+                        exported += len(archived)
+
+                batch = []
+                user_messages = messages.user_messages(bot.con_pool, channel_id, user_id)
+                try:
+                    async for message in user_messages:
+                        batch.append(_line(channel, message))
+                        if len(batch) >= WRITE_BATCH_SIZE:
+                            await response.write(b"".join(batch))
+                            exported += len(batch)
+                            batch = []
+                finally:
+                    # Closing the generator right away returns its connection to the pool if the export is cut short
+                    await user_messages.aclose()
+                if len(batch) > 0:
+                    await response.write(b"".join(batch))
+                    exported += len(batch)
+            except ConnectionResetError:
+                logger.debug("Log export of %d in %s was cancelled after %d messages", user_id, channel, exported)
+                return response
+            await response.write_eof()
+            logger.debug("Exported %d messages of %d in %s", exported, user_id, channel)
+            return response
+
+    app.router.add_get("/logs/{channel_id}/{user_id}", export_logs)
@@ -0,0 +1,316 @@
+import asyncio
+from datetime import datetime, UTC
+import gzip
+import json
+import os
+from pathlib import Path
+import random
+import re
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from asyncpg import Pool
+from dateutil.relativedelta import relativedelta
+
+from shared.database.twitch import messages
+from shared.database.twitch.models import ArchivedMessage, Message
+from Twitch.logger import logger
+
+
+ARCHIVE_BATCH_SIZE = 10_000
+
+
+def _empty_index(channel_id: int, month: datetime) -> dict[str, Any]:
+    return {
+        "channel_id": channel_id,
+        "month": month.strftime("%Y-%m"),
+        "parts": [],
+        "max_id": 0,
+        "count": 0,
+        "first_sent_at": None,
+        "last_sent_at": None,
+        "senders": {},
+    }
+
+
+def _message_filter(
+    sender: str | None,
+    *,
+    included_words: list[str],
+    excluded_words: list[str],
+    substrings: list[str] | None = None,
+    pattern: str | None = None,
+    min_word_count: int | None,
+    max_word_count: int | None,
+    exclude_commands: bool = False,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    online_only: bool = False,
+) -> Callable[[dict[str, Any]], bool]:
+    """
+    Returns a function that checks if an archived message matches the filters of rm and nofm.
+    Words are matched case insensitively as whole words, since the archive doesn't have the stemmed search vectors.
+    """
+    included = {word.lstrip("!").lower() for word in included_words}
+    excluded = {word.lower() for word in excluded_words}
+    lowered_substrings = [substring.lower() for substring in substrings or []]
+    compiled_pattern = re.compile(pattern, re.IGNORECASE) if pattern is not None else None
+
+    def matches(message: dict[str, Any]) -> bool:
+        if sender is not None and message["sender"] != sender:
+            return False
+        if exclude_commands and message["is_command"]:
+            return False
+        if online_only and not message["online"]:
+            return False
+        if since is not None or until is not None:
+            sent_at = datetime.fromisoformat(message["sent_at"])
+            if (since is not None and sent_at < since) or (until is not None and sent_at >= until):
+                return False
+        text: str = message["message"]
+        if min_word_count is not None or max_word_count is not None:
+            word_count = len(text.split(" "))
+            if (min_word_count is not None and word_count <= min_word_count) or (
+                max_word_count is not None and word_count >= max_word_count
+            ):
+                return False
+        lowered = text.lower()
+        if len(included) + len(excluded) > 0:
+            words = set(lowered.split())
+            if not included <= words or len(excluded & words) > 0:
+                return False
+        if any(substring not in lowered for substring in lowered_substrings):
+            return False
+        if compiled_pattern is not None and compiled_pattern.search(text) is None:
+            return False
+        return True
+
+    return matches
+
+
+class MessageArchive:
+    """
+    Moves messages older than the given number of months out of the database into gzipped NDJSON files,
+    one for each channel and month, with a small JSON index next to each of them.
+    Searching the archive means streaming through the files, so it is only used as a fallback for the database.
+    """
+
+    def __init__(self, con_pool: Pool, directory: str, archive_after_months: int) -> None:
+        self.con_pool = con_pool
+        self.directory = Path(directory)
+        self.archive_after_months = archive_after_months
+        # Searches read every index of the channel, so they are kept until their file changes
+        self._cached_indexes: dict[Path, tuple[int, dict[str, Any]]] = {}
+
+    def _index_path(self, channel_id: int, month: datetime) -> Path:
+        return self.directory / str(channel_id) / f"{month.strftime('%Y-%m')}.index.json"
+
+    def _read_index(self, path: Path) -> dict[str, Any] | None:
+        if not path.exists():
+            return None
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def _cached_index(self, path: Path) -> dict[str, Any] | None:
+        try:
+            modified = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._cached_indexes.pop(path, None)
+            return None
+        cached = self._cached_indexes.get(path)
+        if cached is not None and cached[0] == modified:
+            return cached[1]
+        index = self._read_index(path)
+        if index is not None:
+            self._cached_indexes[path] = (modified, index)
+        return index
+
+    def _write_index(self, path: Path, index: dict[str, Any]) -> None:
+        # Writing the index is what makes the new part visible, so it is replaced atomically
+        temporary_path = path.with_suffix(".tmp")
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(index, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+
+    def _write_batch(self, archive: gzip.GzipFile, index: dict[str, Any], batch: list[ArchivedMessage]) -> None:
+        for message in batch:
+            sent_at = message.sent_at.isoformat()
+            line = {
+                "id": message.id,
+                "sender": message.sender,
+                "message": message.message,
+                "sent_at": sent_at,
+                "online": message.online,
+                "is_command": message.is_command,
+            }
+            archive.write((json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8"))
+
+            index["count"] += 1
+            if index["first_sent_at"] is None or sent_at < index["first_sent_at"]:
+                index["first_sent_at"] = sent_at
+            if index["last_sent_at"] is None or sent_at > index["last_sent_at"]:
+                index["last_sent_at"] = sent_at
+            sender = index["senders"].setdefault(message.sender, {"count": 0, "commands": 0, "last_sent_at": sent_at})
+            sender["count"] += 1
+            sender["commands"] += int(message.is_command)
+            sender["last_sent_at"] = max(sender["last_sent_at"], sent_at)
+
+    async def archive_old_messages(self) -> int:
+        """Archives and deletes the messages of every monthly partition that has ended over the configured months ago"""
+        this_month = datetime.now(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        cutoff = this_month - relativedelta(months=self.archive_after_months)
+
+        archived = 0
+        for month in await messages.archivable_months(self.con_pool, cutoff):
+            for channel_id in await messages.logged_channel_ids(self.con_pool):
+                archived += await self._archive_channel_month(channel_id, month, month + relativedelta(months=1))
+            if await messages.drop_partition_if_empty(self.con_pool, month):
+                logger.info("Dropped the archived message partition of %s", month.strftime("%Y-%m"))
+        return archived
+
+    async def _archive_channel_month(self, channel_id: int, start: datetime, end: datetime) -> int:
+        index_path = self._index_path(channel_id, start)
+        index = self._read_index(index_path) or _empty_index(channel_id, start)
+
+        # Messages already in the archive have an id at most the indexed one, even if deleting them failed the last time
+        batch = await messages.messages_to_archive(self.con_pool, channel_id, start, end, index["max_id"], ARCHIVE_BATCH_SIZE)
+        if len(batch) > 0:
+            # A part left over from an interrupted run isn't in the index, so it is simply overwritten
+            part = f"{start.strftime('%Y-%m')}.{len(index['parts']) + 1}.ndjson.gz"
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            last_id = index["max_id"]
+            with open(index_path.parent / part, "wb") as file:
+                with gzip.GzipFile(fileobj=file, mode="wb") as archive:
+                    while len(batch) > 0:
+                        await asyncio.to_thread(self._write_batch, archive, index, batch)
+                        last_id = batch[-1].id
+                        batch = await messages.messages_to_archive(
+                            self.con_pool, channel_id, start, end, last_id, ARCHIVE_BATCH_SIZE
+                        )
+                file.flush()
+                os.fsync(file.fileno())
+            index["parts"].append(part)
+            index["max_id"] = last_id
+            await asyncio.to_thread(self._write_index, index_path, index)
+
+        if index["max_id"] == 0:
+            return 0
+        # Deleting in batches keeps each transaction and its locks short while the month is removed
+        deleted = 0
+        while True:
+            batch_deleted = await messages.delete_archived_messages(
+                self.con_pool, channel_id, start, end, index["max_id"], ARCHIVE_BATCH_SIZE
+            )
+            deleted += batch_deleted
+            if batch_deleted < ARCHIVE_BATCH_SIZE:
+                break
+        if deleted > 0:
+            logger.info("Archived %d messages of channel %d from %s", deleted, channel_id, index["month"])
+        return deleted
+
+    def _indexes(self, channel_id: int, since: datetime | None, until: datetime | None) -> list[tuple[Path, dict[str, Any]]]:
+        """Returns the indexes of the channel's archived months that overlap the time range, oldest first"""
+        channel_directory = self.directory / str(channel_id)
+        if not channel_directory.is_dir():
+            return []
+        indexes = []
+        for path in sorted(channel_directory.glob("*.index.json")):
+            index = self._cached_index(path)
+            if index is None or index["count"] == 0:
+                continue
+            if since is not None and datetime.fromisoformat(index["last_sent_at"]) < since:
+                continue
+            if until is not None and datetime.fromisoformat(index["first_sent_at"]) >= until:
+                continue
+            indexes.append((path.parent, index))
+        return indexes
+
+    def _messages(self, directory: Path, index: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        for part in index["parts"]:
+            with gzip.open(directory / part, "rt", encoding="utf-8") as file:
+                for line in file:
+                    yield json.loads(line)
+
+    def _part_messages_by(self, path: Path, senders: frozenset[str]) -> list[dict[str, Any]]:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            return [message for message in map(json.loads, file) if message["sender"] in senders]
+
+    def _random_message(self, channel_id: int, sender: str | None, filters: dict[str, Any]) -> Message | None:
+        matches = _message_filter(sender, **filters)
+        picked = None
+        seen = 0
+        for directory, index in self._indexes(channel_id, filters.get("since"), filters.get("until")):
+            if sender is not None and sender not in index["senders"]:
+                continue
+            # Reservoir sampling picks every matching message with the same chance in one pass
+            for message in self._messages(directory, index):
+                if matches(message):
+                    seen += 1
+                    if random.randrange(seen) == 0:
+                        picked = message
+        if picked is None:
+            return None
+        return Message(
+            channel_id=channel_id,
+            sender=picked["sender"],
+            message=picked["message"],
+            sent_at=datetime.fromisoformat(picked["sent_at"]),
+        )
+
+    def _number_of_messages(self, channel_id: int, sender: str | None, filters: dict[str, Any]) -> int:
+        indexes = self._indexes(channel_id, filters.get("since"), filters.get("until"))
+        only_commands_filtered = all(
+            not value for name, value in filters.items() if name != "exclude_commands"
+        )
+        # Counts by sender and the number of their commands are in the indexes, so the files aren't needed for them
+        if only_commands_filtered:
+            count = 0
+            for _, index in indexes:
+                senders = index["senders"].values() if sender is None else [index["senders"].get(sender)]
+                for stats in senders:
+                    if stats is not None:
+                        count += stats["count"] - (stats["commands"] if filters.get("exclude_commands") else 0)
+            return count
+
+        matches = _message_filter(sender, **filters)
+        count = 0
+        for directory, index in indexes:
+            if sender is not None and sender not in index["senders"]:
+                continue
+            count += sum(1 for message in self._messages(directory, index) if matches(message))
+        return count
+
+    def _last_seen(self, channel_id: int, sender: str) -> Message | None:
+        for directory, index in reversed(self._indexes(channel_id, None, None)):
+            stats = index["senders"].get(sender)
+            if stats is None:
+                continue
+            # Only the newest month that has the sender has to be read
+            for message in self._messages(directory, index):
+                if message["sender"] == sender and message["sent_at"] == stats["last_sent_at"]:
+                    return Message(
+                        channel_id=channel_id,
+                        sender=sender,
+                        message=message["message"],
+                        sent_at=datetime.fromisoformat(message["sent_at"]),
+                    )
+        return None
+
+    async def messages_by(self, channel_id: int, senders: list[str]) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yields the archived messages of the senders one part file at a time, oldest first"""
+        sender_set = frozenset(senders)
+        for directory, index in await asyncio.to_thread(self._indexes, channel_id, None, None):
+            if sender_set.isdisjoint(index["senders"]):
+                continue
+            for part in index["parts"]:
+                yield await asyncio.to_thread(self._part_messages_by, directory / part, sender_set)
+
+    async def random_message(self, channel_id: int, sender: str | None, **filters: Any) -> Message | None:
+        return await asyncio.to_thread(self._random_message, channel_id, sender, filters)
+
+    async def number_of_messages(self, channel_id: int, sender: str | None, **filters: Any) -> int:
+        return await asyncio.to_thread(self._number_of_messages, channel_id, sender, filters)
+
+    async def last_seen(self, channel_id: int, sender: str) -> Message | None:
+        return await asyncio.to_thread(self._last_seen, channel_id, sender)
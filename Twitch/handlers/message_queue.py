@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from asyncio import Queue, sleep, Task
+from collections import OrderedDict
 from datetime import datetime, timedelta, UTC
 from functools import partial
 import re
@@ -9,7 +10,7 @@ import twitchio
 from twitchio.ext import commands
 
 from shared.apis import twitch # TODO: use twitch
-from shared.database.twitch import channels, messages, users
+from shared.database.twitch import messages, users
 from Twitch.logger import logger
 
 if TYPE_CHECKING:
@@ -22,13 +23,14 @@ class Action:
         ctx: commands.Context,
         channel: str,
         actor: str,
-        actor_id: str,
+        actor_id: int,
         command: str,
         message: str,
         undo_callback: Callable[..., Coroutine[Any, Any, Any]] | None = None,
         reply: bool = False,
     ) -> None:
-        self.ctx = ctx
+        # Dropped once the message has been sent, since the context keeps the whole message and channel alive
+        self.ctx: commands.Context | None = ctx
         self.channel = channel
         self.actor = actor
         self.actor_id = actor_id
@@ -44,18 +46,36 @@ class Action:
 
 
 class ActionStorage:
-    def __init__(self) -> None:
+    """
+    Keeps the last action of every actor in each channel until it can't be undone anymore.
+    The actions are ordered by the time they were executed, so the expired ones are always at the front.
+    """
+
+    def __init__(self, max_size: int = 10_000) -> None:
         self._action_expiration = timedelta(minutes=30)
-        self._actions: dict[tuple[str, str], Action] = {}
+        self._max_size = max_size
+        self._actions: OrderedDict[tuple[str, str], Action] = OrderedDict()
+
+    def _evict(self) -> None:
+        expired_before = datetime.now(UTC) - self._action_expiration
+        while len(self._actions) > 0:
+            _, oldest = next(iter(self._actions.items()))
+            if len(self._actions) <= self._max_size and oldest.executed_at >= expired_before:
+                break
+            self._actions.popitem(last=False)
 
     def add_action(self, action: Action) -> None:
-        self._actions[(action.channel, action.actor)] = action
+        key = (action.channel, action.actor)
+        self._actions.pop(key, None)
+        self._actions[key] = action
+        self._evict()
 
     def remove_action(self, channel: str, actor: str) -> None:
         if (channel, actor) in self._actions:
             del self._actions[(channel, actor)]
 
     def get_last_action(self, channel: str, actor: str) -> Action | None:
+        self._evict()
         return self._actions.get((channel, actor))
 
     def action_undoable(self, channel: str, actor: str) -> bool:
@@ -97,7 +117,7 @@ class ActionStorage:
             ctx,
             ctx.channel.name,
             ctx.author.name,
-            ctx.author.id,
+            int(ctx.author.id),
             ctx.command.name,
             message,
             callback,
@@ -126,10 +146,15 @@ class CommandMessage(SendableMessage):
         self.bot_is_mod_or_vip = bot_is_mod_or_vip
 
     async def send(self) -> None:
-        if self.action.reply:
-            await self.action.ctx.reply(self.message)
-        else:
-            await self.action.ctx.send(self.message)
+        ctx = self.action.ctx
+        assert ctx is not None
+        try:
+            if self.action.reply:
+                await ctx.reply(self.message)
+            else:
+                await ctx.send(self.message)
+        finally:
+            self.action.ctx = None
 
 
 class Message(SendableMessage):
@@ -145,19 +170,47 @@ class Message(SendableMessage):
         await self.current_channel.send(self.message)
 
 
+def insert_null_character(string: str) -> str:
+    if len(string) == 0:
+        return string
+    return string[:2] + "\U000E0000" + string[2:]
+
+
+def truncate(message: str) -> str:
+    if len(message) > 500:
+        return message[:496] + " ..."
+    return message
+
+
 class MessageQueues:
     def __init__(self, bot: "Bot", initial_channels: list[str]) -> None:
         self.bot = bot
         self.actions = ActionStorage()
         self._queues: dict[str, Queue[SendableMessage]] = {}
         self._tasks: dict[str, Task] = {}
+        self._last_sent: dict[str, tuple[str, datetime]] = {}
         for channel in initial_channels:
             self.add_channel(channel)
 
+    def record_sent(self, channel: str, message: str) -> None:
+        """Remembers the last message the bot sent to the channel, which twitch doesn't allow to repeat right away"""
+        self._last_sent[channel] = (message, datetime.now(UTC))
+
+    def _is_duplicate(self, channel: str, message: str) -> bool:
+        last_sent = self._last_sent.get(channel)
+        if last_sent is None:
+            return False
+        last_message, sent_at = last_sent
+        return last_message == message and (datetime.now(UTC) - sent_at).total_seconds() <= 30
+
     async def _clear_queue(self, channel: str) -> None:
         while True:
             message = await self._queues[channel].get()
+            # Checked right before sending, so that a message queued behind an identical one is caught too
+            if not message.bot_is_mod_or_vip and self._is_duplicate(channel, message.message):
+                message.message = truncate(insert_null_character(message.message))
             await message.send()
+            self.record_sent(channel, message.message)
             if not message.bot_is_mod_or_vip:
                 await sleep(1.2)
             else:
@@ -176,6 +229,7 @@ class MessageQueues:
             del self._tasks[channel]
         if channel in self._queues:
             del self._queues[channel]
+        self._last_sent.pop(channel, None)
 
     async def _add_to_queue(self, msg: SendableMessage, targets: list[str] | tuple[str, ...]) -> None:
         """Processing of the message before it is added to the queue."""
@@ -197,11 +251,6 @@ class MessageQueues:
             else:
                 msg.message = msg.message.replace(word.pattern, replacement_word)
 
-        def insert_null_character(string: str) -> str:
-            if len(string) == 0:
-                return string
-            return string[:2] + "\U000E0000" + string[2:]
-
         if isinstance(msg, CommandMessage) and msg.action.reply:
             user_config = await users.user_config(self.bot.con_pool, msg.action.actor_id)
             if user_config.no_replies:
@@ -211,18 +260,7 @@ class MessageQueues:
         for user in targets:
             msg.message = re.sub(rf"\b@?{user}[,.:-]?\b", insert_null_character(user), msg.message)
 
-        if not msg.bot_is_mod_or_vip:
-            channel_id = await channels.channel_id(self.bot.con_pool, msg.channel)
-            bot_last_message = await messages.last_seen(self.bot.con_pool, channel_id, self.bot.nick)  # type: ignore
-            if (
-                bot_last_message is not None
-                and bot_last_message.message == msg.message
-                and (datetime.now(UTC) - bot_last_message.sent_at).seconds <= 30
-            ):
-                msg.message = insert_null_character(msg.message)
-
-        if len(msg.message) > 500:
-            msg.message = msg.message[:496] + " ..."
+        msg.message = truncate(msg.message)
 
         await self._queues[msg.channel].put(msg)
 
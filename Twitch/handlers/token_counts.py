@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime, UTC
+
+from asyncpg import Pool
+
+from shared.database.twitch import tokens
+from Twitch.logger import logger
+
+
+class TokenCounts:
+    """
+    Counts the words of the incoming messages and adds the counts to the database in batches,
+    so the number of times anything has been said in a channel can be read without scanning the logged messages.
+    """
+
+    def __init__(self, con_pool: Pool, flush_size: int = 5_000) -> None:
+        self.con_pool = con_pool
+        self._flush_size = flush_size
+        self._pending: dict[tuple[int, str], tuple[int, datetime, datetime]] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    async def add(self, channel_id: int, message: str) -> None:
+        sent_at = datetime.now(UTC)
+        # Split the same way as the backfill does in the database
+        for token in message.replace("\U000E0000", "").split():
+            if len(token) > tokens.MAX_TOKEN_LENGTH:
+                continue
+            key = (channel_id, token)
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = (1, sent_at, sent_at)
+            else:
+                self._pending[key] = (pending[0] + 1, pending[1], sent_at)
+        # The flush runs in the background so handling the message doesn't wait on the database
+        if len(self._pending) >= self._flush_size and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_in_background())
+
+    async def flush(self) -> None:
+        if len(self._pending) == 0:
+            return
+        pending = self._pending
+        self._pending = {}
+        try:
+            await tokens.add_token_counts(self.con_pool, pending)
+        except Exception:
+            # The counts are kept for the next flush instead of being lost
+            for key, (count, first_seen, last_seen) in pending.items():
+                current = self._pending.get(key)
+                if current is not None:
+                    count, last_seen = count + current[0], current[2]
+                self._pending[key] = (count, first_seen, last_seen)
+            raise
+
+    async def _flush_in_background(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Failed to add the token counts to the database: %s", e)
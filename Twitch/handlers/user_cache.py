@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta, UTC
+from typing import Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Twitch.twitchbot import Bot
+
+
+class CachedUser:
+    def __init__(self, user_id: int, name: str, ttl: timedelta) -> None:
+        self.user_id = user_id
+        self.name = name
+        self.expires_at = datetime.now(UTC) + ttl
+
+    def expired(self) -> bool:
+        return self.expires_at < datetime.now(UTC)
+
+
+class UserCache:
+    """
+    Maps twitch user ids to login names and back to avoid a Helix request every time only a name or an id is needed.
+    Entries expire after the ttl and the least recently used ones are evicted when the cache is full.
+    """
+
+    def __init__(self, bot: "Bot", ttl: timedelta = timedelta(hours=6), max_size: int = 50_000) -> None:
+        self.bot = bot
+        self._ttl = ttl
+        self._max_size = max_size
+        self._by_id: OrderedDict[int, CachedUser] = OrderedDict()
+        self._by_name: dict[str, CachedUser] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def add(self, user_id: int, name: str) -> None:
+        """Adds or refreshes a user; a changed name replaces the old one"""
+        name = name.lower()
+        self.remove(user_id)
+        previous_owner = self._by_name.get(name)
+        if previous_owner is not None:
+            # Someone else had this name before, so it can't point to them anymore
+            self.remove(previous_owner.user_id)
+
+        user = CachedUser(user_id, name, self._ttl)
+        self._by_id[user_id] = user
+        self._by_name[name] = user
+
+        while len(self._by_id) > self._max_size:
+            _, evicted = self._by_id.popitem(last=False)
+            del self._by_name[evicted.name]
+
+    def remove(self, user_id: int) -> None:
+        user = self._by_id.pop(user_id, None)
+        if user is not None and self._by_name.get(user.name) is user:
+            del self._by_name[user.name]
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._by_name.clear()
+
+    def name(self, user_id: int) -> str | None:
+        """Returns the cached login name of the user without making any requests"""
+        user = self._by_id.get(user_id)
+        if user is None:
+            return None
+        if user.expired():
+            self.remove(user_id)
+            return None
+        self._by_id.move_to_end(user_id)
+        return user.name
+
+    def user_id(self, name: str) -> int | None:
+        """Returns the cached id of the user without making any requests"""
+        user = self._by_name.get(name.lower())
+        if user is None:
+            return None
+        if user.expired():
+            self.remove(user.user_id)
+            return None
+        self._by_id.move_to_end(user.user_id)
+        return user.user_id
+
+    async def usernames(self, user_ids: Iterable[int]) -> dict[int, str]:
+        """Maps user ids to login names, requesting the missing ones from Helix at most 100 ids at a time"""
+        usernames: dict[int, str] = {}
+        missing: list[int] = []
+        for user_id in set(user_ids):
+            name = self.name(user_id)
+            if name is None:
+                missing.append(user_id)
+            else:
+                usernames[user_id] = name
+
+        for i in range(0, len(missing), 100):
+            users = await self.bot.fetch_users(ids=missing[i : i + 100])
+            for user in users:
+                self.add(user.id, user.name)
+                usernames[user.id] = user.name.lower()
+        return usernames
+
+    async def user_ids(self, names: Iterable[str]) -> dict[str, int]:
+        """Maps login names to user ids, requesting the missing ones from Helix at most 100 names at a time"""
+        user_ids: dict[str, int] = {}
+        missing: list[str] = []
+        for name in set(name.lower() for name in names):
+            user_id = self.user_id(name)
+            if user_id is None:
+                missing.append(name)
+            else:
+                user_ids[name] = user_id
+
+        for i in range(0, len(missing), 100):
+            users = await self.bot.fetch_users(names=missing[i : i + 100])
+            for user in users:
+                self.add(user.id, user.name)
+                user_ids[user.name.lower()] = user.id
+        return user_ids
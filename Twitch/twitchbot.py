@@ -11,7 +11,12 @@ from twitchio.ext import commands
 
 from handlers.custom_command import handle_custom_command, custom_pattern_message
 from handlers.emote_streak import EmoteStreaks
+from handlers.emote_usage import EmoteUsage
+from handlers.last_seen import LastSeenTable
+from handlers.message_archive import MessageArchive
 from handlers.message_queue import MessageQueues
+from handlers.token_counts import TokenCounts
+from handlers.user_cache import UserCache
 from logger import logger
 from shared import database
 from shared.apis.exceptions import SendableAPIRequestError
@@ -34,6 +39,17 @@ class Bot(commands.Bot):
         self.loop.run_until_complete(self.__ainit__())
         self.msg_q = MessageQueues(self, self.initial_channels)
         self.emote_streaks = EmoteStreaks(self.con_pool)
+        self.emote_usage = EmoteUsage(self.con_pool)
+        self.token_counts = TokenCounts(self.con_pool)
+        self.last_seen = LastSeenTable(self.con_pool)
+        self.user_cache = UserCache(self)
+        self.message_archive = None
+        if "MESSAGE_ARCHIVE_DIR" in os.environ and os.environ["MESSAGE_ARCHIVE_DIR"] != "":
+            self.message_archive = MessageArchive(
+                self.con_pool,
+                os.environ["MESSAGE_ARCHIVE_DIR"],
+                int(os.environ.get("MESSAGE_ARCHIVE_AFTER_MONTHS") or 12),
+            )
         self.check(self.global_check)  # type: ignore
 
         for filename in os.listdir(f"{os.path.realpath(os.path.dirname(__file__))}/cogs"):
@@ -45,7 +61,7 @@ class Bot(commands.Bot):
         self.initial_channels = await channels.initial_channels(self.con_pool)
         if len(self.initial_channels) == 0:
             self.initial_channels.append(self.nick)  # type: ignore
-            await channels.join_channel(self.con_pool, str(self.user_id), self.nick)  # type: ignore
+            await channels.join_channel(self.con_pool, self.user_id, self.nick)  # type: ignore
 
     async def prefixes(self, channel: str) -> tuple[str, ...]:
         config = await channels.channel_config(self.con_pool, channel)
@@ -62,22 +78,43 @@ class Bot(commands.Bot):
         message.content = re.sub(r"\s+", " ", message.content.strip()).replace("ACTION ", "")
 
         channel_config = await channels.channel_config(self.con_pool, message.channel.name)
+        # Same check as in handle_commands, where a whitespace is also allowed after the prefix
+        prefixes = channel_config.prefixes if len(channel_config.prefixes) > 0 else (os.environ["GLOBAL_PREFIX"],)
+        is_command = message.content.startswith(prefixes)
 
         if message.echo:
             assert isinstance(self.nick, str)
+            # Also covers messages that were sent without the queues
+            self.msg_q.record_sent(message.channel.name, message.content)
             await messages.log_message(
-                self.con_pool, channel_config.channel_id, self.nick, message.content, channel_config.currently_online
+                self.con_pool,
+                channel_config.channel_id,
+                self.user_id,  # type: ignore
+                self.nick,
+                message.content,
+                channel_config.currently_online,
+                is_command,
+                channel_config.search_config,
             )
             return
 
         assert isinstance(message.author.name, str)
-        if channel_config.logging:
+        # Messages without the tags have no sender id to store them under
+        if channel_config.logging and isinstance(message.author, twitchio.Chatter) and message.author.id is not None:
             await messages.log_message(
                 self.con_pool,
                 channel_config.channel_id,
+                int(message.author.id),
                 message.author.name,
                 message.content,
                 channel_config.currently_online,
+                is_command,
+                channel_config.search_config,
+            )
+            await self.emote_usage.add(channel_config.channel_id, message.content)
+            await self.token_counts.add(channel_config.channel_id, message.content)
+            self.last_seen.add(
+                int(message.author.id), channel_config.channel_id, message.channel.name, message.content
             )
 
         # Log the messge with the null character to make the detecting the same message easier
@@ -90,15 +127,19 @@ class Bot(commands.Bot):
 
         if not (isinstance(message.author, twitchio.Chatter) and message.author.id is not None):
             return
+        author_id = int(message.author.id)
+
+        # Every message carries the id and the current name of the sender, so keep the cache fresh for free
+        self.user_cache.add(author_id, message.author.name)
 
-        if message.author.id in channel_config.banned_users:
+        if author_id in channel_config.banned_users:
             return
 
-        user_config = await users.user_config(self.con_pool, message.author.id)
+        user_config = await users.user_config(self.con_pool, author_id)
         if user_config.is_banned():
             return
 
-        afk_status = await reminders.afk_status(self.con_pool, channel_config.channel_id, message.author.id)
+        afk_status = await reminders.afk_status(self.con_pool, channel_config.channel_id, author_id)
 
         await self.handle_commands(message)
 
@@ -119,20 +160,24 @@ class Bot(commands.Bot):
                 streak_message, targets = streak_result
                 await self.msg_q.send_message(message.channel.name, streak_message, targets)
 
-        rems = await reminders.sendable_not_timed_reminders(self.con_pool, message.author.id)
-        for rem in rems:
-            if not channel_config.outside_reminds and rem.channel_id != channel_config.channel_id:
-                continue
-            rem_users = await self.fetch_users(ids=[int(rem.sender_id), int(rem.target_id)])
-            sender = [user for user in rem_users if user.id == int(rem.sender_id)]
-            if len(sender) == 1:
-                sender_name = sender[0].name
-            else:
-                sender_name = "<unknown user>"
-            target = [user for user in rem_users if user.id == int(rem.target_id)][0]
-            msg, targets = await rem.formatted_message(sender_name, target.name)
-            await self.msg_q.send_message(message.channel.name, msg, targets)
-            await reminders.set_reminder_as_sent(self.con_pool, rem.id)
+        rems = await reminders.sendable_not_timed_reminders(self.con_pool, author_id)
+        rems = [rem for rem in rems if channel_config.outside_reminds or rem.channel_id == channel_config.channel_id]
+        if len(rems) == 0:
+            return
+
+        # The target of these reminders is the author, so only the senders need to be resolved
+        sender_names = await self.user_cache.usernames(rem.sender_id for rem in rems)
+        sent_ids = []
+        try:
+            for rem in rems:
+                sender_name = sender_names.get(rem.sender_id, "<unknown user>")
+                msg, targets = await rem.formatted_message(sender_name, message.author.name)
+                await self.msg_q.send_message(message.channel.name, msg, targets)
+                sent_ids.append(rem.id)
+        finally:
+            # The reminders sent before a failure are marked as well, so they aren't sent again with the next message
+            if len(sent_ids) > 0:
+                await reminders.set_reminders_as_sent(self.con_pool, sent_ids)
 
     async def handle_commands(self, message: twitchio.Message) -> None:
         assert isinstance(message.content, str) and message.content != ""
@@ -184,7 +229,7 @@ class Bot(commands.Bot):
         assert isinstance(ctx.author, twitchio.Chatter)
         assert ctx.author.id is not None
 
-        user_config = await users.user_config(self.con_pool, ctx.author.id)
+        user_config = await users.user_config(self.con_pool, int(ctx.author.id))
         if ctx.command is not None and ctx.command.name in user_config.optouts:
             raise ValidationError("You cannot use a command you have opted out of")
 
@@ -203,8 +248,8 @@ class Bot(commands.Bot):
         ]
 
         for target in target_users:
-            user_config = await users.user_config(self.con_pool, str(target.id))
-            if user_config.is_banned() or str(target.id) in channel_config.banned_users:
+            user_config = await users.user_config(self.con_pool, int(target.id))
+            if user_config.is_banned() or int(target.id) in channel_config.banned_users:
                 return False
             if ctx.command is not None and ctx.command.name in user_config.optouts:
                 raise ValidationError("Target has opted out of the command")
@@ -214,7 +259,7 @@ class Bot(commands.Bot):
     async def global_before_invoke(self, ctx: commands.Context):
         ctx.exec_time = datetime.now(UTC)  # type: ignore
         if isinstance(ctx.author, twitchio.Chatter) and ctx.author.id is not None:
-            await users.create_user_config(self.con_pool, ctx.author.id)
+            await users.create_user_config(self.con_pool, int(ctx.author.id))
 
     async def global_after_invoke(self, ctx: commands.Context) -> None:
         assert isinstance(ctx.author.name, str)
@@ -0,0 +1,26 @@
+-- migrate:up
+CREATE INDEX reminders_timed_pending_idx
+ON twitch.reminders (scheduled_at)
+WHERE scheduled_at IS NOT NULL AND processed_at IS NULL;
+
+CREATE INDEX reminders_not_timed_pending_idx
+ON twitch.reminders (target_id, created_at)
+WHERE scheduled_at IS NULL AND processed_at IS NULL;
+
+CREATE INDEX afks_pending_idx
+ON twitch.afks (channel_id, target_id)
+WHERE processed_at IS NULL;
+
+CREATE INDEX afks_processed_idx
+ON twitch.afks (channel_id, target_id, processed_at DESC)
+WHERE processed_at IS NOT NULL;
+
+
+-- migrate:down
+DROP INDEX twitch.reminders_timed_pending_idx;
+
+DROP INDEX twitch.reminders_not_timed_pending_idx;
+
+DROP INDEX twitch.afks_pending_idx;
+
+DROP INDEX twitch.afks_processed_idx;
@@ -0,0 +1,203 @@
+-- migrate:up
+ALTER TABLE twitch.live_notifications
+DROP CONSTRAINT live_notifications_channel_id_fkey;
+
+ALTER TABLE twitch.yt_upload_notifications
+DROP CONSTRAINT yt_upload_notifications_channel_id_fkey;
+
+ALTER TABLE twitch.fights
+DROP CONSTRAINT fights_check;
+
+
+ALTER TABLE twitch.afks
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint,
+ALTER COLUMN target_id TYPE bigint USING target_id::bigint;
+
+ALTER TABLE twitch.channel_config
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint,
+ALTER COLUMN banned_users DROP DEFAULT,
+ALTER COLUMN banned_users TYPE bigint[] USING banned_users::bigint[],
+ALTER COLUMN banned_users SET DEFAULT ARRAY[]::bigint[];
+
+ALTER TABLE twitch.command_usage_log
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint,
+ALTER COLUMN user_id TYPE bigint USING user_id::bigint;
+
+ALTER TABLE twitch.counters
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint;
+
+ALTER TABLE twitch.custom_commands
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint;
+
+ALTER TABLE twitch.custom_patterns
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint;
+
+ALTER TABLE twitch.fights
+ALTER COLUMN user_id_1 TYPE bigint USING user_id_1::bigint,
+ALTER COLUMN user_id_2 TYPE bigint USING user_id_2::bigint;
+
+ALTER TABLE twitch.joined_channels
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint;
+
+ALTER TABLE twitch.last_iqs
+ALTER COLUMN user_id TYPE bigint USING user_id::bigint;
+
+ALTER TABLE twitch.live_notifications
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint,
+ALTER COLUMN target_id TYPE bigint USING target_id::bigint,
+ALTER COLUMN pings DROP DEFAULT,
+ALTER COLUMN pings TYPE bigint[] USING pings::bigint[],
+ALTER COLUMN pings SET DEFAULT ARRAY[]::bigint[];
+
+ALTER TABLE twitch.locations
+ALTER COLUMN user_id TYPE bigint USING user_id::bigint;
+
+ALTER TABLE twitch.messages
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint;
+
+ALTER TABLE twitch.old_fish
+ALTER COLUMN user_id TYPE bigint USING user_id::bigint;
+
+ALTER TABLE twitch.reminders
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint,
+ALTER COLUMN sender_id TYPE bigint USING sender_id::bigint,
+ALTER COLUMN target_id TYPE bigint USING target_id::bigint;
+
+ALTER TABLE twitch.rps
+ALTER COLUMN user_id TYPE bigint USING user_id::bigint;
+
+ALTER TABLE twitch.timers
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint;
+
+ALTER TABLE twitch.user_config
+ALTER COLUMN user_id TYPE bigint USING user_id::bigint;
+
+ALTER TABLE twitch.watchtime
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint;
+
+ALTER TABLE twitch.yt_upload_notifications
+ALTER COLUMN channel_id TYPE bigint USING channel_id::bigint,
+ALTER COLUMN pings DROP DEFAULT,
+ALTER COLUMN pings TYPE bigint[] USING pings::bigint[],
+ALTER COLUMN pings SET DEFAULT ARRAY[]::bigint[];
+
+
+-- Text and numeric ordering differ, so some fights have their users the wrong way around now
+UPDATE twitch.fights
+SET
+    user_id_1 = user_id_2,
+    user_id_2 = user_id_1,
+    user_1_wins = user_2_wins,
+    user_2_wins = user_1_wins
+WHERE user_id_1 > user_id_2;
+
+ALTER TABLE twitch.fights
+ADD CONSTRAINT fights_check CHECK ((user_id_1 < user_id_2));
+
+ALTER TABLE twitch.live_notifications
+ADD CONSTRAINT live_notifications_channel_id_fkey FOREIGN KEY (channel_id) REFERENCES twitch.joined_channels(channel_id) ON DELETE CASCADE;
+
+ALTER TABLE twitch.yt_upload_notifications
+ADD CONSTRAINT yt_upload_notifications_channel_id_fkey FOREIGN KEY (channel_id) REFERENCES twitch.joined_channels(channel_id) ON DELETE CASCADE;
+
+
+-- migrate:down
+ALTER TABLE twitch.live_notifications
+DROP CONSTRAINT live_notifications_channel_id_fkey;
+
+ALTER TABLE twitch.yt_upload_notifications
+DROP CONSTRAINT yt_upload_notifications_channel_id_fkey;
+
+ALTER TABLE twitch.fights
+DROP CONSTRAINT fights_check;
+
+
+ALTER TABLE twitch.afks
+ALTER COLUMN channel_id TYPE text USING channel_id::text,
+ALTER COLUMN target_id TYPE text USING target_id::text;
+
+ALTER TABLE twitch.channel_config
+ALTER COLUMN channel_id TYPE text USING channel_id::text,
+ALTER COLUMN banned_users DROP DEFAULT,
+ALTER COLUMN banned_users TYPE text[] USING banned_users::text[],
+ALTER COLUMN banned_users SET DEFAULT ARRAY[]::text[];
+
+ALTER TABLE twitch.command_usage_log
+ALTER COLUMN channel_id TYPE text USING channel_id::text,
+ALTER COLUMN user_id TYPE text USING user_id::text;
+
+ALTER TABLE twitch.counters
+ALTER COLUMN channel_id TYPE text USING channel_id::text;
+
+ALTER TABLE twitch.custom_commands
+ALTER COLUMN channel_id TYPE text USING channel_id::text;
+
+ALTER TABLE twitch.custom_patterns
+ALTER COLUMN channel_id TYPE text USING channel_id::text;
+
+ALTER TABLE twitch.fights
+ALTER COLUMN user_id_1 TYPE text USING user_id_1::text,
+ALTER COLUMN user_id_2 TYPE text USING user_id_2::text;
+
+ALTER TABLE twitch.joined_channels
+ALTER COLUMN channel_id TYPE text USING channel_id::text;
+
+ALTER TABLE twitch.last_iqs
+ALTER COLUMN user_id TYPE text USING user_id::text;
+
+ALTER TABLE twitch.live_notifications
+ALTER COLUMN channel_id TYPE text USING channel_id::text,
+ALTER COLUMN target_id TYPE text USING target_id::text,
+ALTER COLUMN pings DROP DEFAULT,
+ALTER COLUMN pings TYPE text[] USING pings::text[],
+ALTER COLUMN pings SET DEFAULT ARRAY[]::text[];
+
+ALTER TABLE twitch.locations
+ALTER COLUMN user_id TYPE text USING user_id::text;
+
+ALTER TABLE twitch.messages
+ALTER COLUMN channel_id TYPE text USING channel_id::text;
+
+ALTER TABLE twitch.old_fish
+ALTER COLUMN user_id TYPE text USING user_id::text;
+
+ALTER TABLE twitch.reminders
+ALTER COLUMN channel_id TYPE text USING channel_id::text,
+ALTER COLUMN sender_id TYPE text USING sender_id::text,
+ALTER COLUMN target_id TYPE text USING target_id::text;
+
+ALTER TABLE twitch.rps
+ALTER COLUMN user_id TYPE text USING user_id::text;
+
+ALTER TABLE twitch.timers
+ALTER COLUMN channel_id TYPE text USING channel_id::text;
+
+ALTER TABLE twitch.user_config
+ALTER COLUMN user_id TYPE text USING user_id::text;
+
+ALTER TABLE twitch.watchtime
+ALTER COLUMN channel_id TYPE text USING channel_id::text;
+
+ALTER TABLE twitch.yt_upload_notifications
+ALTER COLUMN channel_id TYPE text USING channel_id::text,
+ALTER COLUMN pings DROP DEFAULT,
+ALTER COLUMN pings TYPE text[] USING pings::text[],
+ALTER COLUMN pings SET DEFAULT ARRAY[]::text[];
+
+
+UPDATE twitch.fights
+SET
+    user_id_1 = user_id_2,
+    user_id_2 = user_id_1,
+    user_1_wins = user_2_wins,
+    user_2_wins = user_1_wins
+WHERE user_id_1 > user_id_2;
+
+ALTER TABLE twitch.fights
+ADD CONSTRAINT fights_check CHECK ((user_id_1 < user_id_2));
+
+ALTER TABLE twitch.live_notifications
+ADD CONSTRAINT live_notifications_channel_id_fkey FOREIGN KEY (channel_id) REFERENCES twitch.joined_channels(channel_id) ON DELETE CASCADE;
+
+ALTER TABLE twitch.yt_upload_notifications
+ADD CONSTRAINT yt_upload_notifications_channel_id_fkey FOREIGN KEY (channel_id) REFERENCES twitch.joined_channels(channel_id) ON DELETE CASCADE;
@@ -0,0 +1,7 @@
+-- migrate:up transaction:false
+CREATE INDEX CONCURRENTLY messages_channel_id_sender_sent_at_idx
+ON twitch.messages (channel_id, sender, sent_at DESC);
+
+
+-- migrate:down transaction:false
+DROP INDEX CONCURRENTLY twitch.messages_channel_id_sender_sent_at_idx;
@@ -0,0 +1,99 @@
+-- migrate:up
+CREATE FUNCTION twitch.create_messages_partitions(from_time timestamp with time zone, to_time timestamp with time zone) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    partition_start timestamp with time zone := date_trunc('month', from_time, 'UTC');
+    partition_end timestamp with time zone;
+BEGIN
+    WHILE partition_start <= to_time LOOP
+        -- Adding a month to a timestamp depends on the session time zone, so go past the end and truncate instead
+        partition_end := date_trunc('month', partition_start + INTERVAL '32 days', 'UTC');
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS twitch.%I PARTITION OF twitch.messages FOR VALUES FROM (%L) TO (%L)',
+            'messages_' || to_char(partition_start AT TIME ZONE 'UTC', 'YYYY_MM'),
+            partition_start,
+            partition_end
+        );
+        partition_start := partition_end;
+    END LOOP;
+END;
+$$;
+
+
+ALTER TABLE twitch.messages RENAME TO messages_unpartitioned;
+
+ALTER TABLE twitch.messages_unpartitioned RENAME CONSTRAINT messages_pkey TO messages_unpartitioned_pkey;
+
+ALTER INDEX twitch.messages_search_idx RENAME TO messages_unpartitioned_search_idx;
+
+ALTER INDEX twitch.messages_channel_id_sender_sent_at_idx RENAME TO messages_unpartitioned_channel_id_sender_sent_at_idx;
+
+-- The primary key of a partitioned table has to include the partition key
+CREATE TABLE twitch.messages (
+    id bigint NOT NULL,
+    sender text NOT NULL,
+    message text NOT NULL,
+    sent_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    channel_id bigint NOT NULL,
+    online boolean,
+    PRIMARY KEY (id, sent_at)
+)
+PARTITION BY RANGE (sent_at);
+
+-- Catches messages that don't have a partition, e.g. if creating the upcoming partitions has failed
+CREATE TABLE twitch.messages_default PARTITION OF twitch.messages DEFAULT;
+
+ALTER SEQUENCE twitch.messages_id_seq AS bigint;
+
+ALTER SEQUENCE twitch.messages_id_seq OWNED BY twitch.messages.id;
+
+ALTER TABLE twitch.messages ALTER COLUMN id SET DEFAULT nextval('twitch.messages_id_seq'::regclass);
+
+SELECT twitch.create_messages_partitions(
+    COALESCE((SELECT MIN(sent_at) FROM twitch.messages_unpartitioned), CURRENT_TIMESTAMP),
+    CURRENT_TIMESTAMP + INTERVAL '3 months'
+);
+
+INSERT INTO twitch.messages (id, sender, message, sent_at, channel_id, online)
+SELECT id, sender, message, sent_at, channel_id, online
+FROM twitch.messages_unpartitioned;
+
+DROP TABLE twitch.messages_unpartitioned;
+
+CREATE INDEX messages_search_idx ON twitch.messages USING gin (to_tsvector('english'::regconfig, message));
+
+CREATE INDEX messages_channel_id_sender_sent_at_idx ON twitch.messages (channel_id, sender, sent_at DESC);
+
+
+-- migrate:down
+ALTER TABLE twitch.messages RENAME TO messages_partitioned;
+
+CREATE TABLE twitch.messages (
+    id integer NOT NULL,
+    sender text NOT NULL,
+    message text NOT NULL,
+    sent_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    channel_id bigint NOT NULL,
+    online boolean
+);
+
+ALTER SEQUENCE twitch.messages_id_seq OWNED BY twitch.messages.id;
+
+ALTER SEQUENCE twitch.messages_id_seq AS integer;
+
+ALTER TABLE twitch.messages ALTER COLUMN id SET DEFAULT nextval('twitch.messages_id_seq'::regclass);
+
+INSERT INTO twitch.messages (id, sender, message, sent_at, channel_id, online)
+SELECT id, sender, message, sent_at, channel_id, online
+FROM twitch.messages_partitioned;
+
+DROP TABLE twitch.messages_partitioned;
+
+DROP FUNCTION twitch.create_messages_partitions(timestamp with time zone, timestamp with time zone);
+
+ALTER TABLE twitch.messages ADD CONSTRAINT messages_pkey PRIMARY KEY (id);
+
+CREATE INDEX messages_search_idx ON twitch.messages USING gin (to_tsvector('english'::regconfig, message));
+
+CREATE INDEX messages_channel_id_sender_sent_at_idx ON twitch.messages (channel_id, sender, sent_at DESC);
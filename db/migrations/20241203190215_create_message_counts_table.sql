@@ -0,0 +1,66 @@
+-- migrate:up
+CREATE TABLE twitch.message_counts (
+    channel_id bigint NOT NULL,
+    sender text NOT NULL,
+    count bigint NOT NULL,
+    PRIMARY KEY (channel_id, sender)
+);
+
+CREATE FUNCTION twitch.count_inserted_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    INSERT INTO twitch.message_counts (channel_id, sender, count)
+    SELECT channel_id, sender, COUNT(*)
+    FROM new_messages
+    GROUP BY channel_id, sender
+    ON CONFLICT (channel_id, sender) DO UPDATE
+    SET count = message_counts.count + EXCLUDED.count;
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION twitch.count_deleted_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE twitch.message_counts
+    SET count = message_counts.count - deleted.count
+    FROM (
+        SELECT channel_id, sender, COUNT(*) AS count
+        FROM old_messages
+        GROUP BY channel_id, sender
+    ) AS deleted
+    WHERE
+        message_counts.channel_id = deleted.channel_id AND
+        message_counts.sender = deleted.sender;
+
+    DELETE FROM twitch.message_counts
+    WHERE count <= 0;
+
+    RETURN NULL;
+END;
+$$;
+
+-- Statement level triggers see every row of a bulk insert at once, so a single upsert is done per sender
+CREATE TRIGGER count_inserted_messages AFTER INSERT ON twitch.messages REFERENCING NEW TABLE AS new_messages FOR EACH STATEMENT EXECUTE FUNCTION twitch.count_inserted_messages();
+
+CREATE TRIGGER count_deleted_messages AFTER DELETE ON twitch.messages REFERENCING OLD TABLE AS old_messages FOR EACH STATEMENT EXECUTE FUNCTION twitch.count_deleted_messages();
+
+INSERT INTO twitch.message_counts (channel_id, sender, count)
+SELECT channel_id, sender, COUNT(*)
+FROM twitch.messages
+GROUP BY channel_id, sender;
+
+
+-- migrate:down
+DROP TRIGGER count_inserted_messages ON twitch.messages;
+
+DROP TRIGGER count_deleted_messages ON twitch.messages;
+
+DROP FUNCTION twitch.count_inserted_messages();
+
+DROP FUNCTION twitch.count_deleted_messages();
+
+DROP TABLE twitch.message_counts;
@@ -0,0 +1,12 @@
+-- migrate:up
+ALTER TABLE twitch.messages
+ADD COLUMN is_command boolean DEFAULT FALSE NOT NULL;
+
+CREATE INDEX messages_commands_idx ON twitch.messages (channel_id, sender) WHERE is_command;
+
+
+-- migrate:down
+DROP INDEX twitch.messages_commands_idx;
+
+ALTER TABLE twitch.messages
+DROP COLUMN is_command;
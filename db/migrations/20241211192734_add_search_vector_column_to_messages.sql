@@ -0,0 +1,25 @@
+-- migrate:up
+ALTER TABLE twitch.channel_config
+ADD COLUMN search_config regconfig DEFAULT 'english'::regconfig NOT NULL;
+
+ALTER TABLE twitch.messages
+ADD COLUMN search_vector tsvector;
+
+UPDATE twitch.messages
+SET search_vector = to_tsvector('english'::regconfig, message);
+
+DROP INDEX twitch.messages_search_idx;
+
+CREATE INDEX messages_search_idx ON twitch.messages USING gin (search_vector);
+
+
+-- migrate:down
+DROP INDEX twitch.messages_search_idx;
+
+CREATE INDEX messages_search_idx ON twitch.messages USING gin (to_tsvector('english'::regconfig, message));
+
+ALTER TABLE twitch.messages
+DROP COLUMN search_vector;
+
+ALTER TABLE twitch.channel_config
+DROP COLUMN search_config;
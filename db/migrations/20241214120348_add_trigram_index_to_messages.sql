@@ -0,0 +1,10 @@
+-- migrate:up
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+CREATE INDEX messages_message_trgm_idx ON twitch.messages USING gin (message public.gin_trgm_ops);
+
+
+-- migrate:down
+DROP INDEX twitch.messages_message_trgm_idx;
+
+DROP EXTENSION pg_trgm;
@@ -0,0 +1,6 @@
+-- migrate:up
+CREATE INDEX messages_sent_at_idx ON twitch.messages USING brin (sent_at);
+
+
+-- migrate:down
+DROP INDEX twitch.messages_sent_at_idx;
@@ -0,0 +1,265 @@
+-- migrate:up
+CREATE TABLE twitch.chatters (
+    id serial PRIMARY KEY,
+    user_id bigint UNIQUE,
+    login text NOT NULL,
+    previous_logins text[] DEFAULT ARRAY[]::text[] NOT NULL
+);
+
+CREATE INDEX chatters_login_idx ON twitch.chatters (login);
+
+CREATE FUNCTION twitch.chatter_key(chatter_user_id bigint, chatter_login text) RETURNS integer
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    key integer;
+    current_login text;
+BEGIN
+    SELECT id, login INTO key, current_login
+    FROM twitch.chatters
+    WHERE user_id = chatter_user_id;
+
+    IF FOUND THEN
+        -- A different login for a known id means the user has renamed themselves
+        IF current_login <> chatter_login THEN
+            UPDATE twitch.chatters
+            SET login = chatter_login, previous_logins = array_append(previous_logins, current_login)
+            WHERE id = key;
+        END IF;
+        RETURN key;
+    END IF;
+
+    -- Chatters created from the old sender names only have a login until they are seen again
+    UPDATE twitch.chatters
+    SET user_id = chatter_user_id
+    WHERE id = (
+        SELECT id
+        FROM twitch.chatters
+        WHERE login = chatter_login AND user_id IS NULL
+        ORDER BY id
+        LIMIT 1
+    )
+    RETURNING id INTO key;
+
+    IF FOUND THEN
+        RETURN key;
+    END IF;
+
+    INSERT INTO twitch.chatters (user_id, login)
+    VALUES (chatter_user_id, chatter_login)
+    ON CONFLICT (user_id) DO UPDATE
+    SET login = EXCLUDED.login
+    RETURNING id INTO key;
+
+    RETURN key;
+END;
+$$;
+
+-- Every sender is already in message_counts, so the messages don't have to be scanned for them
+INSERT INTO twitch.chatters (login)
+SELECT sender FROM twitch.message_counts
+UNION
+SELECT username FROM twitch.watchtime;
+
+-- The ids of the joined channels are known already
+UPDATE twitch.chatters
+SET user_id = joined_channels.channel_id
+FROM twitch.joined_channels
+WHERE chatters.login = joined_channels.username;
+
+
+ALTER TABLE twitch.messages ADD COLUMN chatter_id integer;
+
+ALTER TABLE twitch.messages ALTER COLUMN sender DROP NOT NULL;
+
+-- The sender is cleared in the same update so that the new row versions don't carry the text anymore
+UPDATE twitch.messages
+SET chatter_id = chatters.id, sender = NULL
+FROM twitch.chatters
+WHERE chatters.login = messages.sender;
+
+ALTER TABLE twitch.messages ALTER COLUMN chatter_id SET NOT NULL;
+
+DROP INDEX twitch.messages_channel_id_sender_sent_at_idx;
+
+DROP INDEX twitch.messages_commands_idx;
+
+ALTER TABLE twitch.messages DROP COLUMN sender;
+
+CREATE INDEX messages_channel_id_chatter_id_sent_at_idx ON twitch.messages (channel_id, chatter_id, sent_at DESC);
+
+CREATE INDEX messages_commands_idx ON twitch.messages (channel_id, chatter_id) WHERE is_command;
+
+
+ALTER TABLE twitch.message_counts ADD COLUMN chatter_id integer;
+
+UPDATE twitch.message_counts
+SET chatter_id = chatters.id
+FROM twitch.chatters
+WHERE chatters.login = message_counts.sender;
+
+ALTER TABLE twitch.message_counts DROP CONSTRAINT message_counts_pkey;
+
+ALTER TABLE twitch.message_counts DROP COLUMN sender;
+
+ALTER TABLE twitch.message_counts ALTER COLUMN chatter_id SET NOT NULL;
+
+ALTER TABLE twitch.message_counts ADD CONSTRAINT message_counts_pkey PRIMARY KEY (channel_id, chatter_id);
+
+CREATE OR REPLACE FUNCTION twitch.count_inserted_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    INSERT INTO twitch.message_counts (channel_id, chatter_id, count)
+    SELECT channel_id, chatter_id, COUNT(*)
+    FROM new_messages
+    GROUP BY channel_id, chatter_id
+    ON CONFLICT (channel_id, chatter_id) DO UPDATE
+    SET count = message_counts.count + EXCLUDED.count;
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION twitch.count_deleted_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE twitch.message_counts
+    SET count = message_counts.count - deleted.count
+    FROM (
+        SELECT channel_id, chatter_id, COUNT(*) AS count
+        FROM old_messages
+        GROUP BY channel_id, chatter_id
+    ) AS deleted
+    WHERE
+        message_counts.channel_id = deleted.channel_id AND
+        message_counts.chatter_id = deleted.chatter_id;
+
+    DELETE FROM twitch.message_counts
+    WHERE count <= 0;
+
+    RETURN NULL;
+END;
+$$;
+
+
+ALTER TABLE twitch.watchtime ADD COLUMN chatter_id integer;
+
+UPDATE twitch.watchtime
+SET chatter_id = chatters.id
+FROM twitch.chatters
+WHERE chatters.login = watchtime.username;
+
+ALTER TABLE twitch.watchtime DROP CONSTRAINT watchtime_pkey;
+
+ALTER TABLE twitch.watchtime DROP COLUMN username;
+
+ALTER TABLE twitch.watchtime ALTER COLUMN chatter_id SET NOT NULL;
+
+ALTER TABLE twitch.watchtime ADD CONSTRAINT watchtime_pkey PRIMARY KEY (channel_id, chatter_id);
+
+
+-- migrate:down
+ALTER TABLE twitch.watchtime ADD COLUMN username text;
+
+UPDATE twitch.watchtime
+SET username = chatters.login
+FROM twitch.chatters
+WHERE chatters.id = watchtime.chatter_id;
+
+ALTER TABLE twitch.watchtime DROP CONSTRAINT watchtime_pkey;
+
+-- Chatters that share a login are merged back together
+DELETE FROM twitch.watchtime
+WHERE ctid IN (
+    SELECT ctid
+    FROM (
+        SELECT ctid, ROW_NUMBER() OVER (PARTITION BY channel_id, username ORDER BY total_time DESC) AS row_number
+        FROM twitch.watchtime
+    ) AS ranked
+    WHERE row_number > 1
+);
+
+ALTER TABLE twitch.watchtime DROP COLUMN chatter_id;
+
+ALTER TABLE twitch.watchtime ALTER COLUMN username SET NOT NULL;
+
+ALTER TABLE twitch.watchtime ADD CONSTRAINT watchtime_pkey PRIMARY KEY (channel_id, username);
+
+
+ALTER TABLE twitch.messages ADD COLUMN sender text;
+
+UPDATE twitch.messages
+SET sender = chatters.login
+FROM twitch.chatters
+WHERE chatters.id = messages.chatter_id;
+
+ALTER TABLE twitch.messages ALTER COLUMN sender SET NOT NULL;
+
+DROP INDEX twitch.messages_channel_id_chatter_id_sent_at_idx;
+
+DROP INDEX twitch.messages_commands_idx;
+
+ALTER TABLE twitch.messages DROP COLUMN chatter_id;
+
+CREATE INDEX messages_channel_id_sender_sent_at_idx ON twitch.messages (channel_id, sender, sent_at DESC);
+
+CREATE INDEX messages_commands_idx ON twitch.messages (channel_id, sender) WHERE is_command;
+
+
+CREATE OR REPLACE FUNCTION twitch.count_inserted_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    INSERT INTO twitch.message_counts (channel_id, sender, count)
+    SELECT channel_id, sender, COUNT(*)
+    FROM new_messages
+    GROUP BY channel_id, sender
+    ON CONFLICT (channel_id, sender) DO UPDATE
+    SET count = message_counts.count + EXCLUDED.count;
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION twitch.count_deleted_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE twitch.message_counts
+    SET count = message_counts.count - deleted.count
+    FROM (
+        SELECT channel_id, sender, COUNT(*) AS count
+        FROM old_messages
+        GROUP BY channel_id, sender
+    ) AS deleted
+    WHERE
+        message_counts.channel_id = deleted.channel_id AND
+        message_counts.sender = deleted.sender;
+
+    DELETE FROM twitch.message_counts
+    WHERE count <= 0;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TABLE twitch.message_counts;
+
+CREATE TABLE twitch.message_counts (
+    channel_id bigint NOT NULL,
+    sender text NOT NULL,
+    count bigint NOT NULL,
+    PRIMARY KEY (channel_id, sender)
+);
+
+INSERT INTO twitch.message_counts (channel_id, sender, count)
+SELECT channel_id, sender, COUNT(*)
+FROM twitch.messages
+GROUP BY channel_id, sender;
+
+
+DROP FUNCTION twitch.chatter_key(bigint, text);
+
+DROP TABLE twitch.chatters;
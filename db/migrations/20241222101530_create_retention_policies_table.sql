@@ -0,0 +1,45 @@
+-- migrate:up
+CREATE TYPE twitch.retention_target AS ENUM (
+    'MESSAGES',
+    'COMMAND_USAGE',
+    'AFKS',
+    'REMINDERS'
+);
+
+CREATE TABLE twitch.retention_policies (
+    channel_id bigint NOT NULL,
+    target twitch.retention_target NOT NULL,
+    max_age interval,
+    max_rows integer,
+    PRIMARY KEY (channel_id, target),
+    CHECK (max_age IS NOT NULL OR max_rows IS NOT NULL)
+);
+
+CREATE TABLE twitch.retention_runs (
+    id serial PRIMARY KEY,
+    ran_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    channel_id bigint NOT NULL,
+    target twitch.retention_target NOT NULL,
+    purged_rows integer NOT NULL,
+    batches integer NOT NULL,
+    duration_ms double precision NOT NULL
+);
+
+CREATE INDEX retention_runs_channel_id_ran_at_idx ON twitch.retention_runs (channel_id, ran_at DESC);
+
+-- The purges look for the oldest rows of a channel, which these tables had no index for
+CREATE INDEX command_usage_log_channel_id_used_at_idx ON twitch.command_usage_log (channel_id, used_at);
+
+CREATE INDEX reminders_processed_idx ON twitch.reminders (channel_id, processed_at) WHERE processed_at IS NOT NULL;
+
+
+-- migrate:down
+DROP INDEX twitch.reminders_processed_idx;
+
+DROP INDEX twitch.command_usage_log_channel_id_used_at_idx;
+
+DROP TABLE twitch.retention_runs;
+
+DROP TABLE twitch.retention_policies;
+
+DROP TYPE twitch.retention_target;
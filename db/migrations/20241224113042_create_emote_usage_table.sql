@@ -0,0 +1,12 @@
+-- migrate:up
+CREATE TABLE twitch.emote_usage (
+    channel_id bigint NOT NULL,
+    emote text NOT NULL,
+    day date NOT NULL,
+    count integer NOT NULL,
+    PRIMARY KEY (channel_id, emote, day)
+);
+
+
+-- migrate:down
+DROP TABLE twitch.emote_usage;
@@ -0,0 +1,25 @@
+-- migrate:up
+CREATE TABLE twitch.token_counts (
+    channel_id bigint NOT NULL,
+    token text NOT NULL,
+    count bigint NOT NULL,
+    first_seen timestamp with time zone NOT NULL,
+    last_seen timestamp with time zone NOT NULL,
+    PRIMARY KEY (channel_id, token)
+);
+
+-- The bot counts the messages it logs from now on, so the backfill stops at the newest message that already exists
+CREATE TABLE twitch.token_count_backfill (
+    last_id bigint NOT NULL,
+    until_id bigint NOT NULL
+);
+
+INSERT INTO twitch.token_count_backfill (last_id, until_id)
+SELECT 0, COALESCE(MAX(id), 0)
+FROM twitch.messages;
+
+
+-- migrate:down
+DROP TABLE twitch.token_count_backfill;
+
+DROP TABLE twitch.token_counts;
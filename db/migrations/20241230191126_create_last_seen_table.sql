@@ -0,0 +1,19 @@
+-- migrate:up
+CREATE TABLE twitch.last_seen (
+    user_id bigint PRIMARY KEY,
+    channel_id bigint NOT NULL,
+    message text NOT NULL,
+    seen_at timestamp with time zone NOT NULL
+);
+
+-- From now on the bot keeps the table up to date, so the messages only have to be scanned once
+INSERT INTO twitch.last_seen (user_id, channel_id, message, seen_at)
+SELECT DISTINCT ON (chatters.user_id) chatters.user_id, messages.channel_id, messages.message, messages.sent_at
+FROM twitch.messages
+JOIN twitch.chatters ON chatters.id = messages.chatter_id
+WHERE chatters.user_id IS NOT NULL
+ORDER BY chatters.user_id, messages.sent_at DESC;
+
+
+-- migrate:down
+DROP TABLE twitch.last_seen;
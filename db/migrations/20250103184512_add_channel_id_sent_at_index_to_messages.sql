@@ -0,0 +1,7 @@
+-- migrate:up
+-- The retention cutoff of the max rows policies walks the newest messages of the channel
+CREATE INDEX messages_channel_id_sent_at_idx ON twitch.messages (channel_id, sent_at DESC);
+
+
+-- migrate:down
+DROP INDEX twitch.messages_channel_id_sent_at_idx;
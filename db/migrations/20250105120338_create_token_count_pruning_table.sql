@@ -0,0 +1,11 @@
+-- migrate:up
+-- Pruned tokens lose their count, so the highest pruned count of each channel is kept to tell how much may be missing
+CREATE TABLE twitch.token_count_pruning (
+    channel_id bigint PRIMARY KEY,
+    first_pruned_at timestamp with time zone NOT NULL,
+    max_count bigint NOT NULL
+);
+
+
+-- migrate:down
+DROP TABLE twitch.token_count_pruning;
@@ -0,0 +1,80 @@
+-- migrate:up
+-- Only the counts of the senders whose messages were deleted can have dropped to zero, so the rest isn't scanned
+CREATE OR REPLACE FUNCTION twitch.count_deleted_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE twitch.message_counts
+    SET count = message_counts.count - deleted.count
+    FROM (
+        SELECT channel_id, chatter_id, COUNT(*) AS count
+        FROM old_messages
+        GROUP BY channel_id, chatter_id
+    ) AS deleted
+    WHERE
+        message_counts.channel_id = deleted.channel_id AND
+        message_counts.chatter_id = deleted.chatter_id;
+
+    DELETE FROM twitch.message_counts
+    WHERE count <= 0 AND (channel_id, chatter_id) IN (SELECT channel_id, chatter_id FROM old_messages);
+
+    RETURN NULL;
+END;
+$$;
+
+-- The rows of the transition tables can't be paired up, so the difference between the old and the new rows is applied
+CREATE FUNCTION twitch.count_updated_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    INSERT INTO twitch.message_counts (channel_id, chatter_id, count)
+    SELECT channel_id, chatter_id, SUM(change)
+    FROM (
+        SELECT channel_id, chatter_id, 1 AS change
+        FROM new_messages
+        UNION ALL
+        SELECT channel_id, chatter_id, -1 AS change
+        FROM old_messages
+    ) AS changes
+    GROUP BY channel_id, chatter_id
+    HAVING SUM(change) <> 0
+    ON CONFLICT (channel_id, chatter_id) DO UPDATE
+    SET count = message_counts.count + EXCLUDED.count;
+
+    DELETE FROM twitch.message_counts
+    WHERE count <= 0 AND (channel_id, chatter_id) IN (SELECT channel_id, chatter_id FROM old_messages);
+
+    RETURN NULL;
+END;
+$$;
+
+-- Transition tables can't be used with a column list, so the trigger fires for every update
+CREATE TRIGGER count_updated_messages AFTER UPDATE ON twitch.messages REFERENCING OLD TABLE AS old_messages NEW TABLE AS new_messages FOR EACH STATEMENT EXECUTE FUNCTION twitch.count_updated_messages();
+
+
+-- migrate:down
+DROP TRIGGER count_updated_messages ON twitch.messages;
+
+DROP FUNCTION twitch.count_updated_messages();
+
+CREATE OR REPLACE FUNCTION twitch.count_deleted_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE twitch.message_counts
+    SET count = message_counts.count - deleted.count
+    FROM (
+        SELECT channel_id, chatter_id, COUNT(*) AS count
+        FROM old_messages
+        GROUP BY channel_id, chatter_id
+    ) AS deleted
+    WHERE
+        message_counts.channel_id = deleted.channel_id AND
+        message_counts.chatter_id = deleted.chatter_id;
+
+    DELETE FROM twitch.message_counts
+    WHERE count <= 0;
+
+    RETURN NULL;
+END;
+$$;
@@ -0,0 +1,71 @@
+-- migrate:up
+CREATE OR REPLACE FUNCTION twitch.create_messages_partitions(from_time timestamp with time zone, to_time timestamp with time zone) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    partition_start timestamp with time zone := date_trunc('month', from_time, 'UTC');
+    partition_end timestamp with time zone;
+    partition_name text;
+BEGIN
+    WHILE partition_start <= to_time LOOP
+        -- Adding a month to a timestamp depends on the session time zone, so go past the end and truncate instead
+        partition_end := date_trunc('month', partition_start + INTERVAL '32 days', 'UTC');
+        partition_name := 'messages_' || to_char(partition_start AT TIME ZONE 'UTC', 'YYYY_MM');
+        IF to_regclass(format('twitch.%I', partition_name)) IS NULL THEN
+            -- The partition can't be created while the default partition has rows in its range, so they are moved over.
+            -- Both statements go to the partitions directly, so the counting triggers of twitch.messages don't fire
+            LOCK TABLE twitch.messages_default IN SHARE ROW EXCLUSIVE MODE;
+            CREATE TEMPORARY TABLE moved_messages AS
+            SELECT id, message, sent_at, channel_id, online, is_command, search_vector, chatter_id
+            FROM twitch.messages_default
+            WITH NO DATA;
+
+            WITH moved AS (
+                DELETE FROM twitch.messages_default
+                WHERE sent_at >= partition_start AND sent_at < partition_end
+                RETURNING id, message, sent_at, channel_id, online, is_command, search_vector, chatter_id
+            )
+            INSERT INTO moved_messages
+            SELECT *
+            FROM moved;
+
+            EXECUTE format(
+                'CREATE TABLE twitch.%I PARTITION OF twitch.messages FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                partition_start,
+                partition_end
+            );
+            EXECUTE format(
+                'INSERT INTO twitch.%I (id, message, sent_at, channel_id, online, is_command, search_vector, chatter_id)
+                SELECT * FROM moved_messages',
+                partition_name
+            );
+            DROP TABLE moved_messages;
+        END IF;
+        partition_start := partition_end;
+    END LOOP;
+END;
+$$;
+
+
+-- migrate:down
+CREATE OR REPLACE FUNCTION twitch.create_messages_partitions(from_time timestamp with time zone, to_time timestamp with time zone) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    partition_start timestamp with time zone := date_trunc('month', from_time, 'UTC');
+    partition_end timestamp with time zone;
+BEGIN
+    WHILE partition_start <= to_time LOOP
+        -- Adding a month to a timestamp depends on the session time zone, so go past the end and truncate instead
+        partition_end := date_trunc('month', partition_start + INTERVAL '32 days', 'UTC');
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS twitch.%I PARTITION OF twitch.messages FOR VALUES FROM (%L) TO (%L)',
+            'messages_' || to_char(partition_start AT TIME ZONE 'UTC', 'YYYY_MM'),
+            partition_start,
+            partition_end
+        );
+        partition_start := partition_end;
+    END LOOP;
+END;
+$$;
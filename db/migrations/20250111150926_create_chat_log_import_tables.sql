@@ -0,0 +1,19 @@
+-- migrate:up
+-- The progress of scripts/twitch/import_chat_logs.py is saved in the same transaction as the imported messages
+CREATE TABLE twitch.chat_log_imports (
+    path text PRIMARY KEY,
+    bytes_read bigint NOT NULL,
+    finished boolean DEFAULT false NOT NULL
+);
+
+-- The time of the oldest message the bot logged itself, saved before the imported messages move it back
+CREATE TABLE twitch.chat_log_import_channels (
+    channel_id bigint PRIMARY KEY,
+    logging_started timestamp with time zone
+);
+
+
+-- migrate:down
+DROP TABLE twitch.chat_log_import_channels;
+
+DROP TABLE twitch.chat_log_imports;
@@ -0,0 +1,7 @@
+-- migrate:up
+-- The random message probe walks the ids of a single channel from a random starting point
+CREATE INDEX messages_channel_id_id_idx ON twitch.messages (channel_id, id);
+
+
+-- migrate:down
+DROP INDEX twitch.messages_channel_id_id_idx;
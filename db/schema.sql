@@ -16,6 +16,20 @@ SET row_security = off;
 CREATE SCHEMA twitch;
 
 
+--
+-- Name: pg_trgm; Type: EXTENSION; Schema: -; Owner: -
+--
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+
+--
+-- Name: EXTENSION pg_trgm; Type: COMMENT; Schema: -; Owner: -
+--
+
+COMMENT ON EXTENSION pg_trgm IS 'text similarity measurement and index searching based on trigrams';
+
+
 --
 -- Name: afk_type; Type: TYPE; Schema: twitch; Owner: -
 --
@@ -41,6 +55,18 @@ CREATE TYPE twitch.permission_level AS ENUM (
 );
 
 
+--
+-- Name: retention_target; Type: TYPE; Schema: twitch; Owner: -
+--
+
+CREATE TYPE twitch.retention_target AS ENUM (
+    'MESSAGES',
+    'COMMAND_USAGE',
+    'AFKS',
+    'REMINDERS'
+);
+
+
 --
 -- Name: user_role; Type: TYPE; Schema: twitch; Owner: -
 --
@@ -73,6 +99,188 @@ END;
 $$;
 
 
+--
+-- Name: chatter_key(bigint, text); Type: FUNCTION; Schema: twitch; Owner: -
+--
+
+CREATE FUNCTION twitch.chatter_key(chatter_user_id bigint, chatter_login text) RETURNS integer
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    key integer;
+    current_login text;
+BEGIN
+    SELECT id, login INTO key, current_login
+    FROM twitch.chatters
+    WHERE user_id = chatter_user_id;
+
+    IF FOUND THEN
+        -- A different login for a known id means the user has renamed themselves
+        IF current_login <> chatter_login THEN
+            UPDATE twitch.chatters
+            SET login = chatter_login, previous_logins = array_append(previous_logins, current_login)
+            WHERE id = key;
+        END IF;
+        RETURN key;
+    END IF;
+
+    -- Chatters created from the old sender names only have a login until they are seen again
+    UPDATE twitch.chatters
+    SET user_id = chatter_user_id
+    WHERE id = (
+        SELECT id
+        FROM twitch.chatters
+        WHERE login = chatter_login AND user_id IS NULL
+        ORDER BY id
+        LIMIT 1
+    )
+    RETURNING id INTO key;
+
+    IF FOUND THEN
+        RETURN key;
+    END IF;
+
+    INSERT INTO twitch.chatters (user_id, login)
+    VALUES (chatter_user_id, chatter_login)
+    ON CONFLICT (user_id) DO UPDATE
+    SET login = EXCLUDED.login
+    RETURNING id INTO key;
+
+    RETURN key;
+END;
+$$;
+
+
+--
+-- Name: count_deleted_messages(); Type: FUNCTION; Schema: twitch; Owner: -
+--
+
+CREATE FUNCTION twitch.count_deleted_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE twitch.message_counts
+    SET count = message_counts.count - deleted.count
+    FROM (
+        SELECT channel_id, chatter_id, COUNT(*) AS count
+        FROM old_messages
+        GROUP BY channel_id, chatter_id
+    ) AS deleted
+    WHERE
+        message_counts.channel_id = deleted.channel_id AND
+        message_counts.chatter_id = deleted.chatter_id;
+
+    DELETE FROM twitch.message_counts
+    WHERE count <= 0 AND (channel_id, chatter_id) IN (SELECT channel_id, chatter_id FROM old_messages);
+
+    RETURN NULL;
+END;
+$$;
+
+
+--
+-- Name: count_inserted_messages(); Type: FUNCTION; Schema: twitch; Owner: -
+--
+
+CREATE FUNCTION twitch.count_inserted_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    INSERT INTO twitch.message_counts (channel_id, chatter_id, count)
+    SELECT channel_id, chatter_id, COUNT(*)
+    FROM new_messages
+    GROUP BY channel_id, chatter_id
+    ON CONFLICT (channel_id, chatter_id) DO UPDATE
+    SET count = message_counts.count + EXCLUDED.count;
+
+    RETURN NULL;
+END;
+$$;
+
+
+--
+-- Name: count_updated_messages(); Type: FUNCTION; Schema: twitch; Owner: -
+--
+
+CREATE FUNCTION twitch.count_updated_messages() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    INSERT INTO twitch.message_counts (channel_id, chatter_id, count)
+    SELECT channel_id, chatter_id, SUM(change)
+    FROM (
+        SELECT channel_id, chatter_id, 1 AS change
+        FROM new_messages
+        UNION ALL
+        SELECT channel_id, chatter_id, -1 AS change
+        FROM old_messages
+    ) AS changes
+    GROUP BY channel_id, chatter_id
+    HAVING SUM(change) <> 0
+    ON CONFLICT (channel_id, chatter_id) DO UPDATE
+    SET count = message_counts.count + EXCLUDED.count;
+
+    DELETE FROM twitch.message_counts
+    WHERE count <= 0 AND (channel_id, chatter_id) IN (SELECT channel_id, chatter_id FROM old_messages);
+
+    RETURN NULL;
+END;
+$$;
+
+
+--
+-- Name: create_messages_partitions(timestamp with time zone, timestamp with time zone); Type: FUNCTION; Schema: twitch; Owner: -
+--
+
+CREATE FUNCTION twitch.create_messages_partitions(from_time timestamp with time zone, to_time timestamp with time zone) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    partition_start timestamp with time zone := date_trunc('month', from_time, 'UTC');
+    partition_end timestamp with time zone;
+    partition_name text;
+BEGIN
+    WHILE partition_start <= to_time LOOP
+        -- Adding a month to a timestamp depends on the session time zone, so go past the end and truncate instead
+        partition_end := date_trunc('month', partition_start + INTERVAL '32 days', 'UTC');
+        partition_name := 'messages_' || to_char(partition_start AT TIME ZONE 'UTC', 'YYYY_MM');
+        IF to_regclass(format('twitch.%I', partition_name)) IS NULL THEN
+            -- The partition can't be created while the default partition has rows in its range, so they are moved over.
+            -- Both statements go to the partitions directly, so the counting triggers of twitch.messages don't fire
+            LOCK TABLE twitch.messages_default IN SHARE ROW EXCLUSIVE MODE;
+            CREATE TEMPORARY TABLE moved_messages AS
+            SELECT id, message, sent_at, channel_id, online, is_command, search_vector, chatter_id
+            FROM twitch.messages_default
+            WITH NO DATA;
+
+            WITH moved AS (
+                DELETE FROM twitch.messages_default
+                WHERE sent_at >= partition_start AND sent_at < partition_end
+                RETURNING id, message, sent_at, channel_id, online, is_command, search_vector, chatter_id
+            )
+            INSERT INTO moved_messages
+            SELECT *
+            FROM moved;
+
+            EXECUTE format(
+                'CREATE TABLE twitch.%I PARTITION OF twitch.messages FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                partition_start,
+                partition_end
+            );
+            EXECUTE format(
+                'INSERT INTO twitch.%I (id, message, sent_at, channel_id, online, is_command, search_vector, chatter_id)
+                SELECT * FROM moved_messages',
+                partition_name
+            );
+            DROP TABLE moved_messages;
+        END IF;
+        partition_start := partition_end;
+    END LOOP;
+END;
+$$;
+
+
 --
 -- Name: delete_disposable_reminder(); Type: FUNCTION; Schema: twitch; Owner: -
 --
@@ -150,8 +358,8 @@ CREATE TABLE twitch.afks (
     kind twitch.afk_type NOT NULL,
     created_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
     processed_at timestamp with time zone,
-    channel_id text NOT NULL,
-    target_id text NOT NULL
+    channel_id bigint NOT NULL,
+    target_id bigint NOT NULL
 );
 
 
@@ -211,7 +419,7 @@ ALTER SEQUENCE twitch.blocked_terms_id_seq OWNED BY twitch.blocked_terms.id;
 --
 
 CREATE TABLE twitch.channel_config (
-    channel_id text NOT NULL,
+    channel_id bigint NOT NULL,
     logging boolean DEFAULT true NOT NULL,
     emote_streaks boolean DEFAULT false NOT NULL,
     commands_online boolean DEFAULT true NOT NULL,
@@ -219,11 +427,65 @@ CREATE TABLE twitch.channel_config (
     notifications_online boolean DEFAULT false NOT NULL,
     outside_reminds boolean DEFAULT true NOT NULL,
     disabled_commands text[] DEFAULT ARRAY[]::text[] NOT NULL,
-    banned_users text[] DEFAULT ARRAY[]::text[] NOT NULL,
-    prefixes text[] DEFAULT ARRAY[]::text[] NOT NULL
+    banned_users bigint[] DEFAULT ARRAY[]::bigint[] NOT NULL,
+    prefixes text[] DEFAULT ARRAY[]::text[] NOT NULL,
+    search_config regconfig DEFAULT 'english'::regconfig NOT NULL
+);
+
+
+--
+-- Name: chat_log_import_channels; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.chat_log_import_channels (
+    channel_id bigint NOT NULL,
+    logging_started timestamp with time zone
 );
 
 
+--
+-- Name: chat_log_imports; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.chat_log_imports (
+    path text NOT NULL,
+    bytes_read bigint NOT NULL,
+    finished boolean DEFAULT false NOT NULL
+);
+
+
+--
+-- Name: chatters; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.chatters (
+    id integer NOT NULL,
+    user_id bigint,
+    login text NOT NULL,
+    previous_logins text[] DEFAULT ARRAY[]::text[] NOT NULL
+);
+
+
+--
+-- Name: chatters_id_seq; Type: SEQUENCE; Schema: twitch; Owner: -
+--
+
+CREATE SEQUENCE twitch.chatters_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+--
+-- Name: chatters_id_seq; Type: SEQUENCE OWNED BY; Schema: twitch; Owner: -
+--
+
+ALTER SEQUENCE twitch.chatters_id_seq OWNED BY twitch.chatters.id;
+
+
 --
 -- Name: command_usage_log; Type: TABLE; Schema: twitch; Owner: -
 --
@@ -234,8 +496,8 @@ CREATE TABLE twitch.command_usage_log (
     message text NOT NULL,
     use_time_ms double precision NOT NULL,
     used_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
-    channel_id text NOT NULL,
-    user_id text NOT NULL
+    channel_id bigint NOT NULL,
+    user_id bigint NOT NULL
 );
 
 
@@ -264,7 +526,7 @@ ALTER SEQUENCE twitch.command_usage_log_log_id_seq OWNED BY twitch.command_usage
 --
 
 CREATE TABLE twitch.counters (
-    channel_id text NOT NULL,
+    channel_id bigint NOT NULL,
     name text NOT NULL,
     value integer DEFAULT 0 NOT NULL
 );
@@ -275,7 +537,7 @@ CREATE TABLE twitch.counters (
 --
 
 CREATE TABLE twitch.custom_commands (
-    channel_id text NOT NULL,
+    channel_id bigint NOT NULL,
     name text NOT NULL,
     message text NOT NULL,
     level twitch.permission_level DEFAULT 'EVERYONE'::twitch.permission_level NOT NULL,
@@ -288,7 +550,7 @@ CREATE TABLE twitch.custom_commands (
 --
 
 CREATE TABLE twitch.custom_patterns (
-    channel_id text NOT NULL,
+    channel_id bigint NOT NULL,
     name text NOT NULL,
     message text NOT NULL,
     pattern text NOT NULL,
@@ -299,13 +561,25 @@ CREATE TABLE twitch.custom_patterns (
 );
 
 
+--
+-- Name: emote_usage; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.emote_usage (
+    channel_id bigint NOT NULL,
+    emote text NOT NULL,
+    day date NOT NULL,
+    count integer NOT NULL
+);
+
+
 --
 -- Name: fights; Type: TABLE; Schema: twitch; Owner: -
 --
 
 CREATE TABLE twitch.fights (
-    user_id_1 text NOT NULL,
-    user_id_2 text NOT NULL,
+    user_id_1 bigint NOT NULL,
+    user_id_2 bigint NOT NULL,
     user_1_wins integer DEFAULT 0 NOT NULL,
     user_2_wins integer DEFAULT 0 NOT NULL,
     CONSTRAINT fights_check CHECK ((user_id_1 < user_id_2))
@@ -347,7 +621,7 @@ ALTER SEQUENCE twitch.fortunes_id_seq OWNED BY twitch.fortunes.id;
 --
 
 CREATE TABLE twitch.joined_channels (
-    channel_id text NOT NULL,
+    channel_id bigint NOT NULL,
     username text NOT NULL,
     currently_online boolean DEFAULT false NOT NULL,
     joined_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL
@@ -359,20 +633,32 @@ CREATE TABLE twitch.joined_channels (
 --
 
 CREATE TABLE twitch.last_iqs (
-    user_id text NOT NULL,
+    user_id bigint NOT NULL,
     last_iq integer NOT NULL,
     last_updated timestamp with time zone NOT NULL
 );
 
 
+--
+-- Name: last_seen; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.last_seen (
+    user_id bigint NOT NULL,
+    channel_id bigint NOT NULL,
+    message text NOT NULL,
+    seen_at timestamp with time zone NOT NULL
+);
+
+
 --
 -- Name: live_notifications; Type: TABLE; Schema: twitch; Owner: -
 --
 
 CREATE TABLE twitch.live_notifications (
-    channel_id text NOT NULL,
-    target_id text NOT NULL,
-    pings text[] DEFAULT ARRAY[]::text[] NOT NULL
+    channel_id bigint NOT NULL,
+    target_id bigint NOT NULL,
+    pings bigint[] DEFAULT ARRAY[]::bigint[] NOT NULL
 );
 
 
@@ -381,7 +667,7 @@ CREATE TABLE twitch.live_notifications (
 --
 
 CREATE TABLE twitch.locations (
-    user_id text NOT NULL,
+    user_id bigint NOT NULL,
     latitude double precision NOT NULL,
     longitude double precision NOT NULL,
     address text NOT NULL,
@@ -389,17 +675,49 @@ CREATE TABLE twitch.locations (
 );
 
 
+--
+-- Name: message_counts; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.message_counts (
+    channel_id bigint NOT NULL,
+    count bigint NOT NULL,
+    chatter_id integer NOT NULL
+);
+
+
 --
 -- Name: messages; Type: TABLE; Schema: twitch; Owner: -
 --
 
 CREATE TABLE twitch.messages (
-    id integer NOT NULL,
-    sender text NOT NULL,
+    id bigint NOT NULL,
+    message text NOT NULL,
+    sent_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    channel_id bigint NOT NULL,
+    online boolean,
+    word_count integer GENERATED ALWAYS AS (array_length(string_to_array(message, ' '::text), 1)) STORED,
+    is_command boolean DEFAULT false NOT NULL,
+    search_vector tsvector,
+    chatter_id integer NOT NULL
+)
+PARTITION BY RANGE (sent_at);
+
+
+--
+-- Name: messages_default; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.messages_default (
+    id bigint NOT NULL,
     message text NOT NULL,
     sent_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
-    channel_id text NOT NULL,
-    online boolean
+    channel_id bigint NOT NULL,
+    online boolean,
+    word_count integer GENERATED ALWAYS AS (array_length(string_to_array(message, ' '::text), 1)) STORED,
+    is_command boolean DEFAULT false NOT NULL,
+    search_vector tsvector,
+    chatter_id integer NOT NULL
 );
 
 
@@ -408,7 +726,7 @@ CREATE TABLE twitch.messages (
 --
 
 CREATE SEQUENCE twitch.messages_id_seq
-    AS integer
+    AS bigint
     START WITH 1
     INCREMENT BY 1
     NO MINVALUE
@@ -428,7 +746,7 @@ ALTER SEQUENCE twitch.messages_id_seq OWNED BY twitch.messages.id;
 --
 
 CREATE TABLE twitch.old_fish (
-    user_id text NOT NULL,
+    user_id bigint NOT NULL,
     fish_count integer DEFAULT 0 NOT NULL,
     exp integer DEFAULT 0 NOT NULL,
     last_fished timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
@@ -449,9 +767,9 @@ CREATE TABLE twitch.reminders (
     sent boolean DEFAULT false,
     cancelled boolean DEFAULT false,
     delete_after boolean DEFAULT false,
-    channel_id text NOT NULL,
-    sender_id text NOT NULL,
-    target_id text NOT NULL,
+    channel_id bigint NOT NULL,
+    sender_id bigint NOT NULL,
+    target_id bigint NOT NULL,
     CONSTRAINT reminders_check CHECK (((sent IS FALSE) OR (cancelled IS FALSE))),
     CONSTRAINT reminders_check1 CHECK (((processed_at IS NULL) OR ((processed_at IS NOT NULL) AND ((sent IS TRUE) OR (cancelled IS TRUE)))))
 );
@@ -477,12 +795,60 @@ CREATE SEQUENCE twitch.reminders_id_seq
 ALTER SEQUENCE twitch.reminders_id_seq OWNED BY twitch.reminders.id;
 
 
+--
+-- Name: retention_policies; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.retention_policies (
+    channel_id bigint NOT NULL,
+    target twitch.retention_target NOT NULL,
+    max_age interval,
+    max_rows integer,
+    CONSTRAINT retention_policies_check CHECK (((max_age IS NOT NULL) OR (max_rows IS NOT NULL)))
+);
+
+
+--
+-- Name: retention_runs; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.retention_runs (
+    id integer NOT NULL,
+    ran_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    channel_id bigint NOT NULL,
+    target twitch.retention_target NOT NULL,
+    purged_rows integer NOT NULL,
+    batches integer NOT NULL,
+    duration_ms double precision NOT NULL
+);
+
+
+--
+-- Name: retention_runs_id_seq; Type: SEQUENCE; Schema: twitch; Owner: -
+--
+
+CREATE SEQUENCE twitch.retention_runs_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+--
+-- Name: retention_runs_id_seq; Type: SEQUENCE OWNED BY; Schema: twitch; Owner: -
+--
+
+ALTER SEQUENCE twitch.retention_runs_id_seq OWNED BY twitch.retention_runs.id;
+
+
 --
 -- Name: rps; Type: TABLE; Schema: twitch; Owner: -
 --
 
 CREATE TABLE twitch.rps (
-    user_id text NOT NULL,
+    user_id bigint NOT NULL,
     wins integer DEFAULT 0 NOT NULL,
     draws integer DEFAULT 0 NOT NULL,
     losses integer DEFAULT 0 NOT NULL
@@ -494,7 +860,7 @@ CREATE TABLE twitch.rps (
 --
 
 CREATE TABLE twitch.timers (
-    channel_id text NOT NULL,
+    channel_id bigint NOT NULL,
     name text NOT NULL,
     message text NOT NULL,
     next_time timestamp with time zone NOT NULL,
@@ -503,12 +869,46 @@ CREATE TABLE twitch.timers (
 );
 
 
+--
+-- Name: token_count_backfill; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.token_count_backfill (
+    last_id bigint NOT NULL,
+    until_id bigint NOT NULL
+);
+
+
+--
+-- Name: token_count_pruning; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.token_count_pruning (
+    channel_id bigint NOT NULL,
+    first_pruned_at timestamp with time zone NOT NULL,
+    max_count bigint NOT NULL
+);
+
+
+--
+-- Name: token_counts; Type: TABLE; Schema: twitch; Owner: -
+--
+
+CREATE TABLE twitch.token_counts (
+    channel_id bigint NOT NULL,
+    token text NOT NULL,
+    count bigint NOT NULL,
+    first_seen timestamp with time zone NOT NULL,
+    last_seen timestamp with time zone NOT NULL
+);
+
+
 --
 -- Name: user_config; Type: TABLE; Schema: twitch; Owner: -
 --
 
 CREATE TABLE twitch.user_config (
-    user_id text NOT NULL,
+    user_id bigint NOT NULL,
     role twitch.user_role DEFAULT 'DEFAULT'::twitch.user_role NOT NULL,
     no_replies boolean DEFAULT false NOT NULL,
     optouts text[] DEFAULT ARRAY[]::text[] NOT NULL,
@@ -521,10 +921,10 @@ CREATE TABLE twitch.user_config (
 --
 
 CREATE TABLE twitch.watchtime (
-    username text NOT NULL,
     online_time integer DEFAULT 0 NOT NULL,
     total_time integer DEFAULT 0 NOT NULL,
-    channel_id text NOT NULL
+    channel_id bigint NOT NULL,
+    chatter_id integer NOT NULL
 );
 
 
@@ -533,9 +933,9 @@ CREATE TABLE twitch.watchtime (
 --
 
 CREATE TABLE twitch.yt_upload_notifications (
-    channel_id text NOT NULL,
+    channel_id bigint NOT NULL,
     playlist_id text NOT NULL,
-    pings text[] DEFAULT ARRAY[]::text[] NOT NULL
+    pings bigint[] DEFAULT ARRAY[]::bigint[] NOT NULL
 );
 
 
@@ -553,6 +953,13 @@ ALTER TABLE ONLY twitch.afks ALTER COLUMN id SET DEFAULT nextval('twitch.afks_id
 ALTER TABLE ONLY twitch.blocked_terms ALTER COLUMN id SET DEFAULT nextval('twitch.blocked_terms_id_seq'::regclass);
 
 
+--
+-- Name: chatters id; Type: DEFAULT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.chatters ALTER COLUMN id SET DEFAULT nextval('twitch.chatters_id_seq'::regclass);
+
+
 --
 -- Name: command_usage_log id; Type: DEFAULT; Schema: twitch; Owner: -
 --
@@ -574,6 +981,20 @@ ALTER TABLE ONLY twitch.fortunes ALTER COLUMN id SET DEFAULT nextval('twitch.for
 ALTER TABLE ONLY twitch.messages ALTER COLUMN id SET DEFAULT nextval('twitch.messages_id_seq'::regclass);
 
 
+--
+-- Name: messages_default id; Type: DEFAULT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.messages_default ALTER COLUMN id SET DEFAULT nextval('twitch.messages_id_seq'::regclass);
+
+
+--
+-- Name: messages_default; Type: TABLE ATTACH; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.messages ATTACH PARTITION twitch.messages_default DEFAULT;
+
+
 --
 -- Name: reminders id; Type: DEFAULT; Schema: twitch; Owner: -
 --
@@ -581,6 +1002,13 @@ ALTER TABLE ONLY twitch.messages ALTER COLUMN id SET DEFAULT nextval('twitch.mes
 ALTER TABLE ONLY twitch.reminders ALTER COLUMN id SET DEFAULT nextval('twitch.reminders_id_seq'::regclass);
 
 
+--
+-- Name: retention_runs id; Type: DEFAULT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.retention_runs ALTER COLUMN id SET DEFAULT nextval('twitch.retention_runs_id_seq'::regclass);
+
+
 --
 -- Name: schema_migrations schema_migrations_pkey; Type: CONSTRAINT; Schema: public; Owner: -
 --
@@ -613,6 +1041,38 @@ ALTER TABLE ONLY twitch.channel_config
     ADD CONSTRAINT channel_config_pkey PRIMARY KEY (channel_id);
 
 
+--
+-- Name: chat_log_import_channels chat_log_import_channels_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.chat_log_import_channels
+    ADD CONSTRAINT chat_log_import_channels_pkey PRIMARY KEY (channel_id);
+
+
+--
+-- Name: chat_log_imports chat_log_imports_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.chat_log_imports
+    ADD CONSTRAINT chat_log_imports_pkey PRIMARY KEY (path);
+
+
+--
+-- Name: chatters chatters_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.chatters
+    ADD CONSTRAINT chatters_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: chatters chatters_user_id_key; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.chatters
+    ADD CONSTRAINT chatters_user_id_key UNIQUE (user_id);
+
+
 --
 -- Name: command_usage_log command_usage_log_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
 --
@@ -645,6 +1105,14 @@ ALTER TABLE ONLY twitch.custom_patterns
     ADD CONSTRAINT custom_patterns_pkey PRIMARY KEY (channel_id, name);
 
 
+--
+-- Name: emote_usage emote_usage_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.emote_usage
+    ADD CONSTRAINT emote_usage_pkey PRIMARY KEY (channel_id, emote, day);
+
+
 --
 -- Name: fights fights_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
 --
@@ -693,6 +1161,14 @@ ALTER TABLE ONLY twitch.last_iqs
     ADD CONSTRAINT last_iqs_pkey PRIMARY KEY (user_id);
 
 
+--
+-- Name: last_seen last_seen_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.last_seen
+    ADD CONSTRAINT last_seen_pkey PRIMARY KEY (user_id);
+
+
 --
 -- Name: live_notifications live_notifications_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
 --
@@ -709,12 +1185,28 @@ ALTER TABLE ONLY twitch.locations
     ADD CONSTRAINT locations_pkey PRIMARY KEY (user_id);
 
 
+--
+-- Name: message_counts message_counts_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.message_counts
+    ADD CONSTRAINT message_counts_pkey PRIMARY KEY (channel_id, chatter_id);
+
+
 --
 -- Name: messages messages_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
 --
 
 ALTER TABLE ONLY twitch.messages
-    ADD CONSTRAINT messages_pkey PRIMARY KEY (id);
+    ADD CONSTRAINT messages_pkey PRIMARY KEY (id, sent_at);
+
+
+--
+-- Name: messages_default messages_default_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.messages_default
+    ADD CONSTRAINT messages_default_pkey PRIMARY KEY (id, sent_at);
 
 
 --
@@ -733,6 +1225,22 @@ ALTER TABLE ONLY twitch.reminders
     ADD CONSTRAINT reminders_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: retention_policies retention_policies_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.retention_policies
+    ADD CONSTRAINT retention_policies_pkey PRIMARY KEY (channel_id, target);
+
+
+--
+-- Name: retention_runs retention_runs_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.retention_runs
+    ADD CONSTRAINT retention_runs_pkey PRIMARY KEY (id);
+
+
 --
 -- Name: rps rps_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
 --
@@ -749,6 +1257,22 @@ ALTER TABLE ONLY twitch.timers
     ADD CONSTRAINT timers_pkey PRIMARY KEY (channel_id, name);
 
 
+--
+-- Name: token_count_pruning token_count_pruning_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.token_count_pruning
+    ADD CONSTRAINT token_count_pruning_pkey PRIMARY KEY (channel_id);
+
+
+--
+-- Name: token_counts token_counts_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
+--
+
+ALTER TABLE ONLY twitch.token_counts
+    ADD CONSTRAINT token_counts_pkey PRIMARY KEY (channel_id, token);
+
+
 --
 -- Name: user_config user_config_pkey; Type: CONSTRAINT; Schema: twitch; Owner: -
 --
@@ -762,7 +1286,7 @@ ALTER TABLE ONLY twitch.user_config
 --
 
 ALTER TABLE ONLY twitch.watchtime
-    ADD CONSTRAINT watchtime_pkey PRIMARY KEY (channel_id, username);
+    ADD CONSTRAINT watchtime_pkey PRIMARY KEY (channel_id, chatter_id);
 
 
 --
@@ -773,11 +1297,235 @@ ALTER TABLE ONLY twitch.yt_upload_notifications
     ADD CONSTRAINT yt_upload_notifications_pkey PRIMARY KEY (channel_id, playlist_id);
 
 
+--
+-- Name: afks_pending_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX afks_pending_idx ON twitch.afks USING btree (channel_id, target_id) WHERE (processed_at IS NULL);
+
+
+--
+-- Name: afks_processed_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX afks_processed_idx ON twitch.afks USING btree (channel_id, target_id, processed_at DESC) WHERE (processed_at IS NOT NULL);
+
+
+--
+-- Name: chatters_login_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX chatters_login_idx ON twitch.chatters USING btree (login);
+
+
+--
+-- Name: command_usage_log_channel_id_used_at_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX command_usage_log_channel_id_used_at_idx ON twitch.command_usage_log USING btree (channel_id, used_at);
+
+
+--
+-- Name: messages_channel_id_chatter_id_sent_at_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_channel_id_chatter_id_sent_at_idx ON ONLY twitch.messages USING btree (channel_id, chatter_id, sent_at DESC);
+
+
+--
+-- Name: messages_channel_id_id_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_channel_id_id_idx ON ONLY twitch.messages USING btree (channel_id, id);
+
+
+--
+-- Name: messages_channel_id_sent_at_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_channel_id_sent_at_idx ON ONLY twitch.messages USING btree (channel_id, sent_at DESC);
+
+
+--
+-- Name: messages_channel_id_word_count_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_channel_id_word_count_idx ON ONLY twitch.messages USING btree (channel_id, word_count);
+
+
+--
+-- Name: messages_commands_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_commands_idx ON ONLY twitch.messages USING btree (channel_id, chatter_id) WHERE is_command;
+
+
+--
+-- Name: messages_default_channel_id_chatter_id_sent_at_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_default_channel_id_chatter_id_sent_at_idx ON twitch.messages_default USING btree (channel_id, chatter_id, sent_at DESC);
+
+
+--
+-- Name: messages_default_channel_id_id_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_default_channel_id_id_idx ON twitch.messages_default USING btree (channel_id, id);
+
+
+--
+-- Name: messages_default_channel_id_sent_at_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_default_channel_id_sent_at_idx ON twitch.messages_default USING btree (channel_id, sent_at DESC);
+
+
+--
+-- Name: messages_default_channel_id_word_count_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_default_channel_id_word_count_idx ON twitch.messages_default USING btree (channel_id, word_count);
+
+
+--
+-- Name: messages_default_channel_id_chatter_id_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_default_channel_id_chatter_id_idx ON twitch.messages_default USING btree (channel_id, chatter_id) WHERE is_command;
+
+
+--
+-- Name: messages_default_message_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_default_message_idx ON twitch.messages_default USING gin (message public.gin_trgm_ops);
+
+
+--
+-- Name: messages_default_search_vector_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_default_search_vector_idx ON twitch.messages_default USING gin (search_vector);
+
+
+--
+-- Name: messages_default_sent_at_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_default_sent_at_idx ON twitch.messages_default USING brin (sent_at);
+
+
+--
+-- Name: messages_message_trgm_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_message_trgm_idx ON ONLY twitch.messages USING gin (message public.gin_trgm_ops);
+
+
 --
 -- Name: messages_search_idx; Type: INDEX; Schema: twitch; Owner: -
 --
 
-CREATE INDEX messages_search_idx ON twitch.messages USING gin (to_tsvector('english'::regconfig, message));
+CREATE INDEX messages_search_idx ON ONLY twitch.messages USING gin (search_vector);
+
+
+--
+-- Name: messages_sent_at_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX messages_sent_at_idx ON ONLY twitch.messages USING brin (sent_at);
+
+
+--
+-- Name: reminders_not_timed_pending_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX reminders_not_timed_pending_idx ON twitch.reminders USING btree (target_id, created_at) WHERE ((scheduled_at IS NULL) AND (processed_at IS NULL));
+
+
+--
+-- Name: reminders_processed_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX reminders_processed_idx ON twitch.reminders USING btree (channel_id, processed_at) WHERE (processed_at IS NOT NULL);
+
+
+--
+-- Name: reminders_timed_pending_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX reminders_timed_pending_idx ON twitch.reminders USING btree (scheduled_at) WHERE ((scheduled_at IS NOT NULL) AND (processed_at IS NULL));
+
+
+--
+-- Name: retention_runs_channel_id_ran_at_idx; Type: INDEX; Schema: twitch; Owner: -
+--
+
+CREATE INDEX retention_runs_channel_id_ran_at_idx ON twitch.retention_runs USING btree (channel_id, ran_at DESC);
+
+
+--
+-- Name: messages_default_channel_id_chatter_id_idx; Type: INDEX ATTACH; Schema: twitch; Owner: -
+--
+
+ALTER INDEX twitch.messages_commands_idx ATTACH PARTITION twitch.messages_default_channel_id_chatter_id_idx;
+
+
+--
+-- Name: messages_default_channel_id_chatter_id_sent_at_idx; Type: INDEX ATTACH; Schema: twitch; Owner: -
+--
+
+ALTER INDEX twitch.messages_channel_id_chatter_id_sent_at_idx ATTACH PARTITION twitch.messages_default_channel_id_chatter_id_sent_at_idx;
+
+
+--
+-- Name: messages_default_channel_id_id_idx; Type: INDEX ATTACH; Schema: twitch; Owner: -
+--
+
+ALTER INDEX twitch.messages_channel_id_id_idx ATTACH PARTITION twitch.messages_default_channel_id_id_idx;
+
+
+--
+-- Name: messages_default_channel_id_sent_at_idx; Type: INDEX ATTACH; Schema: twitch; Owner: -
+--
+
+ALTER INDEX twitch.messages_channel_id_sent_at_idx ATTACH PARTITION twitch.messages_default_channel_id_sent_at_idx;
+
+
+--
+-- Name: messages_default_channel_id_word_count_idx; Type: INDEX ATTACH; Schema: twitch; Owner: -
+--
+
+ALTER INDEX twitch.messages_channel_id_word_count_idx ATTACH PARTITION twitch.messages_default_channel_id_word_count_idx;
+
+
+--
+-- Name: messages_default_message_idx; Type: INDEX ATTACH; Schema: twitch; Owner: -
+--
+
+ALTER INDEX twitch.messages_message_trgm_idx ATTACH PARTITION twitch.messages_default_message_idx;
+
+
+--
+-- Name: messages_default_pkey; Type: INDEX ATTACH; Schema: twitch; Owner: -
+--
+
+ALTER INDEX twitch.messages_pkey ATTACH PARTITION twitch.messages_default_pkey;
+
+
+--
+-- Name: messages_default_search_vector_idx; Type: INDEX ATTACH; Schema: twitch; Owner: -
+--
+
+ALTER INDEX twitch.messages_search_idx ATTACH PARTITION twitch.messages_default_search_vector_idx;
+
+
+--
+-- Name: messages_default_sent_at_idx; Type: INDEX ATTACH; Schema: twitch; Owner: -
+--
+
+ALTER INDEX twitch.messages_sent_at_idx ATTACH PARTITION twitch.messages_default_sent_at_idx;
 
 
 --
@@ -787,6 +1535,27 @@ CREATE INDEX messages_search_idx ON twitch.messages USING gin (to_tsvector('engl
 CREATE TRIGGER cancel_reminders_on_part AFTER DELETE ON twitch.joined_channels FOR EACH ROW EXECUTE FUNCTION twitch.cancel_reminders();
 
 
+--
+-- Name: messages count_deleted_messages; Type: TRIGGER; Schema: twitch; Owner: -
+--
+
+CREATE TRIGGER count_deleted_messages AFTER DELETE ON twitch.messages REFERENCING OLD TABLE AS old_messages FOR EACH STATEMENT EXECUTE FUNCTION twitch.count_deleted_messages();
+
+
+--
+-- Name: messages count_inserted_messages; Type: TRIGGER; Schema: twitch; Owner: -
+--
+
+CREATE TRIGGER count_inserted_messages AFTER INSERT ON twitch.messages REFERENCING NEW TABLE AS new_messages FOR EACH STATEMENT EXECUTE FUNCTION twitch.count_inserted_messages();
+
+
+--
+-- Name: messages count_updated_messages; Type: TRIGGER; Schema: twitch; Owner: -
+--
+
+CREATE TRIGGER count_updated_messages AFTER UPDATE ON twitch.messages REFERENCING OLD TABLE AS old_messages NEW TABLE AS new_messages FOR EACH STATEMENT EXECUTE FUNCTION twitch.count_updated_messages();
+
+
 --
 -- Name: reminders delete_disposable_reminder_after_complete; Type: TRIGGER; Schema: twitch; Owner: -
 --
@@ -840,4 +1609,25 @@ INSERT INTO public.schema_migrations (version) VALUES
     ('20240831210655'),
     ('20240923122022'),
     ('20240926234316'),
-    ('20241112072924');
+    ('20241112072924'),
+    ('20241120183012'),
+    ('20241125201544'),
+    ('20241127164408'),
+    ('20241130112537'),
+    ('20241203190215'),
+    ('20241205173350'),
+    ('20241208140921'),
+    ('20241211192734'),
+    ('20241214120348'),
+    ('20241217093016'),
+    ('20241219154722'),
+    ('20241222101530'),
+    ('20241224113042'),
+    ('20241227164805'),
+    ('20241230191126'),
+    ('20250103184512'),
+    ('20250105120338'),
+    ('20250107093251'),
+    ('20250109201417'),
+    ('20250111150926'),
+    ('20250113110842');
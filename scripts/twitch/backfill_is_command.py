@@ -0,0 +1,53 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from dotenv import load_dotenv
+
+from shared import database
+from shared.database.twitch import channels
+
+
+BATCH_SIZE = 100_000
+
+
+# Messages are updated in id ranges with a commit after each one, so the table is never locked for long
+async def backfill_is_command():
+    con_pool = await database.init_pool(asyncio.get_event_loop(), localhost=True)
+    bounds = await con_pool.fetchrow("SELECT MIN(id) AS min_id, MAX(id) AS max_id FROM twitch.messages;")
+    if bounds is None or bounds["min_id"] is None:
+        print("No messages to backfill")
+        return
+
+    for channel_config in await channels.channel_configs(con_pool):
+        prefixes = channel_config.prefixes if len(channel_config.prefixes) > 0 else (os.environ["GLOBAL_PREFIX"],)
+        patterns = [prefix.replace("%", r"\%").replace("_", r"\_") + "%" for prefix in prefixes]
+
+        updated = 0
+        for start_id in range(bounds["min_id"], bounds["max_id"] + 1, BATCH_SIZE):
+            result: str = await con_pool.execute(
+                """
+                UPDATE twitch.messages
+                SET is_command = TRUE
+                WHERE
+                    channel_id = $1 AND
+                    id >= $2 AND
+                    id < $3 AND
+                    NOT is_command AND
+                    message LIKE ANY($4);
+                """,
+                channel_config.channel_id,
+                start_id,
+                start_id + BATCH_SIZE,
+                patterns,
+            )
+            updated += int(result.split()[-1])
+        print(f"#{channel_config.username}: {updated} messages marked as commands")
+    await con_pool.close()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    asyncio.run(backfill_is_command())
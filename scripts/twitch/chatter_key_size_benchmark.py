@@ -0,0 +1,151 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from dotenv import load_dotenv
+
+from shared import database
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1024 / 1024:10.2f} MB"
+
+
+# The logins are made to be of a typical length, which is where most of the savings come from
+async def create_and_seed(con, row_count: int, chatter_count: int) -> None:
+    await con.execute(
+        """
+        CREATE TEMPORARY TABLE messages_login (
+            id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            channel_id bigint NOT NULL,
+            sender text NOT NULL,
+            message text NOT NULL,
+            sent_at timestamp with time zone NOT NULL
+        ) ON COMMIT DROP;
+        CREATE INDEX ON messages_login (channel_id, sender, sent_at DESC);
+
+        CREATE TEMPORARY TABLE messages_key (
+            id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            channel_id bigint NOT NULL,
+            chatter_id integer NOT NULL,
+            message text NOT NULL,
+            sent_at timestamp with time zone NOT NULL
+        ) ON COMMIT DROP;
+        CREATE INDEX ON messages_key (channel_id, chatter_id, sent_at DESC);
+
+        CREATE TEMPORARY TABLE watchtime_login (
+            channel_id bigint NOT NULL,
+            username text NOT NULL,
+            online_time integer NOT NULL,
+            total_time integer NOT NULL,
+            PRIMARY KEY (channel_id, username)
+        ) ON COMMIT DROP;
+
+        CREATE TEMPORARY TABLE watchtime_key (
+            channel_id bigint NOT NULL,
+            chatter_id integer NOT NULL,
+            online_time integer NOT NULL,
+            total_time integer NOT NULL,
+            PRIMARY KEY (channel_id, chatter_id)
+        ) ON COMMIT DROP;
+
+        CREATE TEMPORARY TABLE chatters_key (
+            id integer PRIMARY KEY,
+            user_id bigint UNIQUE,
+            login text NOT NULL,
+            previous_logins text[] DEFAULT ARRAY[]::text[] NOT NULL
+        ) ON COMMIT DROP;
+        CREATE INDEX ON chatters_key (login);
+        """
+    )
+    await con.execute(
+        """
+        INSERT INTO chatters_key (id, user_id, login)
+        SELECT i, 100000000 + i, 'benchmark_chatter_' || i
+        FROM generate_series(1, $1) AS i;
+        """,
+        chatter_count,
+    )
+    for table, column, value in (
+        ("messages_login", "sender", "'benchmark_chatter_' || (1 + i % $2)"),
+        ("messages_key", "chatter_id", "1 + i % $2"),
+    ):
+        await con.execute(
+            f"""
+            INSERT INTO {table} (channel_id, {column}, message, sent_at)
+            SELECT
+                100000000 + i % 50,
+                {value},
+                'benchmark message',
+                CURRENT_TIMESTAMP - make_interval(secs => i)
+            FROM generate_series(1, $1) AS i;
+            """,
+            row_count,
+            chatter_count,
+        )
+    for table, column, value in (
+        ("watchtime_login", "username", "'benchmark_chatter_' || (1 + i % $2)"),
+        ("watchtime_key", "chatter_id", "1 + i % $2"),
+    ):
+        await con.execute(
+            f"""
+            INSERT INTO {table} (channel_id, {column}, online_time, total_time)
+            SELECT DISTINCT ON (1, 2) 100000000 + i % 50, {value}, i % 1000, i % 5000
+            FROM generate_series(1, $1) AS i;
+            """,
+            row_count,
+            chatter_count,
+        )
+
+
+async def relation_sizes(con, table: str) -> tuple[int, int, int]:
+    sizes = await con.fetchrow(
+        """
+        SELECT
+            pg_table_size($1::regclass) AS table_size,
+            pg_indexes_size($1::regclass) AS indexes_size,
+            pg_total_relation_size($1::regclass) AS total_size;
+        """,
+        table,
+    )
+    assert sizes is not None
+    return sizes["table_size"], sizes["indexes_size"], sizes["total_size"]
+
+
+# The tables are temporary and dropped when the transaction ends, so nothing is left behind
+async def chatter_key_size_benchmark(row_count: int, chatter_count: int):
+    con_pool = await database.init_pool(asyncio.get_event_loop(), localhost=True)
+    async with con_pool.acquire() as con:
+        async with con.transaction():
+            print(f"Seeding {row_count} rows per table from {chatter_count} chatters...")
+            await create_and_seed(con, row_count, chatter_count)
+
+            chatters_total = (await relation_sizes(con, "chatters_key"))[2]
+            print(f"chatters: total {format_size(chatters_total)}")
+            for table in ("messages", "watchtime"):
+                print(f"{table}:")
+                totals = {}
+                for kind in ("login", "key"):
+                    table_size, indexes_size, total_size = await relation_sizes(con, f"{table}_{kind}")
+                    totals[kind] = total_size
+                    print(
+                        f"  {kind:<5}  table {format_size(table_size)}"
+                        f"  indexes {format_size(indexes_size)}"
+                        f"  total {format_size(total_size)}"
+                    )
+                print(f"  saved {format_size(totals['login'] - totals['key'])}")
+    await con_pool.close()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    row_count = input("Number of rows to seed per table (default 1000000): ")
+    chatter_count = input("Number of distinct chatters (default 50000): ")
+    asyncio.run(
+        chatter_key_size_benchmark(
+            int(row_count) if row_count.strip() else 1_000_000,
+            int(chatter_count) if chatter_count.strip() else 50_000,
+        )
+    )
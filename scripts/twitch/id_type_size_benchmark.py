@@ -0,0 +1,116 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from dotenv import load_dotenv
+
+from shared import database
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1024 / 1024:10.2f} MB"
+
+
+# Twitch ids are currently 9 digits at most, so the seeded ids are made to be of that length
+async def create_and_seed(con, id_type: str, row_count: int) -> None:
+    await con.execute(
+        f"""
+        CREATE TEMPORARY TABLE messages_{id_type} (
+            id integer GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            channel_id {id_type} NOT NULL,
+            sender text NOT NULL,
+            message text NOT NULL,
+            sent_at timestamp with time zone NOT NULL
+        ) ON COMMIT DROP;
+        CREATE INDEX ON messages_{id_type} (channel_id, sender);
+
+        CREATE TEMPORARY TABLE reminders_{id_type} (
+            id integer GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            channel_id {id_type} NOT NULL,
+            sender_id {id_type} NOT NULL,
+            target_id {id_type} NOT NULL,
+            message text NOT NULL,
+            created_at timestamp with time zone NOT NULL
+        ) ON COMMIT DROP;
+        CREATE INDEX ON reminders_{id_type} (target_id, created_at);
+
+        CREATE TEMPORARY TABLE watchtime_{id_type} (
+            channel_id {id_type} NOT NULL,
+            username text NOT NULL,
+            online_time integer NOT NULL,
+            total_time integer NOT NULL,
+            PRIMARY KEY (channel_id, username)
+        ) ON COMMIT DROP;
+        """
+    )
+    await con.execute(
+        f"""
+        INSERT INTO messages_{id_type} (channel_id, sender, message, sent_at)
+        SELECT
+            (100000000 + i % 50)::{id_type},
+            'user' || (i % 5003),
+            'benchmark message',
+            CURRENT_TIMESTAMP - make_interval(secs => i)
+        FROM generate_series(1, $1) AS i;
+        """,
+        row_count,
+    )
+    await con.execute(
+        f"""
+        INSERT INTO reminders_{id_type} (channel_id, sender_id, target_id, message, created_at)
+        SELECT
+            (100000000 + i % 50)::{id_type},
+            (100000000 + i % 7919)::{id_type},
+            (100000000 + i % 5003)::{id_type},
+            'benchmark reminder',
+            CURRENT_TIMESTAMP - make_interval(mins => i)
+        FROM generate_series(1, $1) AS i;
+        """,
+        row_count,
+    )
+    await con.execute(
+        f"""
+        INSERT INTO watchtime_{id_type} (channel_id, username, online_time, total_time)
+        SELECT (100000000 + i % 50)::{id_type}, 'user' || i, i % 1000, i % 5000
+        FROM generate_series(1, $1) AS i;
+        """,
+        row_count,
+    )
+
+
+# The tables are temporary and dropped when the transaction ends, so nothing is left behind
+async def id_type_size_benchmark(row_count: int):
+    con_pool = await database.init_pool(asyncio.get_event_loop(), localhost=True)
+    async with con_pool.acquire() as con:
+        async with con.transaction():
+            print(f"Seeding {row_count} rows per table for both id types...")
+            for id_type in ("text", "bigint"):
+                await create_and_seed(con, id_type, row_count)
+
+            for table in ("messages", "reminders", "watchtime"):
+                print(f"{table}:")
+                for id_type in ("text", "bigint"):
+                    sizes = await con.fetchrow(
+                        """
+                        SELECT
+                            pg_table_size($1::regclass) AS table_size,
+                            pg_indexes_size($1::regclass) AS indexes_size,
+                            pg_total_relation_size($1::regclass) AS total_size;
+                        """,
+                        f"{table}_{id_type}",
+                    )
+                    assert sizes is not None
+                    print(
+                        f"  {id_type:<6}  table {format_size(sizes['table_size'])}"
+                        f"  indexes {format_size(sizes['indexes_size'])}"
+                        f"  total {format_size(sizes['total_size'])}"
+                    )
+    await con_pool.close()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    row_count = input("Number of rows to seed per table (default 1000000): ")
+    asyncio.run(id_type_size_benchmark(int(row_count) if row_count.strip() else 1_000_000))
@@ -0,0 +1,404 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, UTC
+import gzip
+import json
+import os
+import re
+import sys
+import time
+from typing import IO, Any, Iterator
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from asyncpg import Connection, Record
+from dotenv import load_dotenv
+
+from shared import database
+from shared.database.twitch import channels
+from shared.database.twitch.tokens import MAX_TOKEN_LENGTH
+
+
+CHUNK_LINES = 50_000
+CHUNKS_IN_FLIGHT = 8
+
+# @tags :login!login@login.tmi.twitch.tv PRIVMSG #channel :message, as saved by raw loggers and justlog
+RAW_IRC = re.compile(r"^(?:@(?P<tags>\S+) )?:(?P<login>[^!\s]+)!\S* PRIVMSG #(?P<channel>\S+) :(?P<message>.*)$")
+# [2024-01-31 12:34:56] #channel login: message, the text format of justlog
+TIMESTAMPED_TEXT = re.compile(
+    r"^\[(?P<time>\d{4}-\d{2}-\d{2} \d{1,2}:\d{2}:\d{2})\] #(?P<channel>\S+) (?P<login>[^\s:]+): (?P<message>.*)$"
+)
+# [12:34:56] login: message, the format of chatterino, which has the channel and the date in the file name
+CLIENT_TEXT = re.compile(r"^\[(?P<time>\d{1,2}:\d{2}:\d{2})\]\s+(?P<login>[^\s:]+): (?P<message>.*)$")
+# channel-2024-01-31.log
+CLIENT_FILE_NAME = re.compile(r"^(?P<channel>\w+)-(?P<date>\d{4}-\d{2}-\d{2})\.log(?:\.gz)?$")
+
+# A parsed message is (channel, user_id, login, message, sent_at, is_command)
+ParsedMessage = tuple[str, int | None, str, str, datetime, bool]
+
+
+def normalize(message: str) -> str:
+    """Cleans the message the same way the bot does before logging it"""
+    if message.startswith("\x01ACTION ") and message.endswith("\x01"):
+        message = message[8:-1]
+    return re.sub(r"\s+", " ", message.strip())
+
+
+def parse_irc_tags(tags: str) -> dict[str, str]:
+    parsed = {}
+    for tag in tags.split(";"):
+        key, _, value = tag.partition("=")
+        parsed[key] = value
+    return parsed
+
+
+def parse_line(line: str, default_channel: str | None, default_date: date | None) -> tuple[str, int | None, str, str, datetime] | None:
+    if line.startswith("{"):
+        try:
+            entry: dict[str, Any] = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        # justlog json has the tags of the raw message, other loggers mostly only the basic fields
+        tags = entry.get("tags") or {}
+        if entry.get("type", 1) != 1:
+            return None
+        channel = entry.get("channel") or default_channel
+        login = entry.get("username") or entry.get("sender") or entry.get("login")
+        message = entry.get("text") if "text" in entry else entry.get("message")
+        timestamp = entry.get("timestamp") or entry.get("sent_at")
+        if channel is None or login is None or message is None or timestamp is None:
+            return None
+        if isinstance(timestamp, str) and timestamp.isdigit():
+            timestamp = int(timestamp)
+        if isinstance(timestamp, (int, float)):
+            # Epoch timestamps too large to be in seconds are in milliseconds, like tmi-sent-ts
+            sent_at = datetime.fromtimestamp(timestamp / 1000 if timestamp > 100_000_000_000 else timestamp, UTC)
+        else:
+            sent_at = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        user_id = tags.get("user-id") or entry.get("user_id")
+        return (channel, int(user_id) if user_id else None, login, message, sent_at)
+
+    match = RAW_IRC.match(line)
+    if match is not None:
+        tags = parse_irc_tags(match["tags"] or "")
+        if "tmi-sent-ts" not in tags:
+            return None
+        sent_at = datetime.fromtimestamp(int(tags["tmi-sent-ts"]) / 1000, UTC)
+        user_id = tags.get("user-id")
+        return (match["channel"], int(user_id) if user_id else None, match["login"], match["message"], sent_at)
+
+    match = TIMESTAMPED_TEXT.match(line)
+    if match is not None:
+        sent_at = datetime.strptime(match["time"], "%Y-%m-%d %H:%M:%S")
+        return (match["channel"], None, match["login"], match["message"], sent_at)
+
+    match = CLIENT_TEXT.match(line)
+    if match is not None and default_channel is not None and default_date is not None:
+        sent_at = datetime.combine(default_date, datetime.strptime(match["time"], "%H:%M:%S").time())
+        return (default_channel, None, match["login"], match["message"], sent_at)
+    return None
+
+
+def parse_chunk(
+    lines: list[bytes],
+    default_channel: str | None,
+    default_date: date | None,
+    prefixes: dict[str, tuple[str, ...]],
+    global_prefixes: tuple[str, ...],
+) -> tuple[list[ParsedMessage], int]:
+    """Parses the lines in a worker process; returns the parsed messages and the number of lines that weren't messages"""
+    parsed = []
+    skipped = 0
+    for raw_line in lines:
+        line = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+        # A malformed line, e.g. with a field of an unexpected type, is skipped instead of stopping the import
+        try:
+            result = parse_line(line, default_channel, default_date)
+        except (ValueError, TypeError, AttributeError, OverflowError):
+            result = None
+        if result is None:
+            skipped += 1
+            continue
+        channel, user_id, login, message, sent_at = result
+        message = normalize(message)
+        if message == "":
+            skipped += 1
+            continue
+        # Times without a time zone are taken as UTC
+        if sent_at.tzinfo is None:
+            sent_at = sent_at.replace(tzinfo=UTC)
+        channel = channel.lower().lstrip("#")
+        is_command = message.startswith(prefixes.get(channel, global_prefixes))
+        parsed.append((channel, user_id, login.lower(), message, sent_at, is_command))
+    return (parsed, skipped)
+
+
+def open_log(path: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")  # type: ignore
+    return open(path, "rb")
+
+
+def read_chunks(path: str, offset: int) -> Iterator[tuple[list[bytes], int]]:
+    """Yields chunks of lines and the offset after each of them, starting from the given offset"""
+    with open_log(path) as file:
+        # Seeking a gzip file decompresses up to the offset, which is still much faster than importing again
+        file.seek(offset)
+        lines = []
+        for line in file:
+            lines.append(line)
+            offset += len(line)
+            if len(lines) >= CHUNK_LINES:
+                yield (lines, offset)
+                lines = []
+        if len(lines) > 0:
+            yield (lines, offset)
+
+
+def log_files(path: str) -> list[str]:
+    if os.path.isfile(path):
+        return [path]
+    files = []
+    for directory, _, file_names in os.walk(path):
+        files.extend(os.path.join(directory, file_name) for file_name in file_names)
+    return sorted(files)
+
+
+async def file_progress(con: Connection, path: str) -> tuple[int, bool]:
+    """Returns the offset reached in the log file by earlier imports and if the file was imported completely"""
+    result: Record | None = await con.fetchrow(
+        "SELECT bytes_read, finished FROM twitch.chat_log_imports WHERE path = $1;",
+        path,
+    )
+    if result is None:
+        return (0, False)
+    return (result["bytes_read"], result["finished"])
+
+
+async def finish_file(con: Connection, path: str) -> None:
+    await con.execute(
+        """
+        INSERT INTO twitch.chat_log_imports (path, bytes_read, finished)
+        VALUES ($1, 0, TRUE)
+        ON CONFLICT (path) DO UPDATE
+        SET finished = TRUE;
+        """,
+        path,
+    )
+
+
+async def logging_started(con: Connection, channel_id: int) -> datetime | None:
+    """
+    Returns the time of the oldest message the bot has logged in the channel; older messages are the ones to import.
+    It is saved on the first lookup, since the imported messages would move it back.
+    """
+    await con.execute(
+        """
+        INSERT INTO twitch.chat_log_import_channels (channel_id, logging_started)
+        SELECT $1, MIN(sent_at)
+        FROM twitch.messages
+        WHERE channel_id = $1
+        ON CONFLICT (channel_id) DO NOTHING;
+        """,
+        channel_id,
+    )
+    started: datetime | None = await con.fetchval(
+        "SELECT logging_started FROM twitch.chat_log_import_channels WHERE channel_id = $1;",
+        channel_id,
+    )
+    return started
+
+
+async def copy_batch(
+    con: Connection, rows: list[tuple[int, int | None, str, str, datetime, bool]], path: str, offset: int
+) -> None:
+    """Imports the rows and saves the offset after them in one transaction, so an interrupted import resumes there"""
+    async with con.transaction():
+        await con.execute(
+            """
+            INSERT INTO twitch.chat_log_imports (path, bytes_read)
+            VALUES ($1, $2)
+            ON CONFLICT (path) DO UPDATE
+            SET bytes_read = EXCLUDED.bytes_read;
+            """,
+            path,
+            offset,
+        )
+        if len(rows) == 0:
+            return
+        await con.copy_records_to_table(
+            "import_staging",
+            records=rows,
+            columns=("channel_id", "user_id", "login", "message", "sent_at", "is_command"),
+        )
+        # Months before the bot joined don't have partitions yet, and the default partition would block creating them later
+        await con.execute(
+            """
+            SELECT twitch.create_messages_partitions(MIN(sent_at), MAX(sent_at))
+            FROM import_staging;
+            """
+        )
+        # Logs don't always have ids, so those chatters are matched by login like in the watchtime
+        await con.execute(
+            """
+            INSERT INTO twitch.chatters (user_id, login)
+            SELECT DISTINCT ON (user_id) user_id, login
+            FROM import_staging
+            WHERE user_id IS NOT NULL
+            ORDER BY user_id, sent_at DESC
+            ON CONFLICT (user_id) DO NOTHING;
+
+            INSERT INTO twitch.chatters (login)
+            SELECT DISTINCT login
+            FROM import_staging
+            WHERE user_id IS NULL AND NOT EXISTS (SELECT 1 FROM twitch.chatters WHERE chatters.login = import_staging.login);
+
+            UPDATE import_staging
+            SET chatter_id = COALESCE(
+                (SELECT id FROM twitch.chatters WHERE chatters.user_id = import_staging.user_id),
+                (
+                    SELECT id
+                    FROM twitch.chatters
+                    WHERE chatters.login = import_staging.login
+                    ORDER BY user_id IS NULL, id DESC
+                    LIMIT 1
+                )
+            );
+            """
+        )
+        # A single insert fires the message count trigger once for the whole batch
+        await con.execute(
+            """
+            INSERT INTO twitch.messages (channel_id, chatter_id, message, sent_at, online, is_command, search_vector)
+            SELECT
+                import_staging.channel_id,
+                chatter_id,
+                message,
+                sent_at,
+                FALSE,
+                is_command,
+                to_tsvector(channel_config.search_config, message)
+            FROM import_staging
+            JOIN twitch.channel_config ON channel_config.channel_id = import_staging.channel_id;
+            """
+        )
+        # The token counts only backfill messages that existed when they were created, so the imported ones are added here
+        await con.execute(
+            """
+            INSERT INTO twitch.token_counts (channel_id, token, count, first_seen, last_seen)
+            SELECT channel_id, token, COUNT(*), MIN(sent_at), MAX(sent_at)
+            FROM import_staging
+            CROSS JOIN LATERAL regexp_split_to_table(replace(message, U&'\\+0E0000', ''), '\\s+') AS token
+            WHERE login <> $1 AND length(token) BETWEEN 1 AND $2
+            GROUP BY channel_id, token
+            ON CONFLICT (channel_id, token) DO UPDATE
+            SET
+                count = token_counts.count + EXCLUDED.count,
+                first_seen = LEAST(token_counts.first_seen, EXCLUDED.first_seen),
+                last_seen = GREATEST(token_counts.last_seen, EXCLUDED.last_seen);
+            """,
+            os.environ["BOT_NICK"],
+            MAX_TOKEN_LENGTH,
+        )
+
+
+async def import_chat_logs(path: str, default_channel: str | None, workers: int):
+    con_pool = await database.init_pool(asyncio.get_event_loop(), localhost=True)
+    channel_configs = await channels.channel_configs(con_pool)
+    channel_ids = {config.username: config.channel_id for config in channel_configs}
+    prefixes = {config.username: config.prefixes for config in channel_configs if len(config.prefixes) > 0}
+    global_prefixes = (os.environ["GLOBAL_PREFIX"],)
+
+    started_by_channel: dict[int, datetime | None] = {}
+    loop = asyncio.get_running_loop()
+    imported = 0
+    skipped = 0
+    started_at = time.monotonic()
+
+    async with con_pool.acquire() as con:
+        await con.execute(
+            """
+            CREATE TEMPORARY TABLE import_staging (
+                channel_id bigint NOT NULL,
+                user_id bigint,
+                login text NOT NULL,
+                message text NOT NULL,
+                sent_at timestamp with time zone NOT NULL,
+                is_command boolean NOT NULL,
+                chatter_id integer
+            ) ON COMMIT DELETE ROWS;
+            """
+        )
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for file_path in log_files(path):
+                progress_key = os.path.abspath(file_path)
+                start_offset, finished = await file_progress(con, progress_key)
+                if finished:
+                    continue
+                file_name_match = CLIENT_FILE_NAME.match(os.path.basename(file_path))
+                file_channel = file_name_match["channel"].lower() if file_name_match is not None else default_channel
+                file_date = date.fromisoformat(file_name_match["date"]) if file_name_match is not None else None
+                file_size = os.path.getsize(file_path)
+
+                # A few chunks are parsed ahead while the previous one is being copied, and they are committed in order
+                pending: deque[tuple[asyncio.Future, int]] = deque()
+                chunks = read_chunks(file_path, start_offset)
+                while True:
+                    for lines, offset in chunks:
+                        future = loop.run_in_executor(
+                            executor, parse_chunk, lines, file_channel, file_date, prefixes, global_prefixes
+                        )
+                        pending.append((future, offset))
+                        if len(pending) >= CHUNKS_IN_FLIGHT:
+                            break
+                    if len(pending) == 0:
+                        break
+
+                    future, offset = pending.popleft()
+                    parsed, skipped_lines = await future
+                    skipped += skipped_lines
+                    rows = []
+                    for channel, user_id, login, message, sent_at, is_command in parsed:
+                        channel_id = channel_ids.get(channel)
+                        if channel_id is None:
+                            skipped += 1
+                            continue
+                        # Anything the bot has logged itself is already in the database
+                        if channel_id not in started_by_channel:
+                            started_by_channel[channel_id] = await logging_started(con, channel_id)
+                        started = started_by_channel[channel_id]
+                        if started is not None and sent_at >= started:
+                            skipped += 1
+                            continue
+                        rows.append((channel_id, user_id, login, message, sent_at, is_command))
+                    await copy_batch(con, rows, progress_key, offset)
+                    imported += len(rows)
+
+                    elapsed = time.monotonic() - started_at
+                    # The offsets of gzipped files are in the decompressed data, so only the amount read can be shown
+                    if file_path.endswith(".gz"):
+                        position = f"{offset / 1024 / 1024:.0f} MB read"
+                    else:
+                        position = f"{min(offset / max(file_size, 1) * 100, 100):.1f}%"
+                    print(
+                        f"{os.path.basename(file_path)}: {position}"
+                        f" — {imported} imported, {skipped} skipped, {imported / max(elapsed, 1):.0f} messages/s"
+                    )
+                await finish_file(con, progress_key)
+    await con_pool.close()
+    print(f"Done: {imported} messages imported and {skipped} lines skipped")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    path = input("Path to the log file or a directory of log files: ").strip()
+    default_channel = input("Channel of the logs that don't name it (leave empty if they do): ").strip().lower()
+    workers = input(f"Number of parsing processes (default {os.cpu_count()}): ")
+    asyncio.run(
+        import_chat_logs(
+            path,
+            default_channel or None,
+            int(workers) if workers.strip() else os.cpu_count() or 1,
+        )
+    )
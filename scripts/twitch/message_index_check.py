@@ -0,0 +1,122 @@
+import asyncio
+from contextlib import asynccontextmanager
+import os
+import sys
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from asyncpg import Connection, Record
+from asyncpg.transaction import Transaction
+from dotenv import load_dotenv
+
+from query_plan import explain_analyze, uses_index
+from shared import database
+from shared.database.twitch import messages
+
+
+class RecordingConnection:
+    """
+    Runs the queries of the database functions on the seeding connection, inside its transaction,
+    and keeps them with their parameters so that their plans can be checked afterwards
+    """
+
+    def __init__(self, con: Connection) -> None:
+        self.con = con
+        self.queries: list[tuple[str, tuple]] = []
+
+    def transaction(self, **_: Any) -> Transaction:
+        # A nested transaction is a savepoint, which can't have its own access mode
+        return self.con.transaction()
+
+    async def fetch(self, query: str, *args: Any) -> list[Record]:
+        self.queries.append((query, args))
+        return await self.con.fetch(query, *args)
+
+    async def fetchrow(self, query: str, *args: Any) -> Record | None:
+        self.queries.append((query, args))
+        return await self.con.fetchrow(query, *args)
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        self.queries.append((query, args))
+        return await self.con.fetchval(query, *args)
+
+
+class RecordingPool:
+    """Hands out the recording connection in place of the connection pool the database functions take"""
+
+    def __init__(self, con: RecordingConnection) -> None:
+        self.con = con
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[RecordingConnection]:
+        yield self.con
+
+
+NO_FILTERS: dict[str, Any] = {
+    "included_words": [],
+    "excluded_words": [],
+    "min_word_count": None,
+    "max_word_count": None,
+}
+
+# The functions that run on every message or for commonly used commands, with the arguments they are called with
+HOT_FUNCTIONS: list[tuple[str, Callable[[Any], Awaitable[Any]]]] = [
+    ("last_seen", lambda pool: messages.last_seen(pool, 42, "user42")),
+    (
+        "number_of_messages (sender)",
+        lambda pool: messages.number_of_messages(pool, 42, "user42", **NO_FILTERS, online_only=True),
+    ),
+    ("number_of_messages (channel)", lambda pool: messages.number_of_messages(pool, 42, None, **NO_FILTERS)),
+    ("random_message (sender)", lambda pool: messages.random_message(pool, 42, "user42", **NO_FILTERS)),
+    ("random_message (channel)", lambda pool: messages.random_message(pool, 42, None, **NO_FILTERS)),
+    ("top_chatters", lambda pool: messages.top_chatters(pool, 42)),
+]
+
+
+# Everything is done inside a transaction that is rolled back at the end, so the seeded rows never become visible
+async def message_index_check(row_count: int) -> bool:
+    con_pool = await database.init_pool(asyncio.get_event_loop(), localhost=True)
+    all_use_index = True
+    async with con_pool.acquire() as con:
+        transaction = con.transaction()
+        await transaction.start()
+        try:
+            print(f"Seeding {row_count} messages...")
+            await con.execute("INSERT INTO twitch.chatters (login) SELECT 'user' || i FROM generate_series(0, 5002) AS i;")
+            await con.execute(
+                """
+                INSERT INTO twitch.messages (channel_id, chatter_id, message, sent_at, online)
+                SELECT
+                    i % 100,
+                    chatters.id,
+                    'benchmark message number ' || i,
+                    CURRENT_TIMESTAMP - make_interval(secs => i),
+                    i % 2 = 0
+                FROM generate_series(1, $1) AS i
+                JOIN twitch.chatters ON chatters.login = 'user' || (i % 5003);
+                """,
+                row_count,
+            )
+            await con.execute("ANALYZE twitch.messages;")
+
+            for name, function in HOT_FUNCTIONS:
+                recording = RecordingConnection(con)
+                await function(RecordingPool(recording))
+                # Every query the function ran is checked, as the path it takes depends on the data
+                for query, args in recording.queries:
+                    time, scans = await explain_analyze(con, query, *args)
+                    ok = uses_index(scans)
+                    all_use_index = all_use_index and ok
+                    print(f"{'OK  ' if ok else 'FAIL'} {name}: {time:.3f} ms ({', '.join(scans)})")
+        finally:
+            await transaction.rollback()
+    await con_pool.close()
+    return all_use_index
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    row_count = input("Number of messages to seed (default 1000000): ")
+    success = asyncio.run(message_index_check(int(row_count) if row_count.strip() else 1_000_000))
+    sys.exit(0 if success else 1)
@@ -0,0 +1,55 @@
+import json
+
+from asyncpg import Connection
+
+
+DISABLE_INDEXES = (
+    "SET LOCAL enable_indexscan = off;",
+    "SET LOCAL enable_indexonlyscan = off;",
+    "SET LOCAL enable_bitmapscan = off;",
+)
+
+ENABLE_INDEXES = (
+    "SET LOCAL enable_indexscan = on;",
+    "SET LOCAL enable_indexonlyscan = on;",
+    "SET LOCAL enable_bitmapscan = on;",
+)
+
+
+def scan_nodes(plan: dict) -> list[str]:
+    """Returns a description of every scan node in the plan tree, e.g. 'Index Scan using messages_pkey'"""
+    nodes = []
+    if "Relation Name" in plan or "Index Name" in plan:
+        if "Index Name" in plan:
+            nodes.append(f"{plan['Node Type']} using {plan['Index Name']}")
+        else:
+            nodes.append(f"{plan['Node Type']} on {plan['Relation Name']}")
+    for child in plan.get("Plans", []):
+        nodes.extend(scan_nodes(child))
+    return nodes
+
+
+async def explain_analyze(con: Connection, query: str, *args) -> tuple[float, list[str]]:
+    """Executes the query and returns its execution time in milliseconds and the scans it used"""
+    result: str = await con.fetchval(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", *args)
+    output = json.loads(result)[0]
+    return output["Execution Time"], scan_nodes(output["Plan"])
+
+
+async def compare_with_and_without_indexes(con: Connection, name: str, query: str, *args) -> None:
+    """Prints the execution time and scans of the query with the planner allowed and not allowed to use indexes"""
+    for setting in DISABLE_INDEXES:
+        await con.execute(setting)
+    no_index_time, no_index_scans = await explain_analyze(con, query, *args)
+
+    for setting in ENABLE_INDEXES:
+        await con.execute(setting)
+    index_time, index_scans = await explain_analyze(con, query, *args)
+
+    print(f"{name}:")
+    print(f"  without indexes {no_index_time:10.3f} ms  ({', '.join(no_index_scans)})")
+    print(f"  with indexes    {index_time:10.3f} ms  ({', '.join(index_scans)})")
+
+
+def uses_index(scans: list[str]) -> bool:
+    return any(" using " in scan for scan in scans)
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from dotenv import load_dotenv
+
+from shared import database
+from shared.database.twitch.messages import _message_filters, _random_message
+
+
+RUNS = 5
+
+# The argument combinations the rm command supports
+FILTER_COMBINATIONS: list[tuple[str, dict]] = [
+    ("rm all", {"sender": None}),
+    ("rm all (commands excluded)", {"sender": None, "exclude_commands": True}),
+    ("rm all >5", {"sender": None, "min_word_count": 5}),
+    ("rm all <3", {"sender": None, "max_word_count": 3}),
+    ("rm all -word", {"sender": None, "excluded_words": ["pog"]}),
+    ("rm all +word", {"sender": None, "included_words": ["pog"]}),
+    ("rm all ~text", {"sender": None, "substrings": ["great pl"]}),
+    ("rm all re:pattern", {"sender": None, "pattern": "gr[a-e]at"}),
+    ("rm <target>", {"sender": "user42"}),
+    ("rm <target> +word", {"sender": "user42", "included_words": ["pog"]}),
+    ("rm <target> >5", {"sender": "user42", "min_word_count": 5}),
+]
+
+
+async def median_time(coroutine_function) -> float:
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        await coroutine_function()
+        times.append((time.perf_counter() - start) * 1000)
+    return sorted(times)[len(times) // 2]
+
+
+# Everything is done inside a transaction that is rolled back at the end, so the seeded rows never become visible
+async def random_message_benchmark(row_count: int):
+    con_pool = await database.init_pool(asyncio.get_event_loop(), localhost=True)
+    async with con_pool.acquire() as con:
+        transaction = con.transaction()
+        await transaction.start()
+        try:
+            print(f"Seeding {row_count} messages...")
+            await con.execute("INSERT INTO twitch.chatters (login) SELECT 'user' || i FROM generate_series(0, 5002) AS i;")
+            await con.execute(
+                """
+                INSERT INTO twitch.messages (channel_id, chatter_id, message, sent_at, online, is_command, search_vector)
+                SELECT channel_id, chatter_id, message, sent_at, online, is_command, to_tsvector('english', message)
+                FROM (
+                    SELECT
+                        i % 20 AS channel_id,
+                        chatters.id AS chatter_id,
+                        CASE
+                            WHEN i % 50 = 0 THEN '!command argument'
+                            WHEN i % 7 = 0 THEN 'pog that was a great play'
+                            ELSE 'benchmark message number ' || i
+                        END AS message,
+                        CURRENT_TIMESTAMP - make_interval(secs => i) AS sent_at,
+                        i % 2 = 0 AS online,
+                        i % 50 = 0 AS is_command
+                    FROM generate_series(1, $1) AS i
+                    JOIN twitch.chatters ON chatters.login = 'user' || (i % 5003)
+                ) AS seeded;
+                """,
+                row_count,
+            )
+            # The text search configuration of the channel is used for the word filters
+            await con.execute("INSERT INTO twitch.channel_config (channel_id) VALUES (2) ON CONFLICT DO NOTHING;")
+            await con.execute("ANALYZE twitch.messages;")
+
+            for name, filters in FILTER_COMBINATIONS:
+                sender = filters["sender"]
+                included_words = filters.get("included_words", [])
+                conditions, params = _message_filters(
+                    2,
+                    sender,
+                    included_words=included_words,
+                    excluded_words=filters.get("excluded_words", []),
+                    substrings=filters.get("substrings", []),
+                    pattern=filters.get("pattern"),
+                    min_word_count=filters.get("min_word_count"),
+                    max_word_count=filters.get("max_word_count"),
+                    exclude_commands=filters.get("exclude_commands", False),
+                )
+                selective = (
+                    sender is not None
+                    or len(included_words) > 0
+                    or len(filters.get("substrings", [])) > 0
+                    or filters.get("pattern") is not None
+                )
+
+                sorted_time = await median_time(
+                    lambda: con.fetchrow(
+                        f"""
+                        SELECT channel_id, chatter_id, message, sent_at
+                        FROM twitch.messages
+                        WHERE {conditions}
+                        ORDER BY RANDOM() LIMIT 1;
+                        """,
+                        *params,
+                    )
+                )
+                sampled_time = await median_time(
+                    lambda: _random_message(con, conditions, params, selective=selective)
+                )
+                print(f"{name}:")
+                print(f"  ORDER BY RANDOM() {sorted_time:10.3f} ms")
+                print(f"  sampled           {sampled_time:10.3f} ms")
+        finally:
+            await transaction.rollback()
+    await con_pool.close()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    row_count = input("Number of messages to seed (default 10000000): ")
+    asyncio.run(random_message_benchmark(int(row_count) if row_count.strip() else 10_000_000))
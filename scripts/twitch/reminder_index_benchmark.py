@@ -0,0 +1,144 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from dotenv import load_dotenv
+
+from query_plan import compare_with_and_without_indexes
+from shared import database
+
+
+# Everything is done inside a transaction that is rolled back at the end, so the seeded rows never become visible
+async def reminder_index_benchmark(row_count: int):
+    con_pool = await database.init_pool(asyncio.get_event_loop(), localhost=True)
+    async with con_pool.acquire() as con:
+        transaction = con.transaction()
+        await transaction.start()
+        try:
+            print(f"Seeding {row_count} processed reminders and afks...")
+            await con.execute(
+                """
+                INSERT INTO twitch.reminders (channel_id, sender_id, target_id, message, created_at, scheduled_at, processed_at, sent)
+                SELECT
+                    i % 50,
+                    i % 7919,
+                    i % 5003,
+                    'benchmark reminder',
+                    CURRENT_TIMESTAMP - make_interval(mins => i),
+                    CASE WHEN i % 3 = 0 THEN CURRENT_TIMESTAMP - make_interval(mins => i) + INTERVAL '1 hour' END,
+                    CURRENT_TIMESTAMP - make_interval(mins => i) + INTERVAL '2 hours',
+                    TRUE
+                FROM generate_series(1, $1) AS i;
+                """,
+                row_count,
+            )
+            await con.execute(
+                """
+                INSERT INTO twitch.reminders (channel_id, sender_id, target_id, message, created_at, scheduled_at)
+                SELECT
+                    i % 50,
+                    i % 7919,
+                    i % 5003,
+                    'benchmark reminder',
+                    CURRENT_TIMESTAMP - INTERVAL '1 day',
+                    CASE WHEN i % 2 = 0 THEN CURRENT_TIMESTAMP + make_interval(mins => i) END
+                FROM generate_series(1, 200) AS i;
+                """
+            )
+            await con.execute(
+                """
+                INSERT INTO twitch.afks (channel_id, target_id, kind, created_at, processed_at)
+                SELECT
+                    i % 50,
+                    i % 5003,
+                    'AFK',
+                    CURRENT_TIMESTAMP - make_interval(mins => i),
+                    CURRENT_TIMESTAMP - make_interval(mins => i) + INTERVAL '30 minutes'
+                FROM generate_series(1, $1) AS i;
+                """,
+                row_count,
+            )
+            await con.execute("ANALYZE twitch.reminders;")
+            await con.execute("ANALYZE twitch.afks;")
+
+            await compare_with_and_without_indexes(
+                con,
+                "sendable_timed_reminders",
+                """
+                SELECT id, channel_id, sender_id, target_id, message, created_at, scheduled_at
+                FROM twitch.reminders
+                WHERE
+                    scheduled_at IS NOT NULL AND
+                    scheduled_at < CURRENT_TIMESTAMP AND
+                    processed_at IS NULL;
+                """,
+            )
+            await compare_with_and_without_indexes(
+                con,
+                "sendable_not_timed_reminders",
+                """
+                SELECT id, channel_id, sender_id, target_id, message, created_at, scheduled_at
+                FROM twitch.reminders
+                WHERE
+                    target_id = $1 AND
+                    created_at < CURRENT_TIMESTAMP - INTERVAL '5 seconds' AND
+                    scheduled_at IS NULL AND
+                    processed_at IS NULL;
+                """,
+                42,
+            )
+            await compare_with_and_without_indexes(
+                con,
+                "set_reminder (pending reminder count)",
+                """
+                SELECT COUNT(*)
+                FROM twitch.reminders
+                WHERE
+                    target_id = $1 AND
+                    scheduled_at IS NULL AND
+                    processed_at IS NULL;
+                """,
+                42,
+            )
+            await compare_with_and_without_indexes(
+                con,
+                "afk_status",
+                """
+                SELECT id, channel_id, target_id, kind, created_at
+                FROM twitch.afks
+                WHERE
+                    channel_id = $1 AND
+                    target_id = $2 AND
+                    created_at < CURRENT_TIMESTAMP - INTERVAL '5 seconds' AND
+                    processed_at IS NULL;
+                """,
+                42,
+                42,
+            )
+            await compare_with_and_without_indexes(
+                con,
+                "continue_afk (last processed afk)",
+                """
+                SELECT id
+                FROM twitch.afks
+                WHERE
+                    channel_id = $1 AND
+                    target_id = $2 AND
+                    processed_at > CURRENT_TIMESTAMP - INTERVAL '15 minutes'
+                ORDER BY processed_at DESC
+                LIMIT 1;
+                """,
+                42,
+                42,
+            )
+        finally:
+            await transaction.rollback()
+    await con_pool.close()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    row_count = input("Number of historical rows to seed (default 1000000): ")
+    asyncio.run(reminder_index_benchmark(int(row_count) if row_count.strip() else 1_000_000))
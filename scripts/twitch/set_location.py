@@ -11,7 +11,7 @@ from shared import database
 from shared.database.twitch import locations
 
 
-async def set_location(user_id: str, address: str):
+async def set_location(user_id: int, address: str):
     location = await google.geocode(address)
     if location is None:
         print("Location was not found")
@@ -30,6 +30,6 @@ async def set_location(user_id: str, address: str):
 
 if __name__ == "__main__":
     load_dotenv()
-    user_id = input("User id: ")
+    user_id = int(input("User id: "))
     address = input("Address: ")
     asyncio.run(set_location(user_id, address))
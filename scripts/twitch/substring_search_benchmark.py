@@ -0,0 +1,70 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from dotenv import load_dotenv
+
+from query_plan import compare_with_and_without_indexes
+from shared import database
+
+
+SEARCHES: list[tuple[str, str, str]] = [
+    ("word (tsvector)", "search_vector @@ to_tsquery('english', $2)", "pogchamp"),
+    ("word (trigram)", "message ILIKE $2", "%pogchamp%"),
+    ("word fragment (trigram)", "message ILIKE $2", "%ogcham%"),
+    ("url (trigram)", "message ILIKE $2", "%youtu.be/%"),
+    ("pattern (trigram)", "message ~* $2", "pog(champ|gers)"),
+]
+
+
+# Everything is done inside a transaction that is rolled back at the end, so the seeded rows never become visible
+async def substring_search_benchmark(row_count: int):
+    con_pool = await database.init_pool(asyncio.get_event_loop(), localhost=True)
+    async with con_pool.acquire() as con:
+        transaction = con.transaction()
+        await transaction.start()
+        try:
+            print(f"Seeding {row_count} messages...")
+            await con.execute("INSERT INTO twitch.chatters (login) SELECT 'user' || i FROM generate_series(0, 5002) AS i;")
+            await con.execute(
+                """
+                INSERT INTO twitch.messages (channel_id, chatter_id, message, sent_at, search_vector)
+                SELECT channel_id, chatter_id, message, sent_at, to_tsvector('english', message)
+                FROM (
+                    SELECT
+                        i % 20 AS channel_id,
+                        chatters.id AS chatter_id,
+                        CASE
+                            WHEN i % 997 = 0 THEN 'PogChamp what a play'
+                            WHEN i % 1009 = 0 THEN 'check this out youtu.be/' || md5(i::text)
+                            WHEN i % 1013 = 0 THEN 'Poggers'
+                            ELSE 'benchmark message ' || md5(i::text)
+                        END AS message,
+                        CURRENT_TIMESTAMP - make_interval(secs => i) AS sent_at
+                    FROM generate_series(1, $1) AS i
+                    JOIN twitch.chatters ON chatters.login = 'user' || (i % 5003)
+                ) AS seeded;
+                """,
+                row_count,
+            )
+            await con.execute("ANALYZE twitch.messages;")
+
+            for name, condition, search in SEARCHES:
+                await compare_with_and_without_indexes(
+                    con,
+                    name,
+                    f"SELECT COUNT(*) FROM twitch.messages WHERE channel_id = $1 AND {condition};",
+                    2,
+                    search,
+                )
+        finally:
+            await transaction.rollback()
+    await con_pool.close()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    row_count = input("Number of messages to seed (default 1000000): ")
+    asyncio.run(substring_search_benchmark(int(row_count) if row_count.strip() else 1_000_000))
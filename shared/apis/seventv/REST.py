@@ -44,7 +44,7 @@ async def emote_set_from_id(emote_set_id: str, *, force_cache: bool = False) ->
 
 @aiohttp_error_handler
 @async_cache(timedelta(hours=3))
-async def account_info(twitch_id: str, *, force_cache: bool = False) -> TwitchUser | None:
+async def account_info(twitch_id: int, *, force_cache: bool = False) -> TwitchUser | None:
     async with aiohttp.ClientSession(timeout=TIMEOUT) as session:
         url = f"{ENDPOINT}/users/twitch/{twitch_id}"
         async with session.get(url) as resp:
@@ -55,7 +55,7 @@ async def account_info(twitch_id: str, *, force_cache: bool = False) -> TwitchUs
             return TwitchUser(**response)
 
 
-async def emote_names(twitch_id: str, *, force_cache: bool = False, include_global: bool = False) -> list[str]:
+async def emote_names(twitch_id: int, *, force_cache: bool = False, include_global: bool = False) -> list[str]:
     user_info = await account_info(twitch_id, force_cache=force_cache)
     emotes = []
     if user_info is not None:
@@ -97,7 +97,7 @@ async def subage(seventv_user_id: str, *, force_cache: bool = False) -> Subage:
 
 
 async def best_fitting_emote(
-    channel_id: str,
+    channel_id: int,
     filter_func: Callable[[str], bool],
     *,
     default: str = "",
@@ -119,7 +119,7 @@ async def best_fitting_emote(
     return random.choice(filtered_emotes)
 
 
-async def happy_emote(channel_id: str, *, default: str = "peepoHappy", include_global: bool = False) -> str:
+async def happy_emote(channel_id: int, *, default: str = "peepoHappy", include_global: bool = False) -> str:
     emote = await best_fitting_emote(
         channel_id,
         lambda emote: (
@@ -132,7 +132,7 @@ async def happy_emote(channel_id: str, *, default: str = "peepoHappy", include_g
     return emote
 
 
-async def sad_emote(channel_id: str, *, default: str = "peepoSad", include_global: bool = False) -> str:
+async def sad_emote(channel_id: int, *, default: str = "peepoSad", include_global: bool = False) -> str:
     emote = await best_fitting_emote(
         channel_id,
         lambda emote: ("sad" in emote.lower() or "cry" in emote.lower()) and not "jam" in emote.lower(),
@@ -18,7 +18,7 @@ async def initial_channels(pool: Pool) -> list[str]:
 
 
 @asyncpg_error_handler
-async def initial_channel_ids(pool: Pool) -> set[str]:
+async def initial_channel_ids(pool: Pool) -> set[int]:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             results: list[Record] = await con.fetch(
@@ -49,7 +49,8 @@ async def channel_config(pool: Pool, channel: str) -> ChannelConfig:
                     outside_reminds,
                     disabled_commands,
                     banned_users,
-                    prefixes
+                    prefixes,
+                    search_config::text AS search_config
                 FROM twitch.joined_channels j JOIN twitch.channel_config c ON j.channel_id = c.channel_id
                 WHERE username = $1;
                 """,
@@ -60,7 +61,34 @@ async def channel_config(pool: Pool, channel: str) -> ChannelConfig:
 
 
 @asyncpg_error_handler
-async def channel_config_from_id(pool: Pool, channel_id: str) -> ChannelConfig:
+async def channel_configs(pool: Pool) -> list[ChannelConfig]:
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            results: list[Record] = await con.fetch(
+                """
+                SELECT 
+                    j.channel_id, 
+                    username,
+                    currently_online,
+                    joined_at,
+                    logging,
+                    emote_streaks,
+                    commands_online,
+                    reminds_online,
+                    notifications_online,
+                    outside_reminds,
+                    disabled_commands,
+                    banned_users,
+                    prefixes,
+                    search_config::text AS search_config
+                FROM twitch.joined_channels j JOIN twitch.channel_config c ON j.channel_id = c.channel_id;
+                """
+            )
+            return [ChannelConfig(**result) for result in results]
+
+
+@asyncpg_error_handler
+async def channel_config_from_id(pool: Pool, channel_id: int) -> ChannelConfig:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record | None = await con.fetchrow(
@@ -78,7 +106,8 @@ async def channel_config_from_id(pool: Pool, channel_id: str) -> ChannelConfig:
                     outside_reminds,
                     disabled_commands,
                     banned_users,
-                    prefixes
+                    prefixes,
+                    search_config::text AS search_config
                 FROM twitch.joined_channels j JOIN twitch.channel_config c ON j.channel_id = c.channel_id
                 WHERE j.channel_id = $1;
                 """,
@@ -89,10 +118,10 @@ async def channel_config_from_id(pool: Pool, channel_id: str) -> ChannelConfig:
 
 
 @asyncpg_error_handler
-async def channel_id(pool: Pool, channel: str) -> str:
+async def channel_id(pool: Pool, channel: str) -> int:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
-            result: str | None = await con.fetchval(
+            result: int | None = await con.fetchval(
                 """
                 SELECT channel_id
                 FROM twitch.joined_channels
@@ -105,7 +134,7 @@ async def channel_id(pool: Pool, channel: str) -> str:
 
 
 @asyncpg_error_handler
-async def join_channel(pool: Pool, channel_id: str, channel_name: str) -> None:
+async def join_channel(pool: Pool, channel_id: int, channel_name: str) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -130,7 +159,7 @@ async def join_channel(pool: Pool, channel_id: str, channel_name: str) -> None:
 
 
 @asyncpg_error_handler
-async def part_channel(pool: Pool, channel_id: str) -> bool:
+async def part_channel(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -144,7 +173,7 @@ async def part_channel(pool: Pool, channel_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def set_online(pool: Pool, channel_id: str) -> None:
+async def set_online(pool: Pool, channel_id: int) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -158,7 +187,7 @@ async def set_online(pool: Pool, channel_id: str) -> None:
 
 
 @asyncpg_error_handler
-async def set_offline(pool: Pool, channel_id: str) -> None:
+async def set_offline(pool: Pool, channel_id: int) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -172,7 +201,7 @@ async def set_offline(pool: Pool, channel_id: str) -> None:
 
 
 @asyncpg_error_handler
-async def enable_commands(pool: Pool, channel_id: str, commands: list[str]) -> None:
+async def enable_commands(pool: Pool, channel_id: int, commands: list[str]) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.executemany(
@@ -186,7 +215,7 @@ async def enable_commands(pool: Pool, channel_id: str, commands: list[str]) -> N
 
 
 @asyncpg_error_handler
-async def disable_commands(pool: Pool, channel_id: str, commands: list[str]) -> None:
+async def disable_commands(pool: Pool, channel_id: int, commands: list[str]) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.executemany(
@@ -200,7 +229,7 @@ async def disable_commands(pool: Pool, channel_id: str, commands: list[str]) ->
 
 
 @asyncpg_error_handler
-async def ban_in_channel(pool: Pool, channel_id: str, user_id: str) -> bool:
+async def ban_in_channel(pool: Pool, channel_id: int, user_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -216,7 +245,7 @@ async def ban_in_channel(pool: Pool, channel_id: str, user_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def unban_in_channel(pool: Pool, channel_id: str, user_id: str) -> bool:
+async def unban_in_channel(pool: Pool, channel_id: int, user_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -232,7 +261,7 @@ async def unban_in_channel(pool: Pool, channel_id: str, user_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def add_prefixes(pool: Pool, channel_id: str, prefixes: list[str]) -> None:
+async def add_prefixes(pool: Pool, channel_id: int, prefixes: list[str]) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.executemany(
@@ -246,7 +275,7 @@ async def add_prefixes(pool: Pool, channel_id: str, prefixes: list[str]) -> None
 
 
 @asyncpg_error_handler
-async def remove_prefixes(pool: Pool, channel_id: str, prefixes: list[str]) -> None:
+async def remove_prefixes(pool: Pool, channel_id: int, prefixes: list[str]) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.executemany(
@@ -260,7 +289,37 @@ async def remove_prefixes(pool: Pool, channel_id: str, prefixes: list[str]) -> N
 
 
 @asyncpg_error_handler
-async def logging_on(pool: Pool, channel_id: str) -> bool:
+async def text_search_configs(pool: Pool) -> list[str]:
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            results: list[Record] = await con.fetch(
+                """
+                SELECT cfgname
+                FROM pg_ts_config
+                ORDER BY cfgname;
+                """
+            )
+            return [result["cfgname"] for result in results]
+
+
+@asyncpg_error_handler
+async def set_search_config(pool: Pool, channel_id: int, search_config: str) -> bool:
+    async with pool.acquire() as con:
+        async with con.transaction():
+            result: str = await con.execute(
+                """
+                UPDATE twitch.channel_config
+                SET search_config = (SELECT oid FROM pg_ts_config WHERE cfgname = $2)::regconfig
+                WHERE channel_id = $1 AND EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = $2);
+                """,
+                channel_id,
+                search_config,
+            )
+            return int(result.split()[-1]) > 0
+
+
+@asyncpg_error_handler
+async def logging_on(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -275,7 +334,7 @@ async def logging_on(pool: Pool, channel_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def logging_off(pool: Pool, channel_id: str) -> bool:
+async def logging_off(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -290,7 +349,7 @@ async def logging_off(pool: Pool, channel_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def emote_streaks_on(pool: Pool, channel_id: str) -> bool:
+async def emote_streaks_on(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -305,7 +364,7 @@ async def emote_streaks_on(pool: Pool, channel_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def emote_streaks_off(pool: Pool, channel_id: str) -> bool:
+async def emote_streaks_off(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -320,7 +379,7 @@ async def emote_streaks_off(pool: Pool, channel_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def commands_online_on(pool: Pool, channel_id: str) -> bool:
+async def commands_online_on(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -335,7 +394,7 @@ async def commands_online_on(pool: Pool, channel_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def commands_online_off(pool: Pool, channel_id: str) -> bool:
+async def commands_online_off(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -350,7 +409,7 @@ async def commands_online_off(pool: Pool, channel_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def reminds_online_on(pool: Pool, channel_id: str) -> bool:
+async def reminds_online_on(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -365,7 +424,7 @@ async def reminds_online_on(pool: Pool, channel_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def reminds_online_off(pool: Pool, channel_id: str) -> bool:
+async def reminds_online_off(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -380,7 +439,7 @@ async def reminds_online_off(pool: Pool, channel_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def outside_reminds_on(pool: Pool, channel_id: str) -> bool:
+async def outside_reminds_on(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -395,7 +454,7 @@ async def outside_reminds_on(pool: Pool, channel_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def outside_reminds_off(pool: Pool, channel_id: str) -> bool:
+async def outside_reminds_off(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -409,7 +468,7 @@ async def outside_reminds_off(pool: Pool, channel_id: str) -> bool:
             return int(result.split()[-1]) > 0
 
 @asyncpg_error_handler
-async def notifications_online_on(pool: Pool, channel_id: str) -> bool:
+async def notifications_online_on(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -424,7 +483,7 @@ async def notifications_online_on(pool: Pool, channel_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def notifications_online_off(pool: Pool, channel_id: str) -> bool:
+async def notifications_online_off(pool: Pool, channel_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -5,7 +5,7 @@ from shared.database.exceptions import asyncpg_error_handler
 
 
 @asyncpg_error_handler
-async def list_counters(pool: Pool, channel_id: str) -> list[Counter]:
+async def list_counters(pool: Pool, channel_id: int) -> list[Counter]:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             results: list[Record] = await con.fetch(
@@ -20,7 +20,7 @@ async def list_counters(pool: Pool, channel_id: str) -> list[Counter]:
 
 
 @asyncpg_error_handler
-async def show_counter(pool: Pool, channel_id: str, name: str) -> Counter:
+async def show_counter(pool: Pool, channel_id: int, name: str) -> Counter:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record | None = await con.fetchrow(
@@ -38,7 +38,7 @@ async def show_counter(pool: Pool, channel_id: str, name: str) -> Counter:
 
 
 @asyncpg_error_handler
-async def change_counter(pool: Pool, channel_id: str, name: str, change: int) -> Counter:
+async def change_counter(pool: Pool, channel_id: int, name: str, change: int) -> Counter:
     async with pool.acquire() as con:
         async with con.transaction():
             result: Record = await con.fetchrow(
@@ -57,7 +57,7 @@ async def change_counter(pool: Pool, channel_id: str, name: str, change: int) ->
 
 
 @asyncpg_error_handler
-async def set_counter(pool: Pool, channel_id: str, name: str, value: int) -> None:
+async def set_counter(pool: Pool, channel_id: int, name: str, value: int) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -73,5 +73,5 @@ async def set_counter(pool: Pool, channel_id: str, name: str, value: int) -> Non
             )
 
 
-async def reset_counter(pool: Pool, channel_id: str, name: str) -> None:
+async def reset_counter(pool: Pool, channel_id: int, name: str) -> None:
     await set_counter(pool, channel_id, name, 0)
@@ -6,7 +6,7 @@ from shared.database.exceptions import asyncpg_error_handler
 
 
 @asyncpg_error_handler
-async def command_exists(pool: Pool, channel_id: str, cmd_name: str) -> bool:
+async def command_exists(pool: Pool, channel_id: int, cmd_name: str) -> bool:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: bool = await con.fetchval(
@@ -22,7 +22,7 @@ async def command_exists(pool: Pool, channel_id: str, cmd_name: str) -> bool:
 
 
 @asyncpg_error_handler
-async def list_custom_commands(pool: Pool, channel_id: str) -> list[CustomCommand]:
+async def list_custom_commands(pool: Pool, channel_id: int) -> list[CustomCommand]:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             results: list[Record] = await con.fetch(
@@ -37,7 +37,7 @@ async def list_custom_commands(pool: Pool, channel_id: str) -> list[CustomComman
 
 
 @asyncpg_error_handler
-async def show_custom_command(pool: Pool, channel_id: str, cmd_name: str) -> CustomCommand | None:
+async def show_custom_command(pool: Pool, channel_id: int, cmd_name: str) -> CustomCommand | None:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record | None = await con.fetchrow(
@@ -55,7 +55,7 @@ async def show_custom_command(pool: Pool, channel_id: str, cmd_name: str) -> Cus
 
 
 @asyncpg_error_handler
-async def add_custom_command(pool: Pool, channel_id: str, cmd_name: str, message: str) -> None:
+async def add_custom_command(pool: Pool, channel_id: int, cmd_name: str, message: str) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -70,7 +70,7 @@ async def add_custom_command(pool: Pool, channel_id: str, cmd_name: str, message
 
 
 @asyncpg_error_handler
-async def delete_custom_command(pool: Pool, channel_id: str, cmd_name: str) -> None:
+async def delete_custom_command(pool: Pool, channel_id: int, cmd_name: str) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -84,7 +84,7 @@ async def delete_custom_command(pool: Pool, channel_id: str, cmd_name: str) -> N
 
 
 @asyncpg_error_handler
-async def edit_custom_command(pool: Pool, channel_id: str, cmd_name: str, new_message: str) -> None:
+async def edit_custom_command(pool: Pool, channel_id: int, cmd_name: str, new_message: str) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -100,7 +100,7 @@ async def edit_custom_command(pool: Pool, channel_id: str, cmd_name: str, new_me
 
 
 @asyncpg_error_handler
-async def enable_custom_command(pool: Pool, channel_id: str, cmd_name: str) -> bool:
+async def enable_custom_command(pool: Pool, channel_id: int, cmd_name: str) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -118,7 +118,7 @@ async def enable_custom_command(pool: Pool, channel_id: str, cmd_name: str) -> b
 @asyncpg_error_handler
 async def set_permissions(
     pool: Pool,
-    channel_id: str,
+    channel_id: int,
     cmd_name: str,
     permission: Literal["BROADCASTER", "MOD", "VIP", "SUBSCRIBER", "FOLLOWER", "EVERYONE"],
 ) -> None:
@@ -137,7 +137,7 @@ async def set_permissions(
 
 
 @asyncpg_error_handler
-async def disable_custom_command(pool: Pool, channel_id: str, cmd_name: str) -> bool:
+async def disable_custom_command(pool: Pool, channel_id: int, cmd_name: str) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
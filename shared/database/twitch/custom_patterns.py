@@ -5,7 +5,7 @@ from shared.database.exceptions import asyncpg_error_handler
 
 
 @asyncpg_error_handler
-async def pattern_exists(pool: Pool, channel_id: str, name: str) -> bool:
+async def pattern_exists(pool: Pool, channel_id: int, name: str) -> bool:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record = await con.fetchrow(
@@ -21,7 +21,7 @@ async def pattern_exists(pool: Pool, channel_id: str, name: str) -> bool:
 
 
 @asyncpg_error_handler
-async def list_custom_patterns(pool: Pool, channel_id: str) -> list[CustomPattern]:
+async def list_custom_patterns(pool: Pool, channel_id: int) -> list[CustomPattern]:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             results: list[Record] = await con.fetch(
@@ -36,7 +36,7 @@ async def list_custom_patterns(pool: Pool, channel_id: str) -> list[CustomPatter
 
 
 @asyncpg_error_handler
-async def show_custom_pattern(pool: Pool, channel_id: str, name: str) -> CustomPattern:
+async def show_custom_pattern(pool: Pool, channel_id: int, name: str) -> CustomPattern:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record = await con.fetchrow(
@@ -53,7 +53,7 @@ async def show_custom_pattern(pool: Pool, channel_id: str, name: str) -> CustomP
 
 @asyncpg_error_handler
 async def add_custom_pattern(
-    pool: Pool, channel_id: str, name: str, pattern: str, message: str, probability: float = 1, regex: bool = False
+    pool: Pool, channel_id: int, name: str, pattern: str, message: str, probability: float = 1, regex: bool = False
 ) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
@@ -72,7 +72,7 @@ async def add_custom_pattern(
 
 
 @asyncpg_error_handler
-async def delete_custom_pattern(pool: Pool, channel_id: str, name: str) -> None:
+async def delete_custom_pattern(pool: Pool, channel_id: int, name: str) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -86,7 +86,7 @@ async def delete_custom_pattern(pool: Pool, channel_id: str, name: str) -> None:
 
 
 @asyncpg_error_handler
-async def enable_custom_pattern(pool: Pool, channel_id: str, name: str) -> None:
+async def enable_custom_pattern(pool: Pool, channel_id: int, name: str) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -101,7 +101,7 @@ async def enable_custom_pattern(pool: Pool, channel_id: str, name: str) -> None:
 
 
 @asyncpg_error_handler
-async def disable_custom_pattern(pool: Pool, channel_id: str, name: str) -> None:
+async def disable_custom_pattern(pool: Pool, channel_id: int, name: str) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
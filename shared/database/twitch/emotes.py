@@ -0,0 +1,58 @@
+from collections import Counter
+from datetime import date
+
+from asyncpg import Pool, Record
+
+from shared.database.exceptions import asyncpg_error_handler
+
+
+@asyncpg_error_handler
+async def add_emote_usage(pool: Pool, usage: dict[tuple[int, str, date], int]) -> None:
+    """Adds the counts of (channel_id, emote, day) to the emote usage"""
+    async with pool.acquire() as con:
+        async with con.transaction():
+            # Sorting the rows makes concurrent upserts lock them in the same order
+            await con.executemany(
+                """
+                INSERT INTO twitch.emote_usage (channel_id, emote, day, count)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (channel_id, emote, day)
+                DO UPDATE SET count = emote_usage.count + EXCLUDED.count;
+                """,
+                [(channel_id, emote, day, count) for (channel_id, emote, day), count in sorted(usage.items())],
+            )
+
+
+@asyncpg_error_handler
+async def emote_usage(pool: Pool, channel_id: int, emotes: list[str], since: date | None = None) -> Counter[str]:
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            results: list[Record] = await con.fetch(
+                """
+                SELECT emote, SUM(count) AS count
+                FROM twitch.emote_usage
+                WHERE channel_id = $1 AND emote = ANY($2::text[]) AND ($3::date IS NULL OR day >= $3)
+                GROUP BY emote;
+                """,
+                channel_id,
+                emotes,
+                since,
+            )
+            usage = Counter({emote: 0 for emote in emotes})
+            usage.update({result["emote"]: result["count"] for result in results})
+            return usage
+
+
+@asyncpg_error_handler
+async def emote_usage_tracked_since(pool: Pool, channel_id: int) -> date | None:
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            result: date | None = await con.fetchval(
+                """
+                SELECT MIN(day)
+                FROM twitch.emote_usage
+                WHERE channel_id = $1;
+                """,
+                channel_id,
+            )
+            return result
@@ -184,7 +184,7 @@ class FishingEquipmentCatalogue:
         return self._equipment
 
 
-async def fish(pool: Pool, user_id: str, fish_count: int, exp_amount: int) -> None:
+async def fish(pool: Pool, user_id: int, fish_count: int, exp_amount: int) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -203,7 +203,7 @@ async def fish(pool: Pool, user_id: str, fish_count: int, exp_amount: int) -> No
             )
 
 
-async def fisher(pool: Pool, user_id: str) -> Fisher:
+async def fisher(pool: Pool, user_id: int) -> Fisher:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record | None = await con.fetchrow(
@@ -232,7 +232,7 @@ async def top_exp(pool: Pool) -> list[Fisher]:
             return [Fisher(**result) for result in results]
 
 
-async def buy_fishing_equipment(pool: Pool, user_id: str, equipment_id: int, cost: int) -> None:
+async def buy_fishing_equipment(pool: Pool, user_id: int, equipment_id: int, cost: int) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -3,7 +3,7 @@ from asyncpg import Pool, Record
 from .models import Location
 
 
-async def set_location(pool: Pool, user_id: str, latitude: float, longitude: float, address: str) -> None:
+async def set_location(pool: Pool, user_id: int, latitude: float, longitude: float, address: str) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -23,7 +23,7 @@ async def set_location(pool: Pool, user_id: str, latitude: float, longitude: flo
             )
 
 
-async def user_location(pool: Pool, user_id: str) -> Location | None:
+async def user_location(pool: Pool, user_id: int) -> Location | None:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record | None = await con.fetchrow(
@@ -39,7 +39,7 @@ async def user_location(pool: Pool, user_id: str) -> Location | None:
             return Location(**result)
 
 
-async def delete(pool: Pool, user_id: str) -> bool:
+async def delete(pool: Pool, user_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -52,7 +52,7 @@ async def delete(pool: Pool, user_id: str) -> bool:
             return int(result.split()[-1]) > 0
 
 
-async def set_location_private(pool: Pool, user_id: str) -> bool:
+async def set_location_private(pool: Pool, user_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -66,7 +66,7 @@ async def set_location_private(pool: Pool, user_id: str) -> bool:
             return int(result.split()[-1]) > 0
 
 
-async def set_location_public(pool: Pool, user_id: str) -> bool:
+async def set_location_public(pool: Pool, user_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
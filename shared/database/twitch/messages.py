@@ -1,63 +1,232 @@
 from collections import Counter
+from datetime import datetime, UTC
 import os
+import random
+from typing import AsyncIterator
 
-from asyncpg import Pool, Record
+from asyncpg import Connection, Pool, Record
+from dateutil.relativedelta import relativedelta
 
-from .models import BlockedTerm, Message
+from .models import ArchivedMessage, BlockedTerm, LastSeen, Message
 from shared.database.exceptions import asyncpg_error_handler
 
 
+# Broad random message queries look at roughly this many of the channel's sampled rows before trying the next strategy
+RANDOM_SAMPLE_ROWS = 5_000
+RANDOM_PROBE_WINDOW = 10_000
+RANDOM_PROBE_ATTEMPTS = 3
+# Channels with at most this many messages are always picked from with the channel index
+RANDOM_INDEXED_MAX_ROWS = 50_000
+
+
+def _chatter_ids(param: int) -> str:
+    """Returns the ids of the chatters with the login in the parameter, which a renamed user can share with the new owner"""
+    return f"ARRAY(SELECT id FROM twitch.chatters WHERE login = ${param})"
+
+
+def _message_filters(
+    channel_id: int,
+    sender: str | None,
+    *,
+    included_words: list[str],
+    excluded_words: list[str],
+    substrings: list[str],
+    pattern: str | None,
+    min_word_count: int | None,
+    max_word_count: int | None,
+    exclude_commands: bool,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    online_only: bool = False,
+) -> tuple[str, list[str | int | datetime]]:
+    """Returns the where clause matching the filters of rm and nofm and its parameters"""
+    params: list[str | int | datetime] = [channel_id]
+    conditions = "channel_id = $1"
+
+    if sender is not None:
+        conditions += f" AND chatter_id = ANY({_chatter_ids(2)})"
+        params.append(sender)
+
+    if len(included_words) + len(excluded_words) > 0:
+        # The search vectors are made with the channel's text search configuration, so the query has to be too
+        conditions += (
+            " AND search_vector @@ to_tsquery("
+            "(SELECT search_config FROM twitch.channel_config WHERE channel_id = $1), "
+            f"${len(params)+1})"
+        )
+        search_query = " & ".join(
+            [word.lstrip("!") for word in included_words] + [f"!{word}" for word in excluded_words]
+        )
+        params.append(search_query)
+
+    # Substrings and patterns are matched with the trigram index instead of the search vectors
+    for substring in substrings:
+        conditions += f" AND message ILIKE ${len(params)+1}"
+        params.append("%" + substring.replace("\\", "\\\\").replace("%", r"\%").replace("_", r"\_") + "%")
+
+    if pattern is not None:
+        conditions += f" AND message ~* ${len(params)+1}"
+        params.append(pattern)
+
+    if min_word_count is not None:
+        conditions += f" AND word_count > ${len(params)+1}"
+        params.append(min_word_count)
+
+    if max_word_count is not None:
+        conditions += f" AND word_count < ${len(params)+1}"
+        params.append(max_word_count)
+
+    if exclude_commands:
+        conditions += " AND NOT is_command"
+
+    # Time ranges prune the monthly partitions and the block ranges within them with the BRIN index
+    if since is not None:
+        conditions += f" AND sent_at >= ${len(params)+1}"
+        params.append(since)
+
+    if until is not None:
+        conditions += f" AND sent_at < ${len(params)+1}"
+        params.append(until)
+
+    if online_only:
+        conditions += " AND online"
+
+    return conditions, params
+
+
+async def _sampled_random_message(
+    con: Connection, conditions: str, params: list[str | int | datetime], channel_rows: int
+) -> Record | None:
+    """Picks a random matching message from a random sample of the table's pages"""
+    # The sample is sized so that roughly the same number of the channel's messages end up in it for every channel
+    percentage = min(100.0, 100.0 * RANDOM_SAMPLE_ROWS / channel_rows)
+    return await con.fetchrow(
+        f"""
+        SELECT channel_id, chatters.login AS sender, message, sent_at
+        FROM (
+            SELECT channel_id, chatter_id, message, sent_at
+            FROM twitch.messages TABLESAMPLE SYSTEM (${len(params)+1})
+            WHERE {conditions}
+            ORDER BY RANDOM() LIMIT 1
+        ) AS picked
+        JOIN twitch.chatters ON chatters.id = picked.chatter_id;
+        """,
+        *params,
+        percentage,
+    )
+
+
+async def _probed_random_message(con: Connection, conditions: str, params: list[str | int | datetime]) -> Record | None:
+    """Picks a random matching message from a window of the channel's messages starting at a random id"""
+    # Imported logs get new ids for old messages, so the bounds come from the ids and not the times sent
+    bounds: Record | None = await con.fetchrow(
+        "SELECT MIN(id) AS min_id, MAX(id) AS max_id FROM twitch.messages WHERE channel_id = $1;",
+        params[0],
+    )
+    if bounds is None or bounds["min_id"] is None:
+        return None
+
+    for _ in range(RANDOM_PROBE_ATTEMPTS):
+        start_id = random.randint(bounds["min_id"], bounds["max_id"])
+        result: Record | None = await con.fetchrow(
+            f"""
+            SELECT channel_id, chatters.login AS sender, message, sent_at
+            FROM (
+                SELECT channel_id, chatter_id, message, sent_at
+                FROM (
+                    -- Every column the filters of _message_filters can refer to has to be selected here
+                    SELECT channel_id, chatter_id, message, sent_at, online, word_count, is_command, search_vector
+                    FROM twitch.messages
+                    WHERE channel_id = $1 AND id >= ${len(params)+1}
+                    ORDER BY id
+                    LIMIT {RANDOM_PROBE_WINDOW}
+                ) AS probe
+                WHERE {conditions}
+                ORDER BY RANDOM() LIMIT 1
+            ) AS picked
+            JOIN twitch.chatters ON chatters.id = picked.chatter_id;
+            """,
+            *params,
+            start_id,
+        )
+        if result is not None:
+            return result
+    return None
+
+
+async def _random_message(
+    con: Connection, conditions: str, params: list[str | int | datetime], *, selective: bool
+) -> Record | None:
+    result = None
+    # Sorting every matching row is only cheap when the filters use an index to narrow the rows down a lot,
+    # or when the channel has so few messages that its index narrows them down enough on its own
+    if not selective:
+        channel_rows: int = await con.fetchval(
+            "SELECT COALESCE(SUM(count), 0) FROM twitch.message_counts WHERE channel_id = $1;", params[0]
+        )
+        if channel_rows > RANDOM_INDEXED_MAX_ROWS:
+            result = await _sampled_random_message(con, conditions, params, channel_rows)
+            if result is None:
+                result = await _probed_random_message(con, conditions, params)
+    if result is None:
+        result = await con.fetchrow(
+            f"""
+            SELECT channel_id, chatters.login AS sender, message, sent_at
+            FROM (
+                SELECT channel_id, chatter_id, message, sent_at
+                FROM twitch.messages
+                WHERE {conditions}
+                ORDER BY RANDOM() LIMIT 1
+            ) AS picked
+            JOIN twitch.chatters ON chatters.id = picked.chatter_id;
+            """,
+            *params,
+        )
+    return result
+
+
 @asyncpg_error_handler
 async def random_message(
     pool: Pool,
-    channel_id: str,
+    channel_id: int,
     sender: str | None,
     *,
     included_words: list[str],
     excluded_words: list[str],
+    substrings: list[str] | None = None,
+    pattern: str | None = None,
     min_word_count: int | None,
     max_word_count: int | None,
     exclude_commands: bool = True,
-    prefixes: tuple[str, ...] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    online_only: bool = False,
 ) -> Message | None:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
-            params: list[str | int] = [channel_id]
-            query = """
-                SELECT channel_id, sender, message, sent_at 
-                FROM twitch.messages
-                WHERE channel_id = $1
-            """
-
-            if sender is None:
-                ...
-            else:
-                query += " AND sender = $2"
-                params.append(sender)
-
-            if len(included_words) + len(excluded_words) > 0:
-                query += f" AND to_tsvector('english', message) @@ to_tsquery('english', ${len(params)+1})"
-                search_query = " & ".join(
-                    [word.lstrip("!") for word in included_words] + [f"!{word}" for word in excluded_words]
-                )
-                params.append(search_query)
-
-            if min_word_count is not None:
-                query += f" AND ARRAY_LENGTH(STRING_TO_ARRAY(message, ' '), 1) > ${len(params)+1}"
-                params.append(min_word_count)
-
-            if max_word_count is not None:
-                query += f" AND ARRAY_LENGTH(STRING_TO_ARRAY(message, ' '), 1) < ${len(params)+1}"
-                params.append(max_word_count)
-
-            if exclude_commands and prefixes is not None and len(prefixes) > 0:
-                for prefix in prefixes:
-                    query += f" AND NOT message LIKE ${len(params)+1}"
-                    params.append(prefix.replace("%", r"\%") + "%")
-
-            query += " ORDER BY RANDOM() LIMIT 1;"
-
-            result: Record | None = await con.fetchrow(query, *params)
+            conditions, params = _message_filters(
+                channel_id,
+                sender,
+                included_words=included_words,
+                excluded_words=excluded_words,
+                substrings=substrings or [],
+                pattern=pattern,
+                min_word_count=min_word_count,
+                max_word_count=max_word_count,
+                exclude_commands=exclude_commands,
+                since=since,
+                until=until,
+                online_only=online_only,
+            )
+            selective = (
+                sender is not None
+                or len(included_words) > 0
+                or bool(substrings)
+                or pattern is not None
+                or since is not None
+                or until is not None
+            )
+            result = await _random_message(con, conditions, params, selective=selective)
             if result is None:
                 return None
             return Message(**result)
@@ -66,59 +235,117 @@ async def random_message(
 @asyncpg_error_handler
 async def number_of_messages(
     pool: Pool,
-    channel_id: str,
+    channel_id: int,
     sender: str | None,
     *,
     included_words: list[str],
     excluded_words: list[str],
+    substrings: list[str] | None = None,
+    pattern: str | None = None,
     min_word_count: int | None,
     max_word_count: int | None,
     exclude_commands: bool = False,
-    prefixes: tuple[str, ...] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    online_only: bool = False,
 ) -> int:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
-            params: list[str | int] = [channel_id]
-            query = "SELECT COUNT(*) FROM twitch.messages WHERE channel_id = $1"
-
-            if sender is not None:
-                query += " AND sender = $2"
-                params.append(sender)
-
-            if len(included_words) + len(excluded_words) > 0:
-                query += f" AND to_tsvector('english', message) @@ to_tsquery('english', ${len(params)+1})"
-                search_query = " & ".join(
-                    [word.lstrip("!") for word in included_words] + [f"!{word}" for word in excluded_words]
+            conditions, params = _message_filters(
+                channel_id,
+                sender,
+                included_words=included_words,
+                excluded_words=excluded_words,
+                substrings=substrings or [],
+                pattern=pattern,
+                min_word_count=min_word_count,
+                max_word_count=max_word_count,
+                exclude_commands=exclude_commands,
+                since=since,
+                until=until,
+                online_only=online_only,
+            )
+            filtered = (
+                len(included_words) + len(excluded_words) > 0
+                or bool(substrings)
+                or pattern is not None
+                or min_word_count is not None
+                or max_word_count is not None
+                or since is not None
+                or until is not None
+                or online_only
+            )
+            # Without filters the messages are already counted in message_counts by triggers
+            if not filtered:
+                count_conditions = (
+                    "channel_id = $1" if sender is None else f"channel_id = $1 AND chatter_id = ANY({_chatter_ids(2)})"
                 )
-                params.append(search_query)
-
-            if min_word_count is not None:
-                query += f" AND ARRAY_LENGTH(STRING_TO_ARRAY(message, ' '), 1) > ${len(params)+1}"
-                params.append(min_word_count)
-
-            if max_word_count is not None:
-                query += f" AND ARRAY_LENGTH(STRING_TO_ARRAY(message, ' '), 1) < ${len(params)+1}"
-                params.append(max_word_count)
-
-            if exclude_commands and prefixes is not None and len(prefixes) > 0:
-                for prefix in prefixes:
-                    query += f" AND NOT message LIKE ${len(params)+1}"
-                    params.append(prefix.replace("%", r"\%") + "%")
-
-            result: int = await con.fetchval(query, *params)
+                count_params = params[:1] if sender is None else params[:2]
+                result: int = await con.fetchval(
+                    f"SELECT COALESCE(SUM(count), 0) FROM twitch.message_counts WHERE {count_conditions};",
+                    *count_params,
+                )
+                if exclude_commands:
+                    # Commands are a small part of all messages, so counting them with their index is cheap
+                    result -= await con.fetchval(
+                        f"SELECT COUNT(*) FROM twitch.messages WHERE {count_conditions} AND is_command;",
+                        *count_params,
+                    )
+                return result
+
+            result = await con.fetchval(f"SELECT COUNT(*) FROM twitch.messages WHERE {conditions};", *params)
             return result
 
 
 @asyncpg_error_handler
-async def top_chatters(pool: Pool, channel_id: str) -> Counter[str]:
+async def top_chatters(
+    pool: Pool,
+    channel_id: int,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    online_only: bool = False,
+) -> Counter[str]:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
-            results: list[Record] = await con.fetch(
+            if since is not None or until is not None or online_only:
+                conditions, params = _message_filters(
+                    channel_id,
+                    None,
+                    included_words=[],
+                    excluded_words=[],
+                    substrings=[],
+                    pattern=None,
+                    min_word_count=None,
+                    max_word_count=None,
+                    exclude_commands=False,
+                    since=since,
+                    until=until,
+                    online_only=online_only,
+                )
+                results: list[Record] = await con.fetch(
+                    f"""
+                    SELECT chatters.login AS sender, SUM(counts.count) AS count
+                    FROM (
+                        SELECT chatter_id, COUNT(*) AS count
+                        FROM twitch.messages
+                        WHERE {conditions}
+                        GROUP BY chatter_id
+                    ) AS counts
+                    JOIN twitch.chatters ON chatters.id = counts.chatter_id
+                    GROUP BY chatters.login;
+                    """,
+                    *params,
+                )
+                return Counter({result["sender"]: result["count"] for result in results})
+
+            results = await con.fetch(
                 """
-                SELECT sender, COUNT(*) AS count
-                FROM twitch.messages
-                WHERE channel_id = $1
-                GROUP BY sender;
+                SELECT chatters.login AS sender, SUM(message_counts.count) AS count
+                FROM twitch.message_counts
+                JOIN twitch.chatters ON chatters.id = message_counts.chatter_id
+                WHERE message_counts.channel_id = $1
+                GROUP BY chatters.login;
                 """,
                 channel_id,
             )
@@ -126,51 +353,70 @@ async def top_chatters(pool: Pool, channel_id: str) -> Counter[str]:
 
 
 @asyncpg_error_handler
-async def emote_count(pool: Pool, channel_id: str, emote: str) -> int:
+async def emote_counts(pool: Pool, channel_id: int, emotes: list[str]) -> Counter[str]:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
-            result: int = await con.fetchval(
-                """
-                SELECT SUM((LENGTH(message) - LENGTH(REGEXP_REPLACE(message, '\\y' || $2 || '\\y', '', 'g'))) / LENGTH($2))
+            # The messages are split and counted in the database, so only one row per used emote is returned
+            results = await con.fetch(
+                f"""
+                SELECT word, COUNT(*) AS count
                 FROM twitch.messages
-                WHERE channel_id = $1 AND sender != $2;
+                CROSS JOIN LATERAL regexp_split_to_table(message, '\\s+') AS word
+                WHERE channel_id = $1 AND chatter_id <> ALL({_chatter_ids(2)}) AND word = ANY($3::text[])
+                GROUP BY word;
                 """,
                 channel_id,
-                emote,
                 os.environ["BOT_NICK"],
+                emotes,
             )
-            return result
+            emote_frequency = Counter({emote: 0 for emote in emotes})
+            emote_frequency.update({result["word"]: result["count"] for result in results})
+            return emote_frequency
 
 
-@asyncpg_error_handler
-async def emote_counts(pool: Pool, channel_id: str, emotes: list[str]) -> Counter[str]:
+async def user_messages(pool: Pool, channel_id: int, user_id: int, prefetch: int = 1_000) -> AsyncIterator[Record]:
+    """
+    Yields all messages of the user in the channel, oldest first, from a server-side cursor,
+    so that only the prefetched rows are in memory at a time
+    """
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
-            results = await con.fetch(
+            cursor = con.cursor(
                 """
-                SELECT message
+                SELECT chatters.login AS sender, messages.message, messages.sent_at
                 FROM twitch.messages
-                WHERE channel_id = $1 AND sender != $2;
+                JOIN twitch.chatters ON chatters.id = messages.chatter_id
+                WHERE
+                    messages.channel_id = $1 AND
+                    messages.chatter_id = ANY(ARRAY(SELECT id FROM twitch.chatters WHERE user_id = $2))
+                ORDER BY messages.sent_at;
                 """,
                 channel_id,
-                os.environ["BOT_NICK"],
+                user_id,
+                prefetch=prefetch,
             )
-            words = [word for sublist in [result["message"].split() for result in results] for word in sublist]
-            word_frequency = Counter(words)
-            emote_frequency = {emote: word_frequency[emote] if emote in word_frequency else 0 for emote in emotes}
-            return Counter(emote_frequency)
+            async for record in cursor:
+                yield record
 
 
 @asyncpg_error_handler
-async def last_seen(pool: Pool, channel_id: str, user: str) -> Message | None:
+async def last_seen(pool: Pool, channel_id: int, user: str) -> Message | None:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
+            # Every chatter with the login gets its own ordered index scan that stops at the first row
             result: Record | None = await con.fetchrow(
                 """
-                SELECT channel_id, sender, message, sent_at
-                FROM twitch.messages
-                WHERE channel_id = $1 AND sender = $2
-                ORDER BY sent_at DESC
+                SELECT last_message.channel_id, chatters.login AS sender, last_message.message, last_message.sent_at
+                FROM twitch.chatters
+                CROSS JOIN LATERAL (
+                    SELECT channel_id, message, sent_at
+                    FROM twitch.messages
+                    WHERE channel_id = $1 AND chatter_id = chatters.id
+                    ORDER BY sent_at DESC
+                    LIMIT 1
+                ) AS last_message
+                WHERE chatters.login = $2
+                ORDER BY last_message.sent_at DESC
                 LIMIT 1;
                 """,
                 channel_id,
@@ -182,24 +428,183 @@ async def last_seen(pool: Pool, channel_id: str, user: str) -> Message | None:
 
 
 @asyncpg_error_handler
-async def log_message(pool: Pool, channel_id: str, sender: str, message: str, channel_online: bool) -> None:
+async def global_last_seen(pool: Pool, user_id: int) -> LastSeen | None:
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            result: Record | None = await con.fetchrow(
+                """
+                SELECT last_seen.user_id, last_seen.channel_id, joined_channels.username AS channel, message, seen_at
+                FROM twitch.last_seen
+                LEFT JOIN twitch.joined_channels ON joined_channels.channel_id = last_seen.channel_id
+                WHERE user_id = $1;
+                """,
+                user_id,
+            )
+            if result is None:
+                return None
+            return LastSeen(**result)
+
+
+@asyncpg_error_handler
+async def set_last_seen(pool: Pool, seen: list[LastSeen]) -> None:
+    async with pool.acquire() as con:
+        async with con.transaction():
+            # An older entry never replaces a newer one, e.g. when two flushes overlap
+            await con.executemany(
+                """
+                INSERT INTO twitch.last_seen (user_id, channel_id, message, seen_at)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (user_id) DO UPDATE
+                SET channel_id = EXCLUDED.channel_id, message = EXCLUDED.message, seen_at = EXCLUDED.seen_at
+                WHERE last_seen.seen_at < EXCLUDED.seen_at;
+                """,
+                [
+                    (entry.user_id, entry.channel_id, entry.message, entry.seen_at)
+                    for entry in sorted(seen, key=lambda entry: entry.user_id)
+                ],
+            )
+
+
+@asyncpg_error_handler
+async def log_message(
+    pool: Pool,
+    channel_id: int,
+    sender_id: int,
+    sender: str,
+    message: str,
+    channel_online: bool,
+    is_command: bool,
+    search_config: str,
+) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
                 """
-                INSERT INTO twitch.messages (channel_id, sender, message, online)
-                VALUES ($1, $2, $3, $4);
+                INSERT INTO twitch.messages (channel_id, chatter_id, message, online, is_command, search_vector)
+                VALUES ($1, twitch.chatter_key($2, $3), $4, $5, $6, to_tsvector($7::regconfig, $4));
                 """,
                 channel_id,
+                sender_id,
                 sender,
                 message,
                 channel_online,
+                is_command,
+                search_config,
             )
 
 
+@asyncpg_error_handler
+async def create_partitions(pool: Pool, months_ahead: int) -> None:
+    async with pool.acquire() as con:
+        async with con.transaction():
+            await con.execute(
+                """
+                SELECT twitch.create_messages_partitions(CURRENT_TIMESTAMP, CURRENT_TIMESTAMP + make_interval(months => $1));
+                """,
+                months_ahead,
+            )
+
+
+@asyncpg_error_handler
+async def archivable_months(pool: Pool, before: datetime) -> list[datetime]:
+    """Returns the starts of the monthly partitions that end before the given time"""
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            results: list[Record] = await con.fetch(
+                """
+                SELECT pg_class.relname
+                FROM pg_class
+                JOIN pg_inherits ON pg_class.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = 'twitch.messages'::regclass AND pg_class.relname ~ '^messages_\\d{4}_\\d{2}$';
+                """
+            )
+            months = [datetime.strptime(result["relname"], "messages_%Y_%m").replace(tzinfo=UTC) for result in results]
+            return sorted(month for month in months if month + relativedelta(months=1) <= before)
+
+
+@asyncpg_error_handler
+async def logged_channel_ids(pool: Pool) -> list[int]:
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            results: list[Record] = await con.fetch(
+                """
+                SELECT DISTINCT channel_id
+                FROM twitch.message_counts;
+                """
+            )
+            return [result["channel_id"] for result in results]
+
+
+@asyncpg_error_handler
+async def messages_to_archive(
+    pool: Pool, channel_id: int, start: datetime, end: datetime, after_id: int, limit: int
+) -> list[ArchivedMessage]:
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            results: list[Record] = await con.fetch(
+                """
+                SELECT messages.id, channel_id, chatters.login AS sender, message, sent_at, online, is_command
+                FROM twitch.messages
+                JOIN twitch.chatters ON chatters.id = messages.chatter_id
+                WHERE channel_id = $1 AND sent_at >= $2 AND sent_at < $3 AND messages.id > $4
+                ORDER BY messages.id
+                LIMIT $5;
+                """,
+                channel_id,
+                start,
+                end,
+                after_id,
+                limit,
+            )
+            return [ArchivedMessage(**result) for result in results]
+
+
+@asyncpg_error_handler
+async def delete_archived_messages(
+    pool: Pool, channel_id: int, start: datetime, end: datetime, last_id: int, batch_size: int
+) -> int:
+    """Deletes the next batch of the oldest archived messages, up to the last archived id"""
+    async with pool.acquire() as con:
+        async with con.transaction():
+            result: str = await con.execute(
+                """
+                DELETE FROM twitch.messages
+                WHERE sent_at >= $2 AND sent_at < $3 AND (id, sent_at) IN (
+                    SELECT id, sent_at
+                    FROM twitch.messages
+                    WHERE channel_id = $1 AND sent_at >= $2 AND sent_at < $3 AND id <= $4
+                    ORDER BY id
+                    LIMIT $5
+                );
+                """,
+                channel_id,
+                start,
+                end,
+                last_id,
+                batch_size,
+            )
+            return int(result.split()[-1])
+
+
+@asyncpg_error_handler
+async def drop_partition_if_empty(pool: Pool, month: datetime) -> bool:
+    # The name only has digits from the date, so it is safe to put in the query
+    partition = f"twitch.messages_{month.strftime('%Y_%m')}"
+    async with pool.acquire() as con:
+        async with con.transaction():
+            if await con.fetchval("SELECT to_regclass($1);", partition) is None:
+                return False
+            # Locking first makes sure that nothing is inserted between checking and dropping
+            await con.execute(f"LOCK TABLE {partition} IN ACCESS EXCLUSIVE MODE;")
+            if await con.fetchval(f"SELECT EXISTS (SELECT 1 FROM {partition});"):
+                return False
+            await con.execute(f"DROP TABLE {partition};")
+            return True
+
+
 @asyncpg_error_handler
 async def log_command_usage(
-    pool: Pool, channel_id: str, user_id: str, command: str, message: str, use_time_ms: float
+    pool: Pool, channel_id: int, user_id: int, command: str, message: str, use_time_ms: float
 ) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
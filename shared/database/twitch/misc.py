@@ -24,7 +24,7 @@ async def random_fortune(pool: Pool) -> str | None:
 
 
 @asyncpg_error_handler
-async def last_iq(pool: Pool, user_id: str) -> LastIq | None:
+async def last_iq(pool: Pool, user_id: int) -> LastIq | None:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record | None = await con.fetchrow(
@@ -41,7 +41,7 @@ async def last_iq(pool: Pool, user_id: str) -> LastIq | None:
 
 
 @asyncpg_error_handler
-async def update_last_iq(pool: Pool, user_id: str, new_iq: int) -> None:
+async def update_last_iq(pool: Pool, user_id: int, new_iq: int) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -73,7 +73,7 @@ async def list_iqs(pool: Pool, top: bool = True) -> list[LastIq]:
 
 
 @asyncpg_error_handler
-async def rps(pool: Pool, user_id: str, outcome: Literal["win", "draw", "loss"]) -> RpsStats:
+async def rps(pool: Pool, user_id: int, outcome: Literal["win", "draw", "loss"]) -> RpsStats:
     async with pool.acquire() as con:
         async with con.transaction():
             match outcome:
@@ -114,7 +114,7 @@ async def rps(pool: Pool, user_id: str, outcome: Literal["win", "draw", "loss"])
 
 
 @asyncpg_error_handler
-async def fight(pool: Pool, user_id_1: str, user_id_2: str, winner_id: str) -> FightStats:
+async def fight(pool: Pool, user_id_1: int, user_id_2: int, winner_id: int) -> FightStats:
     async with pool.acquire() as con:
         async with con.transaction():
             users = sorted([user_id_1, user_id_2])
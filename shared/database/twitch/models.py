@@ -8,7 +8,7 @@ from shared.util.formatting import format_timedelta
 
 
 class ChannelConfig(BaseModel):
-    channel_id: str
+    channel_id: int
     username: str
     currently_online: bool
     joined_at: datetime
@@ -19,12 +19,13 @@ class ChannelConfig(BaseModel):
     notifications_online: bool
     outside_reminds: bool
     disabled_commands: set[str]
-    banned_users: set[str]
+    banned_users: set[int]
     prefixes: tuple[str, ...]
+    search_config: str
 
 
 class UserConfig(BaseModel):
-    user_id: str
+    user_id: int
     role: Literal["ADMIN", "DEFAULT", "RESTRICTED", "BANNED"] = "DEFAULT"
     no_replies: bool = False
     optouts: set[str] = Field(default_factory=set)
@@ -37,12 +38,19 @@ class UserConfig(BaseModel):
 
 
 class Watchtime(BaseModel):
-    channel_id: str
+    channel_id: int
     username: str
     total_time: int = 0
     online_time: int = 0
 
 
+class RetentionPolicy(BaseModel):
+    channel_id: int
+    target: Literal["MESSAGES", "COMMAND_USAGE", "AFKS", "REMINDERS"]
+    max_age: timedelta | None
+    max_rows: int | None
+
+
 class BlockedTerm(BaseModel):
     id: int
     pattern: str
@@ -51,9 +59,9 @@ class BlockedTerm(BaseModel):
 
 class Reminder(BaseModel):
     id: int
-    channel_id: str
-    sender_id: str
-    target_id: str
+    channel_id: int
+    sender_id: int
+    target_id: int
     message: str | None
     created_at: datetime
     scheduled_at: datetime | None
@@ -81,8 +89,8 @@ class Reminder(BaseModel):
 
 class AfkStatus(BaseModel):
     id: int
-    channel_id: str
-    target_id: str
+    channel_id: int
+    target_id: int
     kind: Literal["AFK", "GN", "WORK"]
     created_at: datetime
 
@@ -115,14 +123,42 @@ class AfkStatus(BaseModel):
 
 
 class Message(BaseModel):
-    channel_id: str
+    channel_id: int
     sender: str
     message: str
     sent_at: datetime
 
 
+class LastSeen(BaseModel):
+    user_id: int
+    channel_id: int
+    channel: str | None
+    message: str
+    seen_at: datetime
+
+
+class ArchivedMessage(BaseModel):
+    id: int
+    channel_id: int
+    sender: str
+    message: str
+    sent_at: datetime
+    online: bool | None
+    is_command: bool
+
+
+class TokenCount(BaseModel):
+    channel_id: int
+    token: str
+    count: int
+    first_seen: datetime
+    last_seen: datetime
+    # The most uses the count can be missing if the token was pruned before it was seen again
+    max_uncounted: int = 0
+
+
 class CustomCommand(BaseModel):
-    channel_id: str
+    channel_id: int
     name: str
     message: str
     level: Literal["BROADCASTER", "MOD", "VIP", "SUBSCRIBER", "FOLLOWER", "EVERYONE"]
@@ -130,7 +166,7 @@ class CustomCommand(BaseModel):
 
 
 class CustomPattern(BaseModel):
-    channel_id: str
+    channel_id: int
     name: str
     message: str
     pattern: str
@@ -140,13 +176,13 @@ class CustomPattern(BaseModel):
 
 
 class Counter(BaseModel):
-    channel_id: str
+    channel_id: int
     name: str
     value: int = 0
 
 
 class Timer(BaseModel):
-    channel_id: str
+    channel_id: int
     channel_name: str
     name: str
     message: str
@@ -157,19 +193,19 @@ class Timer(BaseModel):
 
 
 class LiveNotification(BaseModel):
-    channel_id: str
-    target_id: str
-    pings: set[str]
+    channel_id: int
+    target_id: int
+    pings: set[int]
 
 
 class YoutubeUploadNotification(BaseModel):
-    channel_id: str
+    channel_id: int
     playlist_id: str
-    pings: set[str]
+    pings: set[int]
 
 
 class Fisher(BaseModel):
-    user_id: str
+    user_id: int
     fish_count: int = 0
     exp: int = 0
     last_fished: datetime | None = None
@@ -197,25 +233,25 @@ class FishingEquipment(BaseModel):
 
 
 class LastIq(BaseModel):
-    user_id: str
+    user_id: int
     last_iq: int
     last_updated: datetime
 
 
 class RpsStats(BaseModel):
-    user_id: str
+    user_id: int
     wins: int
     draws: int
     losses: int
 
 
 class FightStats(BaseModel):
-    user_id_1: str
-    user_id_2: str
+    user_id_1: int
+    user_id_2: int
     user_1_wins: int
     user_2_wins: int
 
-    def user_stats(self, user_id: str) -> tuple[int, int]:
+    def user_stats(self, user_id: int) -> tuple[int, int]:
         """Returns the wins and losses of the given user as a tuple"""
         if self.user_id_1 == user_id:
             return (self.user_1_wins, self.user_2_wins)
@@ -226,7 +262,7 @@ class FightStats(BaseModel):
 
 
 class Location(BaseModel):
-    user_id: str
+    user_id: int
     latitude: float
     longitude: float
     address: str
@@ -5,7 +5,7 @@ from shared.database.exceptions import asyncpg_error_handler
 
 
 @asyncpg_error_handler
-async def twitch_notifications(pool: Pool) -> set[str]:
+async def twitch_notifications(pool: Pool) -> set[int]:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             results: list[Record] = await con.fetch(
@@ -18,7 +18,7 @@ async def twitch_notifications(pool: Pool) -> set[str]:
 
 
 @asyncpg_error_handler
-async def twitch_notifications_to_target(pool: Pool, target_id: str) -> list[LiveNotification]:
+async def twitch_notifications_to_target(pool: Pool, target_id: int) -> list[LiveNotification]:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             results: list[Record] = await con.fetch(
@@ -33,7 +33,7 @@ async def twitch_notifications_to_target(pool: Pool, target_id: str) -> list[Liv
 
 
 @asyncpg_error_handler
-async def sub_to_twitch_notifications(pool: Pool, channel_id: str, target_id: str) -> bool:
+async def sub_to_twitch_notifications(pool: Pool, channel_id: int, target_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -50,7 +50,7 @@ async def sub_to_twitch_notifications(pool: Pool, channel_id: str, target_id: st
 
 
 @asyncpg_error_handler
-async def unsub_to_twitch_notifications(pool: Pool, channel_id: str, target_id: str) -> bool:
+async def unsub_to_twitch_notifications(pool: Pool, channel_id: int, target_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -65,7 +65,7 @@ async def unsub_to_twitch_notifications(pool: Pool, channel_id: str, target_id:
 
 
 @asyncpg_error_handler
-async def ping(pool: Pool, user_id: str, channel_id: str, target_id: str) -> bool:
+async def ping(pool: Pool, user_id: int, channel_id: int, target_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -82,7 +82,7 @@ async def ping(pool: Pool, user_id: str, channel_id: str, target_id: str) -> boo
 
 
 @asyncpg_error_handler
-async def unping(pool: Pool, user_id: str, channel_id: str, target_id: str) -> bool:
+async def unping(pool: Pool, user_id: int, channel_id: int, target_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -112,7 +112,7 @@ async def youtube_notifications(pool: Pool) -> list[YoutubeUploadNotification]:
 
 
 @asyncpg_error_handler
-async def sub_to_youtube_notifications(pool: Pool, channel_id: str, playlist_id: str) -> bool:
+async def sub_to_youtube_notifications(pool: Pool, channel_id: int, playlist_id: str) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -129,7 +129,7 @@ async def sub_to_youtube_notifications(pool: Pool, channel_id: str, playlist_id:
 
 
 @asyncpg_error_handler
-async def unsub_to_youtube_notifications(pool: Pool, channel_id: str, playlist_id: str) -> bool:
+async def unsub_to_youtube_notifications(pool: Pool, channel_id: int, playlist_id: str) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -144,7 +144,7 @@ async def unsub_to_youtube_notifications(pool: Pool, channel_id: str, playlist_i
 
 
 @asyncpg_error_handler
-async def ytping(pool: Pool, user_id: str, channel_id: str, playlist_id: str) -> bool:
+async def ytping(pool: Pool, user_id: int, channel_id: int, playlist_id: str) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -161,7 +161,7 @@ async def ytping(pool: Pool, user_id: str, channel_id: str, playlist_id: str) ->
 
 
 @asyncpg_error_handler
-async def ytunping(pool: Pool, user_id: str, channel_id: str, playlist_id: str) -> bool:
+async def ytunping(pool: Pool, user_id: int, channel_id: int, playlist_id: str) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -10,9 +10,9 @@ from shared.database.exceptions import asyncpg_error_handler
 @asyncpg_error_handler
 async def set_reminder(
     pool: Pool,
-    channel_id: str,
-    sender_id: str,
-    target_id: str,
+    channel_id: int,
+    sender_id: int,
+    target_id: int,
     message: str | None,
     scheduled_at: datetime | None,
     delete_after: bool = False,
@@ -75,7 +75,7 @@ async def cancel_reminder(pool: Pool, reminder_id: int) -> bool:
 
 
 @asyncpg_error_handler
-async def cancel_reminder_check_sender(pool: Pool, reminder_id: int, sender_id: str) -> bool:
+async def cancel_reminder_check_sender(pool: Pool, reminder_id: int, sender_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -91,7 +91,7 @@ async def cancel_reminder_check_sender(pool: Pool, reminder_id: int, sender_id:
 
 
 # @asyncpg_error_handler
-# async def cancel_all_reminders_by(pool: Pool, sender_id: str) -> int:
+# async def cancel_all_reminders_by(pool: Pool, sender_id: int) -> int:
 #     async with pool.acquire() as con:
 #         async with con.transaction():
 #             result: str = await con.execute(
@@ -106,7 +106,7 @@ async def cancel_reminder_check_sender(pool: Pool, reminder_id: int, sender_id:
 
 
 # @asyncpg_error_handler
-# async def cancel_all_reminders_to(pool: Pool, target_id: str) -> int:
+# async def cancel_all_reminders_to(pool: Pool, target_id: int) -> int:
 #     async with pool.acquire() as con:
 #         async with con.transaction():
 #             result: str = await con.execute(
@@ -149,6 +149,21 @@ async def set_reminder_as_sent(pool: Pool, reminder_id: int) -> bool:
             return int(result.split()[-1]) > 0
 
 
+@asyncpg_error_handler
+async def set_reminders_as_sent(pool: Pool, reminder_ids: list[int]) -> int:
+    async with pool.acquire() as con:
+        async with con.transaction():
+            result: str = await con.execute(
+                """
+                UPDATE twitch.reminders
+                SET sent = TRUE, processed_at = CURRENT_TIMESTAMP
+                WHERE id = ANY($1) AND processed_at IS NULL;
+                """,
+                reminder_ids,
+            )
+            return int(result.split()[-1])
+
+
 @asyncpg_error_handler
 async def sendable_timed_reminders(pool: Pool) -> list[Reminder]:
     async with pool.acquire() as con:
@@ -174,7 +189,7 @@ async def sendable_timed_reminders(pool: Pool) -> list[Reminder]:
 
 
 @asyncpg_error_handler
-async def sendable_not_timed_reminders(pool: Pool, target_id: str) -> list[Reminder]:
+async def sendable_not_timed_reminders(pool: Pool, target_id: int) -> list[Reminder]:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             results: list[Record] = await con.fetch(
@@ -200,7 +215,7 @@ async def sendable_not_timed_reminders(pool: Pool, target_id: str) -> list[Remin
 
 
 @asyncpg_error_handler
-async def set_afk(pool: Pool, channel_id: str, target_id: str, afk_type: Literal["AFK", "GN", "WORK"]) -> None:
+async def set_afk(pool: Pool, channel_id: int, target_id: int, afk_type: Literal["AFK", "GN", "WORK"]) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -223,7 +238,7 @@ async def set_afk(pool: Pool, channel_id: str, target_id: str, afk_type: Literal
 
 
 @asyncpg_error_handler
-async def afk_status(pool: Pool, channel_id: str, target_id: str) -> AfkStatus | None:
+async def afk_status(pool: Pool, channel_id: int, target_id: int) -> AfkStatus | None:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record | None = await con.fetchrow(
@@ -265,7 +280,7 @@ async def set_afk_as_sent(pool: Pool, afk_id: int) -> bool:
 
 
 @asyncpg_error_handler
-async def continue_afk(pool: Pool, channel_id: str, target_id: str) -> bool:
+async def continue_afk(pool: Pool, channel_id: int, target_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
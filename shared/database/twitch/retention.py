@@ -0,0 +1,181 @@
+from datetime import datetime, timedelta
+
+from asyncpg import Pool, Record
+
+from .models import RetentionPolicy
+from shared.database.exceptions import asyncpg_error_handler
+
+
+# The table, the time its rows are aged by and the key columns the rows are deleted by for each retention target
+RETENTION_TABLES: dict[str, tuple[str, str, str]] = {
+    "MESSAGES": ("twitch.messages", "sent_at", "id, sent_at"),
+    "COMMAND_USAGE": ("twitch.command_usage_log", "used_at", "id"),
+    "AFKS": ("twitch.afks", "processed_at", "id"),
+    "REMINDERS": ("twitch.reminders", "processed_at", "id"),
+}
+
+
+@asyncpg_error_handler
+async def retention_policies(pool: Pool, channel_id: int | None = None) -> list[RetentionPolicy]:
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            results: list[Record] = await con.fetch(
+                """
+                SELECT channel_id, target::text AS target, max_age, max_rows
+                FROM twitch.retention_policies
+                WHERE $1::bigint IS NULL OR channel_id = $1;
+                """,
+                channel_id,
+            )
+            return [RetentionPolicy(**result) for result in results]
+
+
+@asyncpg_error_handler
+async def set_retention_policy(
+    pool: Pool, channel_id: int, target: str, max_age: timedelta | None, max_rows: int | None
+) -> None:
+    async with pool.acquire() as con:
+        async with con.transaction():
+            await con.execute(
+                """
+                INSERT INTO twitch.retention_policies (channel_id, target, max_age, max_rows)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (channel_id, target)
+                DO UPDATE SET max_age = EXCLUDED.max_age, max_rows = EXCLUDED.max_rows;
+                """,
+                channel_id,
+                target,
+                max_age,
+                max_rows,
+            )
+
+
+@asyncpg_error_handler
+async def remove_retention_policy(pool: Pool, channel_id: int, target: str) -> bool:
+    async with pool.acquire() as con:
+        async with con.transaction():
+            result: str = await con.execute(
+                """
+                DELETE FROM twitch.retention_policies
+                WHERE channel_id = $1 AND target = $2;
+                """,
+                channel_id,
+                target,
+            )
+            return int(result.split()[-1]) > 0
+
+
+@asyncpg_error_handler
+async def retention_cutoff(pool: Pool, policy: RetentionPolicy) -> datetime | None:
+    """Returns the time before which the rows of the policy's channel and table are to be deleted"""
+    table, time_column, _ = RETENTION_TABLES[policy.target]
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            cutoffs: list[datetime] = []
+            if policy.max_age is not None:
+                cutoffs.append(await con.fetchval("SELECT CURRENT_TIMESTAMP - $1::interval;", policy.max_age))
+            if policy.max_rows is not None:
+                # Rows sent at the same time as the last kept one are kept as well
+                oldest_kept: datetime | None = await con.fetchval(
+                    f"""
+                    SELECT {time_column}
+                    FROM {table}
+                    WHERE channel_id = $1 AND {time_column} IS NOT NULL
+                    ORDER BY {time_column} DESC
+                    OFFSET $2 LIMIT 1;
+                    """,
+                    policy.channel_id,
+                    policy.max_rows - 1,
+                )
+                if oldest_kept is not None:
+                    cutoffs.append(oldest_kept)
+            if len(cutoffs) == 0:
+                return None
+            return max(cutoffs)
+
+
+@asyncpg_error_handler
+async def purge_batch(pool: Pool, target: str, channel_id: int, cutoff: datetime, batch_size: int) -> int:
+    table, time_column, key = RETENTION_TABLES[target]
+    async with pool.acquire() as con:
+        async with con.transaction():
+            result: str = await con.execute(
+                f"""
+                DELETE FROM {table}
+                WHERE ({key}) IN (
+                    SELECT {key}
+                    FROM {table}
+                    WHERE channel_id = $1 AND {time_column} < $2
+                    LIMIT $3
+                );
+                """,
+                channel_id,
+                cutoff,
+                batch_size,
+            )
+            return int(result.split()[-1])
+
+
+@asyncpg_error_handler
+async def delete_last_seen(pool: Pool, channel_id: int, cutoff: datetime) -> int:
+    """Deletes the last seen messages of the channel that its messages retention policy has purged"""
+    async with pool.acquire() as con:
+        async with con.transaction():
+            result: str = await con.execute(
+                """
+                DELETE FROM twitch.last_seen
+                WHERE channel_id = $1 AND seen_at < $2;
+                """,
+                channel_id,
+                cutoff,
+            )
+            return int(result.split()[-1])
+
+
+@asyncpg_error_handler
+async def log_retention_run(
+    pool: Pool, channel_id: int, target: str, purged_rows: int, batches: int, duration_ms: float
+) -> None:
+    async with pool.acquire() as con:
+        async with con.transaction():
+            await con.execute(
+                """
+                INSERT INTO twitch.retention_runs (channel_id, target, purged_rows, batches, duration_ms)
+                VALUES ($1, $2, $3, $4, $5);
+                """,
+                channel_id,
+                target,
+                purged_rows,
+                batches,
+                duration_ms,
+            )
+
+
+@asyncpg_error_handler
+async def purged_rows(pool: Pool, channel_id: int, since: datetime) -> dict[str, int]:
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            results: list[Record] = await con.fetch(
+                """
+                SELECT target::text AS target, SUM(purged_rows) AS purged_rows
+                FROM twitch.retention_runs
+                WHERE channel_id = $1 AND ran_at >= $2
+                GROUP BY target;
+                """,
+                channel_id,
+                since,
+            )
+            return {result["target"]: result["purged_rows"] for result in results}
+
+
+@asyncpg_error_handler
+async def delete_retention_runs(pool: Pool, older_than: timedelta) -> None:
+    async with pool.acquire() as con:
+        async with con.transaction():
+            await con.execute(
+                """
+                DELETE FROM twitch.retention_runs
+                WHERE ran_at < CURRENT_TIMESTAMP - $1::interval;
+                """,
+                older_than,
+            )
@@ -30,7 +30,7 @@ async def sendable_timers(pool: Pool) -> list[Timer]:
 
 
 @asyncpg_error_handler
-async def timer_exists(pool: Pool, channel_id: str, cmd_name: str) -> bool:
+async def timer_exists(pool: Pool, channel_id: int, cmd_name: str) -> bool:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: bool = await con.fetchval(
@@ -46,7 +46,7 @@ async def timer_exists(pool: Pool, channel_id: str, cmd_name: str) -> bool:
 
 
 @asyncpg_error_handler
-async def list_timers(pool: Pool, channel_id: str) -> list[Timer]:
+async def list_timers(pool: Pool, channel_id: int) -> list[Timer]:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             results: list[Record] = await con.fetch(
@@ -61,7 +61,7 @@ async def list_timers(pool: Pool, channel_id: str) -> list[Timer]:
 
 
 @asyncpg_error_handler
-async def show_timer(pool: Pool, channel_id: str, timer_name: str) -> Timer | None:
+async def show_timer(pool: Pool, channel_id: int, timer_name: str) -> Timer | None:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record | None = await con.fetchrow(
@@ -80,7 +80,7 @@ async def show_timer(pool: Pool, channel_id: str, timer_name: str) -> Timer | No
 
 @asyncpg_error_handler
 async def add_timer(
-    pool: Pool, channel_id: str, timer_name: str, message: str, first_time: datetime, time_between: timedelta
+    pool: Pool, channel_id: int, timer_name: str, message: str, first_time: datetime, time_between: timedelta
 ) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
@@ -98,7 +98,7 @@ async def add_timer(
 
 
 @asyncpg_error_handler
-async def delete_timer(pool: Pool, channel_id: str, timer_name: str) -> None:
+async def delete_timer(pool: Pool, channel_id: int, timer_name: str) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -113,7 +113,7 @@ async def delete_timer(pool: Pool, channel_id: str, timer_name: str) -> None:
 
 # TODO: make this
 # @asyncpg_error_handler
-# async def edit_timer(pool: Pool, channel_id: str, timer_name: str, message: str, first_time: datetime, time_between: timedelta) -> None:
+# async def edit_timer(pool: Pool, channel_id: int, timer_name: str, message: str, first_time: datetime, time_between: timedelta) -> None:
 #     async with pool.acquire() as con:
 #         async with con.transaction():
 #             await con.execute(
@@ -127,7 +127,7 @@ async def delete_timer(pool: Pool, channel_id: str, timer_name: str) -> None:
 
 
 @asyncpg_error_handler
-async def enable_timer(pool: Pool, channel_id: str, timer_name: str) -> bool:
+async def enable_timer(pool: Pool, channel_id: int, timer_name: str) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -143,7 +143,7 @@ async def enable_timer(pool: Pool, channel_id: str, timer_name: str) -> bool:
 
 
 @asyncpg_error_handler
-async def disable_timer(pool: Pool, channel_id: str, timer_name: str) -> bool:
+async def disable_timer(pool: Pool, channel_id: int, timer_name: str) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -0,0 +1,175 @@
+from datetime import datetime
+import os
+
+from asyncpg import Pool, Record
+
+from .models import TokenCount
+from shared.database.exceptions import asyncpg_error_handler
+
+
+# Longer words are mostly links and spam, which would only fill the vocabulary
+MAX_TOKEN_LENGTH = 50
+
+
+@asyncpg_error_handler
+async def add_token_counts(pool: Pool, counts: dict[tuple[int, str], tuple[int, datetime, datetime]]) -> None:
+    """Adds the (count, first_seen, last_seen) of each (channel_id, token) to the token counts"""
+    async with pool.acquire() as con:
+        async with con.transaction():
+            # Sorting the rows makes concurrent upserts lock them in the same order
+            await con.executemany(
+                """
+                INSERT INTO twitch.token_counts (channel_id, token, count, first_seen, last_seen)
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT (channel_id, token) DO UPDATE
+                SET
+                    count = token_counts.count + EXCLUDED.count,
+                    first_seen = LEAST(token_counts.first_seen, EXCLUDED.first_seen),
+                    last_seen = GREATEST(token_counts.last_seen, EXCLUDED.last_seen);
+                """,
+                [
+                    (channel_id, token, count, first_seen, last_seen)
+                    for (channel_id, token), (count, first_seen, last_seen) in sorted(counts.items())
+                ],
+            )
+
+
+@asyncpg_error_handler
+async def token_count(pool: Pool, channel_id: int, token: str) -> TokenCount | None:
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            # A token that was counted before the channel was first pruned can't have been pruned since,
+            # as a pruned token starts over with a later first_seen
+            result: Record | None = await con.fetchrow(
+                """
+                SELECT
+                    token_counts.*,
+                    CASE
+                        WHEN token_count_pruning.first_pruned_at <= token_counts.first_seen
+                        THEN token_count_pruning.max_count
+                        ELSE 0
+                    END AS max_uncounted
+                FROM twitch.token_counts
+                LEFT JOIN twitch.token_count_pruning USING (channel_id)
+                WHERE token_counts.channel_id = $1 AND token_counts.token = $2;
+                """,
+                channel_id,
+                token,
+            )
+            if result is None:
+                return None
+            return TokenCount(**result)
+
+
+@asyncpg_error_handler
+async def max_pruned_count(pool: Pool, channel_id: int) -> int:
+    """Returns the highest count of the tokens pruned from the channel, which bounds the uses of any uncounted token"""
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            result: int | None = await con.fetchval(
+                """
+                SELECT max_count
+                FROM twitch.token_count_pruning
+                WHERE channel_id = $1;
+                """,
+                channel_id,
+            )
+            return result if result is not None else 0
+
+
+@asyncpg_error_handler
+async def backfill_token_counts(pool: Pool, batch_size: int) -> bool:
+    """Counts the tokens of the next batch of messages logged before the counting started; returns False once all are counted"""
+    async with pool.acquire() as con:
+        async with con.transaction():
+            progress: Record | None = await con.fetchrow(
+                """
+                SELECT last_id, until_id
+                FROM twitch.token_count_backfill
+                FOR UPDATE;
+                """
+            )
+            if progress is None:
+                return False
+            batch_end = min(progress["last_id"] + batch_size, progress["until_id"])
+            await con.execute(
+                """
+                INSERT INTO twitch.token_counts (channel_id, token, count, first_seen, last_seen)
+                SELECT channel_id, token, COUNT(*), MIN(sent_at), MAX(sent_at)
+                FROM twitch.messages
+                CROSS JOIN LATERAL regexp_split_to_table(replace(message, U&'\\+0E0000', ''), '\\s+') AS token
+                WHERE
+                    id > $1 AND id <= $2 AND
+                    chatter_id <> ALL(ARRAY(SELECT id FROM twitch.chatters WHERE login = $3)) AND
+                    length(token) BETWEEN 1 AND $4
+                GROUP BY channel_id, token
+                ON CONFLICT (channel_id, token) DO UPDATE
+                SET
+                    count = token_counts.count + EXCLUDED.count,
+                    first_seen = LEAST(token_counts.first_seen, EXCLUDED.first_seen),
+                    last_seen = GREATEST(token_counts.last_seen, EXCLUDED.last_seen);
+                """,
+                progress["last_id"],
+                batch_end,
+                os.environ["BOT_NICK"],
+                MAX_TOKEN_LENGTH,
+            )
+            if batch_end >= progress["until_id"]:
+                await con.execute("DELETE FROM twitch.token_count_backfill;")
+                return False
+            await con.execute("UPDATE twitch.token_count_backfill SET last_id = $1;", batch_end)
+            return True
+
+
+@asyncpg_error_handler
+async def token_backfill_pending(pool: Pool) -> bool:
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            result: bool = await con.fetchval("SELECT EXISTS (SELECT 1 FROM twitch.token_count_backfill);")
+            return result
+
+
+@asyncpg_error_handler
+async def prune_token_counts(pool: Pool, max_tokens: int) -> int:
+    """
+    Keeps only the most common tokens of each channel, up to the given number;
+    the highest pruned count of each channel is kept so the counts can tell how much they may be missing
+    """
+    async with pool.acquire() as con:
+        async with con.transaction():
+            result: int = await con.fetchval(
+                """
+                WITH pruned AS (
+                    DELETE FROM twitch.token_counts
+                    WHERE (channel_id, token) IN (
+                        SELECT channel_id, token
+                        FROM (
+                            SELECT
+                                channel_id,
+                                token,
+                                ROW_NUMBER() OVER (PARTITION BY channel_id ORDER BY count DESC, last_seen DESC) AS rank
+                            FROM twitch.token_counts
+                            WHERE channel_id IN (
+                                SELECT channel_id
+                                FROM twitch.token_counts
+                                GROUP BY channel_id
+                                HAVING COUNT(*) > $1
+                            )
+                        ) AS ranked
+                        WHERE rank > $1
+                    )
+                    RETURNING channel_id, count
+                ), pruning AS (
+                    INSERT INTO twitch.token_count_pruning (channel_id, first_pruned_at, max_count)
+                    SELECT channel_id, NOW(), MAX(count)
+                    FROM pruned
+                    GROUP BY channel_id
+                    ON CONFLICT (channel_id) DO UPDATE
+                    SET max_count = GREATEST(token_count_pruning.max_count, EXCLUDED.max_count)
+                )
+                SELECT COUNT(*)
+                FROM pruned;
+                """,
+                max_tokens,
+            )
+            return result
@@ -5,7 +5,7 @@ from shared.database.exceptions import asyncpg_error_handler
 
 
 @asyncpg_error_handler
-async def user_config(pool: Pool, user_id: str) -> UserConfig:
+async def user_config(pool: Pool, user_id: int) -> UserConfig:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record | None = await con.fetchrow(
@@ -22,7 +22,7 @@ async def user_config(pool: Pool, user_id: str) -> UserConfig:
 
 
 @asyncpg_error_handler
-async def create_user_config(pool: Pool, user_id: str) -> None:
+async def create_user_config(pool: Pool, user_id: int) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.execute(
@@ -37,7 +37,7 @@ async def create_user_config(pool: Pool, user_id: str) -> None:
 
 
 @asyncpg_error_handler
-async def replies_on(pool: Pool, user_id: str) -> bool:
+async def replies_on(pool: Pool, user_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -52,7 +52,7 @@ async def replies_on(pool: Pool, user_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def replies_off(pool: Pool, user_id: str) -> bool:
+async def replies_off(pool: Pool, user_id: int) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -67,7 +67,7 @@ async def replies_off(pool: Pool, user_id: str) -> bool:
 
 
 @asyncpg_error_handler
-async def ban_globally(pool: Pool, user_id: str, notes: str | None = None) -> bool:
+async def ban_globally(pool: Pool, user_id: int, notes: str | None = None) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -84,7 +84,7 @@ async def ban_globally(pool: Pool, user_id: str, notes: str | None = None) -> bo
 
 
 @asyncpg_error_handler
-async def unban_globally(pool: Pool, user_id: str, notes: str | None = None) -> bool:
+async def unban_globally(pool: Pool, user_id: int, notes: str | None = None) -> bool:
     async with pool.acquire() as con:
         async with con.transaction():
             result: str = await con.execute(
@@ -100,7 +100,7 @@ async def unban_globally(pool: Pool, user_id: str, notes: str | None = None) ->
 
 
 @asyncpg_error_handler
-async def optin(pool: Pool, user_id: str, commands: list[str]) -> None:
+async def optin(pool: Pool, user_id: int, commands: list[str]) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.executemany(
@@ -114,7 +114,7 @@ async def optin(pool: Pool, user_id: str, commands: list[str]) -> None:
 
 
 @asyncpg_error_handler
-async def optout(pool: Pool, user_id: str, commands: list[str]) -> None:
+async def optout(pool: Pool, user_id: int, commands: list[str]) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
             await con.executemany(
@@ -128,52 +128,72 @@ async def optout(pool: Pool, user_id: str, commands: list[str]) -> None:
 
 
 @asyncpg_error_handler
-async def watchtime(pool: Pool, channel_id: str, username: str) -> Watchtime:
+async def watchtime(pool: Pool, channel_id: int, username: str) -> Watchtime:
     async with pool.acquire() as con:
         async with con.transaction(readonly=True):
             result: Record | None = await con.fetchrow(
                 """
-                SELECT channel_id, username, total_time, online_time
+                SELECT SUM(total_time) AS total_time, SUM(online_time) AS online_time
                 FROM twitch.watchtime
-                WHERE channel_id = $1 AND username = $2;
+                WHERE channel_id = $1 AND chatter_id = ANY(ARRAY(SELECT id FROM twitch.chatters WHERE login = $2))
+                HAVING COUNT(*) > 0;
                 """,
                 channel_id,
                 username,
             )
             if result is None:
                 return Watchtime(channel_id=channel_id, username=username)
-            return Watchtime(**result)
+            return Watchtime(channel_id=channel_id, username=username, **result)
 
 
 @asyncpg_error_handler
-async def add_offline_time(pool: Pool, channel_id: str, users: list[str], interval: int) -> None:
+async def add_watch_times(pool: Pool, watch_times: list[tuple[int, str, int, int]]) -> None:
+    """Adds the (channel_id, username, online_time, total_time) rows to the watchtime in one bulk upsert"""
     async with pool.acquire() as con:
         async with con.transaction():
-            await con.executemany(
+            await con.execute(
+                """
+                CREATE TEMPORARY TABLE watchtime_staging (
+                    channel_id      bigint NOT NULL,
+                    username        text NOT NULL,
+                    online_time     integer NOT NULL,
+                    total_time      integer NOT NULL
+                ) ON COMMIT DROP;
                 """
-                INSERT INTO twitch.watchtime (channel_id, username, total_time)
-                VALUES ($1, $2, $3)
-                ON CONFLICT (channel_id, username)
-                DO UPDATE SET total_time = twitch.watchtime.total_time + EXCLUDED.total_time;
-                """,
-                [(channel_id, user, interval) for user in users],
             )
-
-
-@asyncpg_error_handler
-async def add_online_time(pool: Pool, channel_id: str, users: list[str], interval: int) -> None:
-    async with pool.acquire() as con:
-        async with con.transaction():
-            await con.executemany(
+            await con.copy_records_to_table(
+                "watchtime_staging",
+                records=watch_times,
+                columns=("channel_id", "username", "online_time", "total_time"),
+            )
+            # The chatter list only has logins, so lurkers get a chatter without an id until they send a message
+            await con.execute(
                 """
-                INSERT INTO twitch.watchtime (channel_id, username, online_time, total_time)
-                VALUES ($1, $2, $3, $3)
-                ON CONFLICT (channel_id, username)
-                DO UPDATE SET 
+                INSERT INTO twitch.chatters (login)
+                SELECT DISTINCT username
+                FROM watchtime_staging
+                WHERE NOT EXISTS (SELECT 1 FROM twitch.chatters WHERE login = username);
+                """
+            )
+            # A login shared by several chatters goes to the newest one that has been seen chatting
+            await con.execute(
+                """
+                INSERT INTO twitch.watchtime (channel_id, chatter_id, online_time, total_time)
+                SELECT channel_id, chatter.id, SUM(online_time), SUM(total_time)
+                FROM watchtime_staging
+                CROSS JOIN LATERAL (
+                    SELECT id
+                    FROM twitch.chatters
+                    WHERE login = username
+                    ORDER BY user_id IS NULL, id DESC
+                    LIMIT 1
+                ) AS chatter
+                GROUP BY channel_id, chatter.id
+                ON CONFLICT (channel_id, chatter_id)
+                DO UPDATE SET
                     online_time = twitch.watchtime.online_time + EXCLUDED.online_time,
                     total_time = twitch.watchtime.total_time + EXCLUDED.total_time;
-                """,
-                [(channel_id, user, interval) for user in users],
+                """
             )
 
 
@@ -181,41 +201,29 @@ async def add_online_time(pool: Pool, channel_id: str, users: list[str], interva
 async def rename_user(pool: Pool, old_name: str, new_name: str) -> None:
     async with pool.acquire() as con:
         async with con.transaction():
+            # Messages and watchtime reference the chatter, so only the login has to change
             await con.execute(
                 """
-                UPDATE twitch.messages
-                SET sender = $2
-                WHERE sender = $1;
+                UPDATE twitch.chatters
+                SET login = $2, previous_logins = array_append(previous_logins, login)
+                WHERE login = $1;
                 """,
                 old_name,
                 new_name,
             )
 
-            watchtimes: list[Record] = await con.fetch(
-                """
-                SELECT channel_id, username, online_time, total_time
-                FROM twitch.watchtime
-                WHERE username = $1;
-                """,
-                old_name,
-            )
-
-            await con.executemany(
-                """
-                INSERT INTO twitch.watchtime (channel_id, username, online_time, total_time)
-                VALUES ($1, $2, $3, $4)
-                ON CONFLICT (channel_id, username)
-                DO UPDATE SET 
-                    online_time = twitch.watchtime.online_time + EXCLUDED.online_time, 
-                    total_time = twitch.watchtime.total_time + EXCLUDED.total_time;
-                """,
-                [(r["channel_id"], new_name, r["online_time"], r["total_time"]) for r in watchtimes]
-            )
 
-            await con.execute(
+@asyncpg_error_handler
+async def chatter_login(pool: Pool, user_id: int) -> str | None:
+    """Returns the current login of the user"""
+    async with pool.acquire() as con:
+        async with con.transaction(readonly=True):
+            result: str | None = await con.fetchval(
                 """
-                DELETE FROM twitch.watchtime
-                WHERE username = $1;
+                SELECT login
+                FROM twitch.chatters
+                WHERE user_id = $1;
                 """,
-                old_name,
+                user_id,
             )
+            return result